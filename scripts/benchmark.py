@@ -0,0 +1,327 @@
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from importlib.metadata import version
+
+# --- Configuration ---
+# Times every processing script and every H1-H7 query on synthetic data of
+# each size and records wall time, CPU time and peak memory (max RSS):
+#
+#   python scripts/benchmark.py [rows ...]
+#   python scripts/benchmark.py compare <old results.json> <new results.json>
+#
+# Stages (the CSV cache build and each query of process_steam_data.py) run
+# in a process of their own; their time excludes starting Python and opening
+# the database.
+# Each size gets a workspace in BENCHMARK_DIR with a copy of scripts/ and a
+# generated public/data.csv, so the real data, cache and outputs are never
+# touched. Results are written to RESULTS_DIR as <commit>.json.
+#
+# On Linux a child process inherits the peak RSS of its parent, so this
+# process only imports the standard library and leaves pandas, DuckDB and
+# the data generation to child processes.
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(SCRIPT_DIR)
+BENCHMARK_SIZES = [10000, 100000]
+BENCHMARK_DIR = os.path.join(REPO_ROOT, ".data_cache", "benchmark")
+RESULTS_DIR = os.path.join(BENCHMARK_DIR, "results")
+# Scripts timed one after another, each with a warm CSV cache but no outputs
+SCRIPTS = [
+    "process_steam_data.py",
+    "process_developer_universe.py",
+    "process_game_dna.py",
+    "process_steam_timeline.py",
+    "process_carousel_data.py",
+    "extract_image_column.py",
+]
+# Runs per measurement; the fastest time and the highest peak memory are kept
+REPEATS = 1
+# compare flags stages that got this much slower or larger; slowdowns below
+# REGRESSION_MIN_SECONDS are treated as noise
+REGRESSION_THRESHOLD = 1.2
+REGRESSION_MIN_SECONDS = 0.05
+
+
+# --- Helper Functions ---
+def git_commit():
+    """Short commit hash of the checkout, with -dirty for uncommitted scripts."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short=12", "HEAD"],
+            cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--", "scripts"],
+            cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{commit}-dirty" if dirty else commit
+
+
+def measure(command, cwd, log_path):
+    """Run a command to completion and return its wall time, CPU time and peak RSS.
+
+    The child's resource usage comes from wait4, so it covers the child only.
+    Its output goes to log_path; the timing line of a stage is merged in.
+    """
+    with open(log_path, "w") as log:
+        start = time.perf_counter()
+        process = subprocess.Popen(command, cwd=cwd, stdout=log, stderr=subprocess.STDOUT)
+        _, status, usage = os.wait4(process.pid, 0)
+        seconds = time.perf_counter() - start
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    peak_bytes = usage.ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+    return {
+        "seconds": round(seconds, 4),
+        "cpu_seconds": round(usage.ru_utime + usage.ru_stime, 4),
+        "peak_rss_mb": round(peak_bytes / 2**20, 1),
+        "ok": os.waitstatus_to_exitcode(status) == 0,
+        **stage_result(log_path),
+    }
+
+
+def measure_repeated(command, cwd, log_path, before=None):
+    """measure() REPEATS times; keeps the fastest run and the highest peak."""
+    runs = []
+    for _ in range(REPEATS):
+        if before:
+            before()
+        runs.append(measure(command, cwd, log_path))
+    best = min(runs, key=timed_seconds)
+    return dict(
+        best,
+        peak_rss_mb=max(run["peak_rss_mb"] for run in runs),
+        ok=all(run["ok"] for run in runs),
+    )
+
+
+def prepare_workspace(rows):
+    """Workspace with the current scripts and a synthetic data.csv of rows games."""
+    workspace = os.path.join(BENCHMARK_DIR, str(rows))
+    scripts_dir = os.path.join(workspace, "scripts")
+    if os.path.exists(scripts_dir):
+        shutil.rmtree(scripts_dir)
+    shutil.copytree(
+        SCRIPT_DIR, scripts_dir, ignore=shutil.ignore_patterns("__pycache__")
+    )
+    csv_path = os.path.join(workspace, "public", "data.csv")
+    if not os.path.exists(csv_path):
+        subprocess.run(
+            [sys.executable, os.path.join(scripts_dir, "generate_synthetic_data.py"), str(rows), csv_path],
+            check=True,
+        )
+    # A fresh CSV cache, built by the "cache" stage
+    shutil.rmtree(os.path.join(workspace, ".data_cache"), ignore_errors=True)
+    return workspace
+
+
+def reset_outputs(workspace):
+    """Remove outputs and derived caches, keeping the Parquet copy of the CSV."""
+    output_dir = os.path.join(workspace, "public", "processed_data")
+    shutil.rmtree(output_dir, ignore_errors=True)
+    # Like in the repo, the scripts expect the output directory to exist
+    os.makedirs(output_dir)
+    cache_dir = os.path.join(workspace, ".data_cache")
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        keep = name == "fingerprints.json" or (
+            name.count(".") == 1 and name.endswith(".parquet")
+        )
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        elif not keep:
+            os.remove(path)
+
+
+def stage_command(workspace, stage):
+    return [sys.executable, os.path.join(workspace, "scripts", "benchmark.py"), "stage", stage]
+
+
+def stage_names(workspace):
+    """Stages timed in a child process of their own (see run_stage)."""
+    listing = subprocess.run(
+        stage_command(workspace, "list"), cwd=workspace, capture_output=True, text=True, check=True
+    )
+    return json.loads(listing.stdout.strip().splitlines()[-1])
+
+
+def run_stage(stage):
+    """Child process: run one stage in this workspace and print its timing.
+
+    Query stages open the database built by process_steam_data.py first and
+    only time the query itself, so open_database is the baseline of their
+    peak memory.
+    """
+    import process_steam_data as steam
+    from data_cache import ensure_cache
+    from output_writer import fetch_columns
+
+    if stage == "list":
+        outputs = [key for spec in steam.hypothesis_specs() for key in spec["queries"]]
+        print(json.dumps(["open_database", "general_info", "data_cube", *outputs]))
+        return
+    if stage == "cache":
+        start = time.perf_counter()
+        ensure_cache()
+        print(json.dumps({"stage_seconds": round(time.perf_counter() - start, 4)}))
+        return
+
+    start = time.perf_counter()
+    con = steam.open_database()
+    rows = None
+    if stage != "open_database":
+        table_columns = [row[0] for row in con.execute(f"DESCRIBE {steam.TABLE_NAME}").fetchall()]
+        queries = {
+            key: query
+            for spec in steam.hypothesis_specs()
+            for key, query in spec["queries"].items()
+        }
+        start = time.perf_counter()
+        if stage == "general_info":
+            steam.compute_general_stats(con, table_columns)
+        elif stage == "data_cube":
+            rows = steam.compute_data_cube(con)["cells"]["length"]
+        else:
+            rows = fetch_columns(con.execute(queries[stage]))["length"]
+    print(json.dumps({"stage_seconds": round(time.perf_counter() - start, 4), "output_rows": rows}))
+    con.close()
+
+
+def timed_seconds(result):
+    """Time of the measured work: the stage itself, or the whole script run."""
+    return result.get("stage_seconds", result["seconds"])
+
+
+def stage_result(log_path):
+    """The timing line a run_stage child printed last, or {} if there is none."""
+    try:
+        with open(log_path) as f:
+            result = json.loads(f.read().strip().splitlines()[-1])
+    except (OSError, ValueError, IndexError):
+        return {}
+    return result if isinstance(result, dict) else {}
+
+
+def benchmark_size(rows):
+    """All measurements for one dataset size."""
+    print(f"--- {rows} rows ---")
+    workspace = prepare_workspace(rows)
+    logs = os.path.join(workspace, "logs")
+    os.makedirs(logs, exist_ok=True)
+    csv_mb = round(os.path.getsize(os.path.join(workspace, "public", "data.csv")) / 2**20, 1)
+    results = []
+
+    def record(kind, name, measurement):
+        results.append(dict(rows=rows, csv_mb=csv_mb, kind=kind, name=name, **measurement))
+        status = "" if measurement["ok"] else f"  FAILED (see {logs})"
+        print(
+            f"  {kind:<6} {name:<36} {timed_seconds(measurement):8.3f}s "
+            f"{measurement['peak_rss_mb']:8.1f} MB{status}"
+        )
+
+    log_path = os.path.join(logs, "cache.log")
+    measurement = measure(stage_command(workspace, "cache"), workspace, log_path)
+    record("stage", "cache", measurement)
+
+    for script in SCRIPTS:
+        log_path = os.path.join(logs, f"{script}.log")
+        measurement = measure_repeated(
+            [sys.executable, os.path.join("scripts", script)],
+            workspace,
+            log_path,
+            before=lambda: reset_outputs(workspace),
+        )
+        record("script", script, measurement)
+
+    # The query stages open the database that process_steam_data.py builds
+    reset_outputs(workspace)
+    measure(
+        [sys.executable, os.path.join("scripts", "process_steam_data.py")],
+        workspace,
+        os.path.join(logs, "database.log"),
+    )
+    for stage in stage_names(workspace):
+        log_path = os.path.join(logs, f"{stage}.log")
+        measurement = measure_repeated(stage_command(workspace, stage), workspace, log_path)
+        record("stage", stage, measurement)
+    return results
+
+
+def run_benchmark(sizes):
+    commit = git_commit()
+    report = {
+        "commit": commit,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "machine": {
+            "platform": platform.platform(),
+            "processor": platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "python": platform.python_version(),
+            "duckdb": version("duckdb"),
+            "pandas": version("pandas"),
+        },
+        "repeats": REPEATS,
+        "sizes": sizes,
+        "results": [],
+    }
+    for rows in sizes:
+        report["results"].extend(benchmark_size(rows))
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    results_path = os.path.join(RESULTS_DIR, f"{commit}.json")
+    with open(results_path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote benchmark results to {results_path}")
+
+
+def compare(old_path, new_path):
+    """Print the change per measurement; returns the number of regressions."""
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+    print(f"{old['commit']} -> {new['commit']}")
+    before = {(r["rows"], r["kind"], r["name"]): r for r in old["results"]}
+    regressions = 0
+    for result in new["results"]:
+        key = (result["rows"], result["kind"], result["name"])
+        if key not in before:
+            continue
+        old_result = before[key]
+        old_seconds, new_seconds = timed_seconds(old_result), timed_seconds(result)
+        time_ratio = new_seconds / max(old_seconds, 1e-9)
+        memory_ratio = result["peak_rss_mb"] / max(old_result["peak_rss_mb"], 1e-9)
+        slower = (
+            time_ratio > REGRESSION_THRESHOLD
+            and new_seconds - old_seconds > REGRESSION_MIN_SECONDS
+        )
+        regressed = slower or memory_ratio > REGRESSION_THRESHOLD
+        regressions += regressed
+        print(
+            f"  {key[0]:>9} {key[2]:<36} "
+            f"{old_seconds:8.3f}s -> {new_seconds:8.3f}s ({time_ratio:5.2f}x)  "
+            f"{old_result['peak_rss_mb']:7.1f} -> {result['peak_rss_mb']:7.1f} MB ({memory_ratio:5.2f}x)"
+            f"{'  REGRESSION' if regressed else ''}"
+        )
+    print(f"{regressions} regressions above {REGRESSION_THRESHOLD}x.")
+    return regressions
+
+
+def main():
+    args = sys.argv[1:]
+    if args[:1] == ["stage"]:
+        run_stage(args[1])
+    elif args[:1] == ["compare"]:
+        sys.exit(1 if compare(args[1], args[2]) else 0)
+    else:
+        run_benchmark([int(arg) for arg in args] or BENCHMARK_SIZES)
+
+
+if __name__ == "__main__":
+    main()
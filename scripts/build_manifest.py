@@ -0,0 +1,78 @@
+import hashlib
+import inspect
+import json
+import os
+from datetime import datetime, timezone
+
+from data_cache import CACHE_DIR, CSV_PATH, REPO_ROOT, file_fingerprint
+from schema import schema_fingerprint
+
+# --- Configuration ---
+MANIFEST_PATH = os.path.join(CACHE_DIR, "build_manifest.json")
+# Set to True to regenerate every output regardless of the manifest
+FORCE_REBUILD = False
+
+
+# --- Helper Functions ---
+def _manifest_key(output_path):
+    return os.path.relpath(os.path.abspath(output_path), REPO_ROOT)
+
+
+def load_manifest():
+    try:
+        with open(MANIFEST_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def code_hash(*parts):
+    """Hash the code that produces an output.
+
+    Parts may be SQL strings or modules/functions, whose source is hashed.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        text = part if isinstance(part, str) else inspect.getsource(part)
+        digest.update(text.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def output_entry(columns, code, config=None, csv_path=CSV_PATH):
+    """Describe everything an output depends on.
+
+    ``code`` is a code_hash; ``config`` holds settings such as
+    OWNER_ESTIMATE_METHOD that change the output without changing code.
+    """
+    entry = {
+        "data_sha256": file_fingerprint(csv_path),
+        "schema": schema_fingerprint(),
+        "columns": sorted(columns),
+        "code_sha256": code,
+        "config": config or {},
+    }
+    entry["fingerprint"] = hashlib.sha256(
+        json.dumps(entry, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+    return entry
+
+
+def is_up_to_date(output_path, entry):
+    """True if the output exists and was built from exactly these inputs."""
+    if FORCE_REBUILD or not os.path.exists(output_path):
+        return False
+    known = load_manifest().get(_manifest_key(output_path))
+    return bool(known) and known.get("fingerprint") == entry["fingerprint"]
+
+
+def record_output(output_path, entry):
+    """Remember that output_path was (re)built from the inputs in entry."""
+    manifest = load_manifest()
+    manifest[_manifest_key(output_path)] = dict(
+        entry, built_at=datetime.now(timezone.utc).isoformat(timespec="seconds")
+    )
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_path = MANIFEST_PATH + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=4, sort_keys=True)
+    os.replace(tmp_path, MANIFEST_PATH)
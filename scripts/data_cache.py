@@ -0,0 +1,328 @@
+import duckdb
+import hashlib
+import json
+import os
+import re
+
+import pandas as pd
+
+from schema import SCHEMA, apply_categories, invalid_sql, schema_fingerprint, typed_sql
+
+# --- Configuration ---
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(SCRIPT_DIR)
+CSV_PATH = os.path.join(REPO_ROOT, "public", "data.csv")
+# Kept outside public/ so the cache never ends up in the React build
+CACHE_DIR = os.path.join(REPO_ROOT, ".data_cache")
+FINGERPRINTS_FILE = os.path.join(CACHE_DIR, "fingerprints.json")
+HASH_CHUNK_SIZE = 1 << 20
+# Rows fetched at a time by iter_rows and iter_batches
+ROW_BATCH_SIZE = 50000
+# Memory cap of every DuckDB connection the scripts open (e.g. "4GB"). Larger
+# sorts, joins and aggregations spill to TEMP_DIR instead of running out of
+# memory. None keeps DuckDB's default of 80% of the RAM.
+MEMORY_LIMIT = "4GB"
+TEMP_DIR = os.path.join(CACHE_DIR, "tmp")
+# Values listed per column in the validation report of the cache build
+VALIDATION_EXAMPLES = 10
+
+
+# --- Helper Functions ---
+def clean_column_name(name):
+    return "".join(c if c.isalnum() else "_" for c in str(name)).lower()
+
+
+def quote_name(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def sql_literal(value):
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def connect(database=":memory:", read_only=False):
+    """DuckDB connection capped at MEMORY_LIMIT that spills to TEMP_DIR."""
+    config = {"temp_directory": TEMP_DIR}
+    if MEMORY_LIMIT:
+        config["memory_limit"] = MEMORY_LIMIT
+    return duckdb.connect(database=database, read_only=read_only, config=config)
+
+
+def _load_fingerprints():
+    try:
+        with open(FINGERPRINTS_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def file_fingerprint(path):
+    """Return the sha256 of a file's contents.
+
+    Hashing ~470 MB takes a second or two, so the digest is remembered per
+    (path, size, mtime) and only recomputed when the file changes on disk.
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    stamp = f"{stat.st_size}:{stat.st_mtime_ns}"
+    fingerprints = _load_fingerprints()
+    known = fingerprints.get(path)
+    if known and known.get("stamp") == stamp:
+        return known["sha256"]
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    sha = digest.hexdigest()
+
+    fingerprints[path] = {"stamp": stamp, "sha256": sha}
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(FINGERPRINTS_FILE, "w") as f:
+        json.dump(fingerprints, f, indent=4)
+    return sha
+
+
+def raw_csv_sql(csv_path=CSV_PATH):
+    """DuckDB table expression that reads every value of the CSV as text."""
+    return f"read_csv({sql_literal(csv_path)}, header=true, all_varchar=true)"
+
+
+def csv_columns(csv_path=CSV_PATH):
+    """(raw, cleaned) name of every column of the CSV, in file order."""
+    con = connect()
+    try:
+        rows = con.execute(f"DESCRIBE SELECT * FROM {raw_csv_sql(csv_path)}").fetchall()
+    finally:
+        con.close()
+    return [(row[0], clean_column_name(row[0])) for row in rows]
+
+
+def csv_source_sql(csv_path=CSV_PATH):
+    """DuckDB table expression that parses the raw CSV with typed columns.
+
+    Columns get cleaned names and the types declared in schema.SCHEMA;
+    values that do not fit their type become NULL (see validate_csv).
+    """
+    columns = csv_columns(csv_path)
+    undeclared = [clean for _, clean in columns if clean not in SCHEMA]
+    if undeclared:
+        print(f"Warning: Columns without a declared type, kept as text: {undeclared}")
+    select_list = ", ".join(
+        f'{typed_sql(quote_name(raw), clean)} AS "{clean}"' for raw, clean in columns
+    )
+    return f"(SELECT {select_list} FROM {raw_csv_sql(csv_path)})"
+
+
+def validate_csv(con, csv_path, report_path):
+    """Report the values of the CSV that do not fit their declared type.
+
+    Writes the number of failing rows, and per column the number of failing
+    values and the first VALIDATION_EXAMPLES of them, to report_path.
+    Returns the number of rows with at least one failing value.
+    """
+    columns = csv_columns(csv_path)
+    appid = next((quote_name(raw) for raw, clean in columns if clean == "appid"), "NULL")
+    checked = [
+        (clean, quote_name(raw), invalid_sql(quote_name(raw), clean))
+        for raw, clean in columns
+        if SCHEMA.get(clean, "VARCHAR") != "VARCHAR"
+    ]
+    any_invalid = " OR ".join(condition for _, _, condition in checked) or "false"
+    select_list = ["COUNT(*)", f"COUNT(*) FILTER (WHERE {any_invalid})"]
+    for _, raw, condition in checked:
+        examples = f"list({{'appid': {appid}, 'value': {raw}}}) FILTER (WHERE {condition})"
+        select_list += [
+            f"COUNT(*) FILTER (WHERE {condition})",
+            f"({examples})[1:{VALIDATION_EXAMPLES}]",
+        ]
+    row = con.execute(
+        f"SELECT {', '.join(select_list)} FROM {raw_csv_sql(csv_path)}"
+    ).fetchone()
+
+    report = {"csv": csv_path, "rows": row[0], "invalid_rows": row[1], "columns": {}}
+    for i, (clean, _, _) in enumerate(checked):
+        count, examples = row[2 + 2 * i], row[3 + 2 * i]
+        if count:
+            report["columns"][clean] = {
+                "type": SCHEMA[clean], "invalid": count, "examples": examples
+            }
+            print(f"WARNING: {count} values of '{clean}' are not a valid {SCHEMA[clean]}.")
+    with open(report_path, "w") as f:
+        json.dump(report, f, indent=4)
+    return report["invalid_rows"]
+
+
+def cache_key(csv_path=CSV_PATH):
+    """Prefix shared by every cache file derived from this version of the CSV.
+
+    Includes the schema, so a change of a declared type rebuilds the caches.
+    """
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    return f"{stem}_{file_fingerprint(csv_path)[:16]}_{schema_fingerprint()}"
+
+
+def derived_cache_path(csv_path, name):
+    """Path for an artifact derived from the CSV, e.g. a bridge table.
+
+    Derived files share the CSV's content hash, so they are rebuilt (and the
+    old ones removed) whenever the CSV or the schema changes.
+    """
+    return os.path.join(CACHE_DIR, f"{cache_key(csv_path)}.{name}")
+
+
+def write_parquet(con, select_sql, path):
+    """Write a query result to Parquet atomically."""
+    tmp_path = path + ".tmp"
+    con.execute(
+        f"COPY ({select_sql}) TO {sql_literal(tmp_path)} (FORMAT PARQUET, COMPRESSION ZSTD)"
+    )
+    os.replace(tmp_path, path)
+
+
+def ensure_cache(csv_path=CSV_PATH):
+    """Convert the CSV to Parquet once per content hash and return its path.
+
+    The columns are typed by schema.SCHEMA while converting; values that fail
+    validation are listed in the .validation.json report next to the cache.
+    """
+    key = cache_key(csv_path)
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    cache_path = os.path.join(CACHE_DIR, f"{key}.parquet")
+    if os.path.exists(cache_path):
+        return cache_path
+
+    print(f"Building columnar cache for {csv_path} (first run only)...")
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    con = connect()
+    try:
+        write_parquet(con, f"SELECT * FROM {csv_source_sql(csv_path)}", cache_path)
+        invalid_rows = validate_csv(
+            con, csv_path, os.path.join(CACHE_DIR, f"{key}.validation.json")
+        )
+    finally:
+        con.close()
+    if invalid_rows:
+        print(f"WARNING: {invalid_rows} rows have values that fail validation (see {key}.validation.json).")
+
+    # Drop caches built from older versions of the same file; files of other
+    # CSVs whose name merely starts with the same stem (data_old.csv) stay
+    stale = re.compile(rf"{re.escape(stem)}_[0-9a-f]{{16}}_[0-9a-f]{{8}}\.")
+    for name in os.listdir(CACHE_DIR):
+        path = os.path.join(CACHE_DIR, name)
+        if stale.match(name) and not name.startswith(f"{key}.") and os.path.isfile(path):
+            os.remove(path)
+    print(f"Cached {csv_path} as {cache_path}")
+    return cache_path
+
+
+def cache_source_sql(csv_path=CSV_PATH):
+    """DuckDB table expression over the cached Parquet copy of the CSV."""
+    return f"read_parquet({sql_literal(ensure_cache(csv_path))})"
+
+
+def available_columns(csv_path=CSV_PATH):
+    con = connect()
+    try:
+        rows = con.execute(
+            f"DESCRIBE SELECT * FROM {cache_source_sql(csv_path)}"
+        ).fetchall()
+    finally:
+        con.close()
+    return [row[0] for row in rows]
+
+
+def _select_list(columns, csv_path):
+    """SELECT list of the requested columns that exist, warning about the rest."""
+    if columns is None:
+        return "*"
+    present = set(available_columns(csv_path))
+    missing = [col for col in columns if col not in present]
+    if missing:
+        print(f"Warning: Columns not found in {csv_path}: {missing}")
+    select_list = ", ".join(f'"{col}"' for col in columns if col in present)
+    if not select_list:
+        raise ValueError(f"None of the requested columns exist: {columns}")
+    return select_list
+
+
+def load_columns(columns=None, csv_path=CSV_PATH):
+    """Load the given columns of the CSV as a pandas DataFrame.
+
+    Only the requested columns are read from the Parquet cache. Columns that
+    do not exist in the data are skipped with a warning, so callers can keep
+    checking ``col in df.columns`` as before. ``None`` loads every column.
+    """
+    source = cache_source_sql(csv_path)
+    select_list = _select_list(columns, csv_path)
+    con = connect()
+    try:
+        return apply_categories(con.execute(f"SELECT {select_list} FROM {source}").df())
+    finally:
+        con.close()
+
+
+def iter_batches(columns, csv_path=CSV_PATH, batch_size=ROW_BATCH_SIZE):
+    """Stream the given columns as DataFrames of about batch_size rows.
+
+    The memory-bounded counterpart of load_columns: batches come in file
+    order and are indexed by row number, so per-batch results can be merged
+    and rows looked up again with load_rows.
+    """
+    select_list = _select_list(columns, csv_path)
+    # DuckDB fetches in vectors of 2048 rows
+    vectors = max(1, batch_size // 2048)
+    con = connect()
+    try:
+        # Scans keep file order (preserve_insertion_order), so no sort is needed
+        result = con.execute(
+            f"SELECT file_row_number AS row_number, {select_list} "
+            f"FROM read_parquet({sql_literal(ensure_cache(csv_path))}, file_row_number=true)"
+        )
+        while True:
+            batch = result.fetch_df_chunk(vectors)
+            if batch.empty:
+                break
+            yield apply_categories(batch.set_index("row_number"))
+    finally:
+        con.close()
+
+
+def iter_rows(columns, csv_path=CSV_PATH, batch_size=ROW_BATCH_SIZE):
+    """Stream (row_number, *values) tuples of the given columns in file order.
+
+    Rows are fetched batch_size at a time, so memory stays bounded no matter
+    how large the data is. row_number can be passed to load_rows later.
+    """
+    select_list = ", ".join(f'"{col}"' for col in columns)
+    con = connect()
+    try:
+        # Scans keep file order (preserve_insertion_order), so no sort is needed
+        result = con.execute(
+            f"SELECT file_row_number, {select_list} "
+            f"FROM read_parquet({sql_literal(ensure_cache(csv_path))}, file_row_number=true)"
+        )
+        while True:
+            batch = result.fetchmany(batch_size)
+            if not batch:
+                break
+            yield from batch
+    finally:
+        con.close()
+
+
+def load_rows(columns, row_numbers, csv_path=CSV_PATH):
+    """Load the given columns for selected rows only, indexed by row number."""
+    select_list = ", ".join(f'"{col}"' for col in columns)
+    con = connect()
+    try:
+        con.register("wanted_rows", pd.DataFrame({"row_number": list(row_numbers)}))
+        df = con.execute(
+            f"SELECT file_row_number AS row_number, {select_list} "
+            f"FROM read_parquet({sql_literal(ensure_cache(csv_path))}, file_row_number=true) "
+            f"WHERE file_row_number IN (SELECT row_number FROM wanted_rows) "
+            f"ORDER BY file_row_number"
+        ).df()
+    finally:
+        con.close()
+    return apply_categories(df.set_index("row_number"))
@@ -1,36 +1,165 @@
-import csv
-import json
 import os
+import sys
+
+import output_writer
+from build_manifest import code_hash, is_up_to_date, output_entry, record_output
+from instrumentation import finish_run, stage, start_run
+from data_cache import cache_source_sql, connect
+from output_writer import write_output
+
+# --- Configuration ---
+# header_images.json is a manifest instead of a list of URLs: nearly every
+# header_image is the same CDN URL with only the appid changed, so the URL
+# template is stored once next to the appids that follow it:
+#   {"format": "url_template", "template": ".../apps/{appid}/header.jpg",
+#    "appids": [...], "urls": [...]}
+# "urls" holds the few URLs that do not follow the template. The ?t=
+# cache-busting suffix is dropped; the CDN serves the image without it.
+# src/utils.js (expandImageManifest) turns a manifest back into URLs.
+OUTPUT_DIR = "public/processed_data"
+OUTPUT_FILENAME = "header_images.json"
+# header_images_sample.json holds SAMPLE_SIZE appids of well-reviewed games
+# in a fixed random order for the background carousels, so the page does
+# not load the full manifest on startup. None writes no sample.
+SAMPLE_FILENAME = "header_images_sample.json"
+SAMPLE_SIZE = 60
+SAMPLE_MIN_REVIEWS = 500
+SAMPLE_MIN_POSITIVE_SHARE = 0.8
+SAMPLE_SEED = 42
+
+
+# --- Helper Functions ---
+def url_templates_sql(source):
+    """Each game's header_image with its appid replaced by {appid}."""
+    return f"""
+        SELECT DISTINCT ON (appid)
+            appid,
+            header_image AS url,
+            replace(split_part(header_image, '?', 1), '/' || appid || '/', '/{{appid}}/') AS template,
+            COALESCE(positive, 0) + COALESCE(negative, 0) AS reviews,
+            COALESCE(positive, 0) AS positive
+        FROM {source}
+        WHERE header_image IS NOT NULL AND trim(header_image) <> ''
+        ORDER BY appid
+    """
+
+
+def build_manifests(con):
+    """The full manifest and, with SAMPLE_SIZE set, the sample manifest."""
+    con.execute(f"CREATE TEMP TABLE images AS {url_templates_sql(cache_source_sql())}")
+    # The template most URLs follow; it must contain the appid to be one
+    row = con.execute(
+        """
+        SELECT template FROM images
+        WHERE template LIKE '%{appid}%'
+        GROUP BY template ORDER BY COUNT(*) DESC, template LIMIT 1
+        """
+    ).fetchone()
+    template = row[0] if row else None
+    appids = [a for (a,) in con.execute(
+        "SELECT appid FROM images WHERE template = $template ORDER BY appid", {"template": template}
+    ).fetchall()]
+    urls = [u for (u,) in con.execute(
+        "SELECT url FROM images WHERE template IS DISTINCT FROM $template ORDER BY appid",
+        {"template": template},
+    ).fetchall()]
+    manifest = {"format": "url_template", "template": template, "appids": appids, "urls": urls}
+    if SAMPLE_SIZE is None:
+        return manifest, None
+
+    sample = [a for (a,) in con.execute(
+        """
+        SELECT appid FROM images
+        WHERE template = $template
+          AND reviews >= $min_reviews
+          AND positive >= $min_share * reviews
+        ORDER BY hash(appid + $seed), appid
+        LIMIT $size
+        """,
+        {
+            "template": template,
+            "min_reviews": SAMPLE_MIN_REVIEWS,
+            "min_share": SAMPLE_MIN_POSITIVE_SHARE,
+            "seed": SAMPLE_SEED,
+            "size": SAMPLE_SIZE,
+        },
+    ).fetchall()]
+    if len(sample) < SAMPLE_SIZE:
+        print(
+            f"Warning: only {len(sample)} games pass the sample quality filter; "
+            f"filling up with the most reviewed ones."
+        )
+        sample += [a for (a,) in con.execute(
+            """
+            SELECT appid FROM images
+            WHERE template = $template AND NOT list_contains($sample, appid)
+            ORDER BY reviews DESC, appid
+            LIMIT $size
+            """,
+            {"template": template, "sample": sample, "size": SAMPLE_SIZE - len(sample)},
+        ).fetchall()]
+    sample_manifest = {"format": "url_template", "template": template, "appids": sample, "urls": []}
+    return manifest, sample_manifest
+
 
 def process_csv():
-    header_images = []
+    output_path = os.path.join(OUTPUT_DIR, OUTPUT_FILENAME)
+    sample_path = os.path.join(OUTPUT_DIR, SAMPLE_FILENAME)
     try:
-        with open("public/data.csv", mode='r', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
-            if "header_image" not in reader.fieldnames:
-                print("Error: 'header_image' column not found.")
-                return
-
-            for row in reader:
-                image_url = row.get("header_image")
-                if image_url:
-                    header_images.append(image_url)
+        manifest_entry = output_entry(
+            ["appid", "header_image", "positive", "negative"],
+            code_hash(sys.modules[__name__], output_writer),
+            config={
+                "SAMPLE_SIZE": SAMPLE_SIZE,
+                "SAMPLE_MIN_REVIEWS": SAMPLE_MIN_REVIEWS,
+                "SAMPLE_MIN_POSITIVE_SHARE": SAMPLE_MIN_POSITIVE_SHARE,
+                "SAMPLE_SEED": SAMPLE_SEED,
+            },
+            csv_path="public/data.csv",
+        )
+    except FileNotFoundError:
+        print("Error: data.csv not found.")
+        return
+    outputs = [output_path] + ([sample_path] if SAMPLE_SIZE is not None else [])
+    if all(is_up_to_date(path, manifest_entry) for path in outputs):
+        print(f"{output_path} is up to date (see build manifest). Nothing to do.")
+        return
+
+    con = connect()
+    try:
+        with stage("load") as record:
+            manifest, sample = build_manifests(con)
+            record["rows_out"] = len(manifest["appids"]) + len(manifest["urls"])
     except FileNotFoundError:
         print("Error: data.csv not found.")
         return
     except Exception as e:
         print(f"An error occurred: {e}")
         return
+    finally:
+        con.close()
+    print(
+        f"{len(manifest['appids'])} header images follow {manifest['template']}, "
+        f"{len(manifest['urls'])} do not."
+    )
 
-    output_dir = "public/processed_data"
-    os.makedirs(output_dir, exist_ok=True) # Ensure directory exists
+    os.makedirs(OUTPUT_DIR, exist_ok=True) # Ensure directory exists
 
     try:
-        with open(os.path.join(output_dir, "header_images.json"), "w", encoding="utf-8") as outfile:
-            json.dump(header_images, outfile, indent=2)
-        print("Successfully created header_images.json")
+        for path, data in [(output_path, manifest), (sample_path, sample)]:
+            if data is None:
+                continue
+            name = os.path.basename(path)
+            with stage(f"write: {name}", rows_in=len(data["appids"]) + len(data["urls"])) as record:
+                record["bytes_written"] = write_output(path, data)
+            print(f"Successfully created {name}")
+            record_output(path, manifest_entry)
     except Exception as e:
         print(f"Error writing JSON file: {e}")
 
 if __name__ == "__main__":
-    process_csv()
+    start_run("extract_image_column")
+    try:
+        process_csv()
+    finally:
+        finish_run()
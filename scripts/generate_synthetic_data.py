@@ -0,0 +1,263 @@
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_cache import REPO_ROOT, ROW_BATCH_SIZE
+from process_carousel_data import GAMES_DATA
+from schema import SCHEMA
+
+# --- Configuration ---
+# Writes a CSV with the column layout of data.csv (see schema.py) and
+# distributions shaped like the real Steam data, for benchmarks and local
+# runs without the Git LFS file:
+#
+#   python scripts/generate_synthetic_data.py [rows] [output_path]
+#
+# The same rows and seed always give the same file.
+DEFAULT_ROWS = 100000
+DEFAULT_OUTPUT = os.path.join(REPO_ROOT, ".data_cache", "synthetic", "data_{rows}.csv")
+SEED = 42
+# Share of games without a release date, price, owner range and review counts
+MISSING_RATE = 0.01
+
+GENRES = [
+    "Indie", "Casual", "Action", "Adventure", "Simulation", "Strategy", "RPG",
+    "Early Access", "Free To Play", "Sports", "Racing", "Massively Multiplayer",
+    "Education", "Utilities", "Design & Illustration", "Animation & Modeling",
+]
+CATEGORIES = [
+    "Single-player", "Steam Achievements", "Steam Cloud", "Full controller support",
+    "Multi-player", "Partial Controller Support", "Steam Trading Cards", "PvP",
+    "Online PvP", "Co-op", "Online Co-op", "Steam Leaderboards", "Remote Play Together",
+    "Family Sharing", "Steam Workshop", "In-App Purchases", "VR Supported",
+]
+LANGUAGES = [
+    "English", "German", "French", "Spanish - Spain", "Russian", "Japanese",
+    "Simplified Chinese", "Korean", "Portuguese - Brazil", "Italian", "Polish",
+]
+# Owner ranges as Steam reports them, with their share of games
+OWNER_RANGES = [
+    ("0 - 0", 0.02),
+    ("0 - 20000", 0.62),
+    ("20000 - 50000", 0.12),
+    ("50000 - 100000", 0.08),
+    ("100000 - 200000", 0.06),
+    ("200000 - 500000", 0.05),
+    ("500000 - 1000000", 0.025),
+    ("1000000 - 2000000", 0.01),
+    ("2000000 - 5000000", 0.0035),
+    ("5000000 - 10000000", 0.001),
+    ("10000000 - 20000000", 0.0003),
+    ("20000000 - 50000000", 0.00012),
+    ("50000000 - 100000000", 0.00005),
+    ("100000000 - 200000000", 0.00003),
+]
+# Common price points in dollars and their share of paid games
+PRICE_POINTS = [
+    (0.99, 0.10), (1.99, 0.08), (2.99, 0.07), (4.99, 0.18), (6.99, 0.04),
+    (9.99, 0.17), (14.99, 0.12), (19.99, 0.12), (24.99, 0.04), (29.99, 0.04),
+    (39.99, 0.02), (59.99, 0.015), (69.99, 0.005),
+]
+FREE_SHARE = 0.17
+HEADER_IMAGE_TEMPLATE = (
+    "https://shared.akamai.steamstatic.com/store_item_assets/steam/apps/{appid}/header.jpg"
+)
+WORDS = (
+    "explore build survive craft fight puzzle story world dungeon hero "
+    "magic space city farm racing pixel retro roguelike co-op online "
+    "strategy card tactical open adventure mystery horror cozy island"
+).split()
+
+
+# --- Helper Functions ---
+def weighted_choice(rng, options, size):
+    """Draw size values from (value, weight) pairs."""
+    values = [value for value, _ in options]
+    weights = np.array([weight for _, weight in options], dtype=float)
+    return np.asarray(values, dtype=object)[
+        rng.choice(len(values), size=size, p=weights / weights.sum())
+    ]
+
+
+def zipf_index(rng, n, size, exponent=1.1):
+    """Indices below n where low indices are much more common (popular items)."""
+    ranks = np.arange(1, n + 1, dtype=float) ** -exponent
+    return rng.choice(n, size=size, p=ranks / ranks.sum())
+
+
+def list_literals(rng, pool, size, mean_items, max_items, min_items=1):
+    """Python list literals such as "['Action', 'Indie']" of popular pool items."""
+    extra = rng.poisson(max(mean_items - min_items, 0), size=size)
+    counts = np.minimum(min_items + extra, max_items)
+    picks = zipf_index(rng, len(pool), counts.sum(), exponent=0.8)
+    literals = []
+    start = 0
+    for count in counts:
+        items = dict.fromkeys(pool[i] for i in picks[start:start + count])
+        literals.append(repr(list(items)))
+        start += count
+    return literals
+
+
+def descriptions(rng, size, mean_length):
+    """HTML-ish text of lognormal length with quotes, commas and line breaks."""
+    lengths = rng.lognormal(np.log(mean_length), 0.8, size=size).astype(int) // 8 + 1
+    words = np.asarray(WORDS, dtype=object)
+    texts = []
+    for length in lengths:
+        sentence = " ".join(words[rng.integers(0, len(words), size=length)])
+        texts.append(f'<p>"{sentence[:40]}", {sentence}</p>\n<br>{sentence[-40:]}')
+    return texts
+
+
+def studio_names(rng, size, num_studios):
+    """Developer and publisher list literals; most publishers self-publish."""
+    pool = [f"Studio {i}" if i % 7 else f"Dev's Team {i}" for i in range(num_studios)]
+    developers = list_literals(rng, pool, size, 1.1, 3)
+    others = list_literals(rng, pool, size, 1.0, 2)
+    self_published = rng.random(size) < 0.6
+    publishers = [
+        dev if own else other
+        for dev, other, own in zip(developers, others, self_published)
+    ]
+    return developers, publishers
+
+
+def generate_batch(rng, first_row, size, total_rows):
+    """One DataFrame of size synthetic games in the column order of SCHEMA."""
+    row = np.arange(first_row, first_row + size)
+    missing = rng.random(size) < MISSING_RATE
+    batch = pd.DataFrame(index=row)
+    batch["appid"] = 10 + row * 10
+
+    names = np.array([f"Game {i}" for i in row], dtype=object)
+    famous = row < len(GAMES_DATA)
+    names[famous] = [GAMES_DATA[i][0] for i in row[famous]]
+    batch["name"] = names
+
+    # Releases grow roughly exponentially over the years, like on Steam
+    years = 2024 - np.minimum(rng.exponential(4.0, size=size).astype(int), 27)
+    days = rng.integers(0, 365, size=size)
+    dates = pd.to_datetime(years.astype(str), format="%Y") + pd.to_timedelta(days, unit="D")
+    batch["release_date"] = dates.strftime("%Y-%m-%d").where(~missing, "")
+
+    batch["required_age"] = np.where(rng.random(size) < 0.05, 18, 0)
+    free = rng.random(size) < FREE_SHARE
+    price = weighted_choice(rng, PRICE_POINTS, size).astype(float)
+    batch["price"] = pd.Series(np.where(free, 0.0, price), index=row).where(~missing)
+    batch["dlc_count"] = np.minimum(rng.geometric(0.7, size=size) - 1, 200)
+
+    batch["detailed_description"] = descriptions(rng, size, 1500)
+    batch["about_the_game"] = descriptions(rng, size, 1200)
+    batch["short_description"] = descriptions(rng, size, 150)
+    batch["reviews"] = ""
+    batch["header_image"] = [HEADER_IMAGE_TEMPLATE.format(appid=a) for a in batch["appid"]]
+    batch["website"] = np.where(rng.random(size) < 0.5, "https://example.com", "")
+    batch["support_url"] = ""
+    batch["support_email"] = "support@example.com"
+
+    batch["windows"] = rng.random(size) < 0.999
+    batch["mac"] = rng.random(size) < 0.2
+    batch["linux"] = rng.random(size) < 0.15
+
+    rated = rng.random(size) < 0.04
+    scores = rng.normal(72, 10, size=size).clip(20, 99).astype(int)
+    batch["metacritic_score"] = np.where(rated, scores, 0)
+    batch["metacritic_url"] = ""
+    batch["achievements"] = np.where(rng.random(size) < 0.5, rng.geometric(0.05, size=size), 0)
+    batch["notes"] = ""
+    batch["supported_languages"] = list_literals(rng, LANGUAGES, size, 2.5, len(LANGUAGES))
+    batch["full_audio_languages"] = list_literals(rng, LANGUAGES, size, 0.5, 4, min_items=0)
+    batch["packages"] = "[]"
+
+    batch["developers"], batch["publishers"] = studio_names(
+        rng, size, max(50, total_rows // 3)
+    )
+    batch["categories"] = list_literals(rng, CATEGORIES, size, 3.0, len(CATEGORIES))
+    batch["genres"] = list_literals(rng, GENRES, size, 2.2, 6)
+    batch["screenshots"] = [
+        repr([f"https://example.com/{a}/ss_{i}.jpg" for i in range(4)])
+        for a in batch["appid"]
+    ]
+    batch["movies"] = "[]"
+    batch["user_score"] = 0
+    batch["score_rank"] = ""
+
+    # Reviews grow with the owner range; a few percent of owners review
+    owner_index = rng.choice(
+        len(OWNER_RANGES), size=size,
+        p=np.array([w for _, w in OWNER_RANGES]) / sum(w for _, w in OWNER_RANGES),
+    )
+    owners_upper = np.array(
+        [int(r.split(" - ")[1]) for r, _ in OWNER_RANGES], dtype=float
+    )[owner_index]
+    reviews = (owners_upper * rng.lognormal(np.log(0.015), 0.9, size=size)).astype(np.int64)
+    share_positive = rng.beta(7, 2, size=size)
+    positive = (reviews * share_positive).astype(np.int64)
+    negative = reviews - positive
+    batch["recommendations"] = np.where(reviews >= 100, reviews, 0)
+    batch["positive"] = positive
+    batch["negative"] = negative
+    batch["estimated_owners"] = np.where(
+        missing, "", np.array([r for r, _ in OWNER_RANGES], dtype=object)[owner_index]
+    )
+
+    played = rng.random(size) < 0.3
+    playtime = rng.lognormal(np.log(300), 1.2, size=size).astype(np.int64)
+    batch["average_playtime_forever"] = np.where(played, playtime, 0)
+    recently_played = played & (rng.random(size) < 0.1)
+    batch["average_playtime_2weeks"] = np.where(recently_played, playtime // 10, 0)
+    batch["median_playtime_forever"] = np.where(played, playtime // 2, 0)
+    batch["median_playtime_2weeks"] = np.where(recently_played, playtime // 20, 0)
+    batch["discount"] = np.where(rng.random(size) < 0.1, rng.integers(1, 10, size=size) * 10, 0)
+    batch["peak_ccu"] = (reviews * rng.lognormal(np.log(0.02), 1.5, size=size)).astype(np.int64)
+    # User tags with their vote counts, e.g. "{'Indie': 120, 'RPG': 45}"
+    tag_votes = rng.integers(10, 500, size=(size, 3))
+    batch["tags"] = [
+        repr(dict(zip((GENRES[i] for i in rng.choice(len(GENRES), 3, replace=False)), map(int, votes))))
+        for votes in tag_votes
+    ]
+
+    # Steam shows a review percentage from 10 reviews on, -1 before that
+    total = positive + negative
+    pct = np.where(total >= 10, np.round(100 * positive / np.maximum(total, 1)), -1).astype(int)
+    batch["pct_pos_total"] = pd.Series(pct, index=row).where(~missing).astype("Int64")
+    batch["num_reviews_total"] = pd.Series(total, index=row).where(~missing).astype("Int64")
+    recent = (total * rng.random(size) * 0.05).astype(np.int64)
+    batch["pct_pos_recent"] = np.where(recent >= 10, pct, -1)
+    batch["num_reviews_recent"] = recent
+
+    return batch[list(SCHEMA)]
+
+
+def generate(rows, output_path, seed=SEED, batch_size=ROW_BATCH_SIZE):
+    """Write rows synthetic games to output_path in batches; returns the path."""
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    rng = np.random.default_rng(seed)
+    tmp_path = output_path + ".tmp"
+    start = time.perf_counter()
+    with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+        for first_row in range(0, rows, batch_size):
+            size = min(batch_size, rows - first_row)
+            generate_batch(rng, first_row, size, rows).to_csv(
+                f, header=first_row == 0, index=False
+            )
+    os.replace(tmp_path, output_path)
+    print(
+        f"Wrote {rows} synthetic games to {output_path} "
+        f"({os.path.getsize(output_path) / 1e6:.1f} MB) in {time.perf_counter() - start:.1f}s"
+    )
+    return output_path
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS
+    output_path = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_OUTPUT.format(rows=rows)
+    generate(rows, output_path)
+
+
+if __name__ == "__main__":
+    main()
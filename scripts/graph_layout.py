@@ -0,0 +1,190 @@
+import numpy as np
+
+# --- Configuration ---
+# Fruchterman-Reingold layout: linked nodes attract, all nodes repel, and a
+# weak pull towards the centre keeps unlinked components close by. The
+# random start is seeded, so the same graph always gets the same layout.
+LAYOUT_ITERATIONS = 300
+LAYOUT_SEED = 42
+LAYOUT_GRAVITY = 0.05
+# Up to this many nodes every pair of nodes repels; larger graphs use a
+# Barnes-Hut style quadtree, in which the nodes of a cell that is far away
+# compared to its size repel as one body at the cell's centroid
+LAYOUT_EXACT_MAX_NODES = 500
+# The quadtree is refined until no leaf cell holds more than LAYOUT_LEAF_SIZE
+# nodes, or it is LAYOUT_MAX_DEPTH levels deep
+LAYOUT_LEAF_SIZE = 32
+LAYOUT_MAX_DEPTH = 20
+# Rows of the node-to-node matrix computed at once
+LAYOUT_CHUNK_SIZE = 512
+# Positions are scaled to fit [-LAYOUT_EXTENT, LAYOUT_EXTENT]
+LAYOUT_EXTENT = 1000
+
+
+# Offsets from a cell to the cells of its interaction list: the 6 x 6
+# children of its parent's neighbourhood, minus its own 3 x 3 neighbourhood.
+# Indexed by the cell's x and y parity, as its parent's position depends on it.
+INTERACTION_OFFSETS = np.array([
+    [
+        [
+            (ox, oy)
+            for ox in range(-2 - px, 4 - px)
+            for oy in range(-2 - py, 4 - py)
+            if abs(ox) > 1 or abs(oy) > 1
+        ]
+        for py in range(2)
+    ]
+    for px in range(2)
+])
+
+
+# --- Helper Functions ---
+def repulsion_from(disp, rows, pos, points):
+    """Add the repulsion of all points on the nodes in rows."""
+    dx = pos[rows, 0, None] - points[None, :, 0]
+    dy = pos[rows, 1, None] - points[None, :, 1]
+    # Force 1 / distance along the unit vector: delta / distance^2
+    scale = dx * dx
+    scale += dy * dy
+    np.maximum(scale, 1e-9, out=scale)
+    np.reciprocal(scale, out=scale)
+    disp[rows, 0] += (dx * scale).sum(axis=1)
+    disp[rows, 1] += (dy * scale).sum(axis=1)
+
+
+def exact_repulsion(pos):
+    """Repulsion of every node from every other node (force 1/distance)."""
+    disp = np.zeros_like(pos)
+    for start in range(0, len(pos), LAYOUT_CHUNK_SIZE):
+        # The node itself has delta 0 and adds nothing
+        repulsion_from(disp, slice(start, start + LAYOUT_CHUNK_SIZE), pos, pos)
+    return disp
+
+
+def pairwise_force(disp, pos, i, j):
+    """Add the repulsion of nodes j on nodes i, pair by pair."""
+    dx = np.take(pos[:, 0], i) - np.take(pos[:, 0], j)
+    dy = np.take(pos[:, 1], i) - np.take(pos[:, 1], j)
+    scale = 1 / np.maximum(dx * dx + dy * dy, 1e-9)
+    disp[:, 0] += np.bincount(i, weights=dx * scale, minlength=len(pos))
+    disp[:, 1] += np.bincount(i, weights=dy * scale, minlength=len(pos))
+
+
+def occupied_cells(cell, cells):
+    """Per occupied cell: node counts; per node: its cell's slot; and a lookup.
+
+    The lookup maps cell ids to (slot, occupied). Levels with few cells use
+    the ids as slots, deep levels only store the occupied cells.
+    """
+    if cells <= 16 * len(cell):
+        counts = np.bincount(cell, minlength=cells)
+
+        def find(query):
+            slot = np.clip(query, 0, cells - 1)
+            return slot, np.take(counts, slot) > 0
+
+        return counts, cell, find
+
+    ids, inverse, counts = np.unique(cell, return_inverse=True, return_counts=True)
+
+    def find(query):
+        slot = np.minimum(np.searchsorted(ids, query), len(ids) - 1)
+        return slot, np.take(ids, slot) == query
+
+    return counts, inverse, find
+
+
+def quadtree_repulsion(pos):
+    """Approximate repulsion of every node from every other node.
+
+    On each level of a quadtree over the nodes, a node is repelled by the
+    cells that lie within its parent cell's neighbourhood but not next to
+    its own cell, each cell acting as one body at its centroid. The tree
+    is refined until no leaf holds more than LAYOUT_LEAF_SIZE nodes; nodes
+    in the same or an adjacent leaf repel each other pair by pair.
+    """
+    n = len(pos)
+    low = pos.min(axis=0)
+    span = np.maximum(pos.max(axis=0) - low, 1e-9).max()
+    unit = (pos - low) / span
+
+    disp = np.zeros_like(pos)
+    level = 1
+    while True:
+        level += 1
+        size = 2 ** level
+        coords = np.minimum(unit * size, size - 1).astype(np.int64)
+        cell = coords[:, 1] * size + coords[:, 0]
+        counts, slots, find = occupied_cells(cell, size * size)
+        mass = np.maximum(counts, 1)
+        centroid_x = np.bincount(slots, weights=pos[:, 0], minlength=len(counts)) / mass
+        centroid_y = np.bincount(slots, weights=pos[:, 1], minlength=len(counts)) / mass
+        # The 27 cells of the interaction list, for all nodes at once
+        parity = coords[:, 0] % 2 * 2 + coords[:, 1] % 2
+        x = coords[:, 0, None] + np.take(INTERACTION_OFFSETS[..., 0].reshape(4, -1), parity, axis=0)
+        y = coords[:, 1, None] + np.take(INTERACTION_OFFSETS[..., 1].reshape(4, -1), parity, axis=0)
+        slot, occupied = find(y * size + x)
+        occupied &= (x >= 0) & (x < size) & (y >= 0) & (y < size)
+        dx = pos[:, 0, None] - np.take(centroid_x, slot)
+        dy = pos[:, 1, None] - np.take(centroid_y, slot)
+        weight = np.where(occupied, np.take(counts, slot), 0) / np.maximum(dx * dx + dy * dy, 1e-9)
+        disp[:, 0] += (dx * weight).sum(axis=1)
+        disp[:, 1] += (dy * weight).sum(axis=1)
+        if counts.max() <= LAYOUT_LEAF_SIZE or level >= LAYOUT_MAX_DEPTH:
+            break
+
+    # Finest level: pairs of nodes in the same or adjacent cells. Sorted by
+    # slot, the nodes of each cell form one run.
+    order = np.argsort(slots, kind="stable")
+    run_starts = np.cumsum(counts) - counts
+    nodes = np.arange(n)
+    for ox in (-1, 0, 1):
+        for oy in (-1, 0, 1):
+            x, y = coords[:, 0] + ox, coords[:, 1] + oy
+            slot, occupied = find(y * size + x)
+            occupied &= (x >= 0) & (x < size) & (y >= 0) & (y < size)
+            runs = np.where(occupied, np.take(counts, slot), 0)
+            i = np.repeat(nodes, runs)
+            # Position of each pair within its node's run, plus the run start
+            offsets = np.arange(runs.sum()) - np.repeat(np.cumsum(runs) - runs, runs)
+            j = order[np.repeat(np.take(run_starts, slot), runs) + offsets]
+            pairwise_force(disp, pos, i, j)
+    return disp
+
+
+def force_layout(n, sources, targets, weights=None):
+    """Positions (n x 2) of a graph given as arrays of edge endpoints.
+
+    Edge weights pull linked nodes together by 1 + log2(weight), so a pair
+    that shares many games sits closer than one that shares a single game.
+    """
+    rng = np.random.default_rng(LAYOUT_SEED)
+    if n == 0:
+        return np.zeros((0, 2))
+    sources = np.asarray(sources, dtype=np.int64)
+    targets = np.asarray(targets, dtype=np.int64)
+    weights = np.ones(len(sources)) if weights is None else np.asarray(weights, dtype=float)
+    pull = 1 + np.log2(np.maximum(weights, 1))
+
+    # Ideal edge length 1 in a square of area n
+    side = np.sqrt(n)
+    pos = rng.uniform(-side / 2, side / 2, size=(n, 2))
+    repulsion = exact_repulsion if n <= LAYOUT_EXACT_MAX_NODES else quadtree_repulsion
+    for step in range(LAYOUT_ITERATIONS):
+        disp = repulsion(pos)
+        delta = pos[sources] - pos[targets]
+        dist = np.sqrt((delta ** 2).sum(axis=1))
+        force = delta * (dist * pull)[:, None]
+        for axis in range(2):
+            disp[:, axis] -= np.bincount(sources, weights=force[:, axis], minlength=n)
+            disp[:, axis] += np.bincount(targets, weights=force[:, axis], minlength=n)
+        disp -= LAYOUT_GRAVITY * pos
+
+        # Moves are capped by a temperature that cools linearly to zero
+        temperature = side / 10 * (1 - step / LAYOUT_ITERATIONS)
+        length = np.maximum(np.sqrt((disp ** 2).sum(axis=1)), 1e-9)
+        pos += disp / length[:, None] * np.minimum(length, temperature)[:, None]
+
+    pos -= pos.mean(axis=0)
+    extent = np.abs(pos).max()
+    return pos * (LAYOUT_EXTENT / extent) if extent > 0 else pos
@@ -0,0 +1,136 @@
+import numpy as np
+from scipy import sparse
+from scipy.sparse import csgraph
+
+# --- Configuration ---
+# PageRank: damping factor, and the power iteration stops once the ranks
+# change by less than PAGERANK_TOLERANCE in total (L1) or after
+# PAGERANK_MAX_ITERATIONS steps
+PAGERANK_DAMPING = 0.85
+PAGERANK_TOLERANCE = 1e-9
+PAGERANK_MAX_ITERATIONS = 100
+# Label propagation: every node takes the label with the largest total link
+# weight among its neighbours. A seeded random half of the nodes moves per
+# step, as all nodes moving at once makes labels flip back and forth on
+# bipartite graphs such as developers and publishers.
+COMMUNITY_SEED = 42
+COMMUNITY_MAX_ITERATIONS = 100
+
+
+# --- Helper Functions ---
+def adjacency_matrix(n, sources, targets, weights=None):
+    """Symmetric n x n CSR matrix of an undirected graph's link weights."""
+    sources = np.asarray(sources, dtype=np.int64)
+    targets = np.asarray(targets, dtype=np.int64)
+    weights = np.ones(len(sources)) if weights is None else np.asarray(weights, dtype=float)
+    rows = np.concatenate([sources, targets])
+    cols = np.concatenate([targets, sources])
+    matrix = sparse.coo_matrix(
+        (np.concatenate([weights, weights]), (rows, cols)), shape=(n, n)
+    ).tocsr()
+    # Links given twice add up
+    matrix.sum_duplicates()
+    return matrix
+
+
+def relabel_by_size(labels):
+    """Renumber labels 0, 1, ... from the largest group down; also the sizes."""
+    _, inverse, counts = np.unique(labels, return_inverse=True, return_counts=True)
+    # Stable, so equal-sized groups keep the order of their old labels
+    rank = np.empty(len(counts), dtype=np.int64)
+    rank[np.argsort(-counts, kind="stable")] = np.arange(len(counts))
+    return rank[inverse], counts[inverse]
+
+
+def pagerank(adjacency):
+    """Weighted PageRank of every node, summing to 1, by power iteration.
+
+    Nodes without links spread their rank evenly over all nodes.
+    """
+    n = adjacency.shape[0]
+    out_weight = np.asarray(adjacency.sum(axis=1)).ravel()
+    dangling = out_weight == 0
+    inverse_out = np.divide(1.0, out_weight, out=np.zeros(n), where=~dangling)
+    transposed = adjacency.T.tocsr()
+    rank = np.full(n, 1.0 / n)
+    for _ in range(PAGERANK_MAX_ITERATIONS):
+        spread = transposed @ (rank * inverse_out) + rank[dangling].sum() / n
+        new_rank = (1 - PAGERANK_DAMPING) / n + PAGERANK_DAMPING * spread
+        change = np.abs(new_rank - rank).sum()
+        rank = new_rank
+        if change < PAGERANK_TOLERANCE:
+            break
+    return rank
+
+
+def label_propagation(adjacency):
+    """Community label of every node, by weighted label propagation."""
+    n = adjacency.shape[0]
+    rng = np.random.default_rng(COMMUNITY_SEED)
+    labels = np.arange(n)
+    # Without links every node is a community of its own
+    if adjacency.nnz == 0:
+        return labels
+    coo = adjacency.tocoo()
+    for _ in range(COMMUNITY_MAX_ITERATIONS):
+        changed = 0
+        for moving in np.array_split(rng.permutation(n), 2):
+            is_moving = np.zeros(n, dtype=bool)
+            is_moving[moving] = True
+            links = is_moving[coo.row]
+            # Total link weight per (node, neighbour label)
+            votes = sparse.csr_matrix(
+                (coo.data[links], (coo.row[links], labels[coo.col[links]])), shape=(n, n)
+            )
+            votes.sum_duplicates()
+            # None of the moving nodes has a link this half-step
+            if votes.nnz == 0:
+                continue
+            rows = np.repeat(np.arange(n), np.diff(votes.indptr))
+            # Per node the heaviest label; on a tie the current label stays,
+            # otherwise the smallest label wins
+            keep = votes.indices == labels[rows]
+            order = np.lexsort((votes.indices, ~keep, -votes.data, rows))
+            first = order[np.r_[True, rows[order][1:] != rows[order][:-1]]]
+            winners = votes.indices[first]
+            voters = rows[first]
+            changed += np.count_nonzero(winners != labels[voters])
+            labels[voters] = winners
+        if changed == 0:
+            break
+    return labels
+
+
+def graph_metrics(n, sources, targets, weights=None):
+    """Per-node metrics of an undirected weighted graph, as a dict of arrays.
+
+    component / community: ids numbered from the largest group down, with
+    component_size and community_size; degree: number of neighbours;
+    weighted_degree: total link weight; pagerank: weighted PageRank scaled
+    so that the average node has 1.
+    """
+    adjacency = adjacency_matrix(n, sources, targets, weights)
+    if n == 0:
+        # PageRank and connected_components need at least one node
+        empty = np.zeros(0, dtype=np.int64)
+        return {
+            "component": empty,
+            "component_size": empty,
+            "degree": empty,
+            "weighted_degree": np.zeros(0),
+            "pagerank": np.zeros(0),
+            "community": empty,
+            "community_size": empty,
+        }
+    _, components = csgraph.connected_components(adjacency, directed=False)
+    component, component_size = relabel_by_size(components)
+    community, community_size = relabel_by_size(label_propagation(adjacency))
+    return {
+        "component": component,
+        "component_size": component_size,
+        "degree": np.diff(adjacency.indptr),
+        "weighted_degree": np.asarray(adjacency.sum(axis=1)).ravel(),
+        "pagerank": pagerank(adjacency) * n,
+        "community": community,
+        "community_size": community_size,
+    }
@@ -0,0 +1,261 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from data_cache import CACHE_DIR
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# --- Configuration ---
+# Each script writes a run report <script>.json here: per stage wall time,
+# CPU time, peak memory growth, rows in/out and bytes written. Like the data
+# cache it stays outside public/, so it never ends up in the React build.
+REPORT_DIR = os.path.join(CACHE_DIR, "run_reports")
+# Opt-in profiling, e.g. PIPELINE_PROFILE=cprofile python scripts/x.py:
+# 'cprofile' profiles each stage in its own thread and saves the profiles of
+# the PROFILE_TOP_STAGES slowest stages as .prof files next to the report;
+# 'tracemalloc' attaches the lines that allocated the most Python memory
+# (whole process, so stages running at the same time see each other's).
+PROFILE_MODE = os.environ.get("PIPELINE_PROFILE") or None
+PROFILE_TOP_STAGES = 3
+PROFILE_TOP_ENTRIES = 15
+# Stages listed in the summary printed at the end of a run
+SUMMARY_STAGES = 5
+# Seconds between samples of the current resident memory while stages run;
+# a stage's peak is the highest sample, so shorter spikes can be missed
+RSS_SAMPLE_INTERVAL = 0.01
+
+
+# --- Helper Functions ---
+def peak_rss_mb():
+    """Peak resident memory of this process so far, or None if unknown."""
+    if resource is None:
+        return None
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (2**20 if sys.platform == "darwin" else 2**10), 1)
+
+
+def current_rss_mb():
+    """Resident memory of this process right now, or None if unknown.
+
+    Read from /proc, so only known on Linux.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return round(pages * os.sysconf("SC_PAGE_SIZE") / 2**20, 1)
+
+
+class RssSampler:
+    """Samples the current resident memory in a background thread.
+
+    Each watcher keeps the highest sample taken while it is watched. Memory
+    is that of the whole process, so stages running at the same time see
+    each other's.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = threading.Event()
+        self.watchers = []
+        self.thread = None
+
+    def watch(self):
+        """Start watching; returns the watcher, or None if RSS is unknown."""
+        rss = current_rss_mb()
+        if rss is None:
+            return None
+        watcher = {"start": rss, "peak": rss}
+        with self.lock:
+            self.watchers.append(watcher)
+            self.active.set()
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name="rss-sampler", daemon=True)
+                self.thread.start()
+        return watcher
+
+    def unwatch(self, watcher):
+        """Stop watching; returns the watcher with its final peak."""
+        rss = current_rss_mb()
+        with self.lock:
+            watcher["peak"] = max(watcher["peak"], rss or 0)
+            self.watchers = [other for other in self.watchers if other is not watcher]
+            if not self.watchers:
+                self.active.clear()
+        return watcher
+
+    def run(self):
+        while True:
+            self.active.wait()
+            rss = current_rss_mb()
+            with self.lock:
+                for watcher in self.watchers:
+                    watcher["peak"] = max(watcher["peak"], rss)
+            time.sleep(RSS_SAMPLE_INTERVAL)
+
+
+class RunReport:
+    """Stage measurements of one script run."""
+
+    def __init__(self, name):
+        self.name = name
+        self.started_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        self.start = time.perf_counter()
+        self.stages = []
+        self.lock = threading.Lock()
+        if PROFILE_MODE == "tracemalloc" and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def add(self, record):
+        with self.lock:
+            self.stages.append(record)
+
+    def profiled_stages(self):
+        """The PROFILE_TOP_STAGES slowest stages that carry a profile."""
+        profiled = [record for record in self.stages if "_profile" in record]
+        profiled.sort(key=lambda record: record["wall_seconds"], reverse=True)
+        return profiled[:PROFILE_TOP_STAGES]
+
+    def write(self):
+        os.makedirs(REPORT_DIR, exist_ok=True)
+        # Profiles of an earlier run would be mistaken for this run's
+        for name in os.listdir(REPORT_DIR):
+            if name.startswith(f"{self.name}.") and name.endswith(".prof"):
+                os.remove(os.path.join(REPORT_DIR, name))
+        for record in self.profiled_stages():
+            record["profile"] = attach_profile(self.name, record)
+        stages = [
+            {key: value for key, value in record.items() if not key.startswith("_")}
+            for record in self.stages
+        ]
+        report = {
+            "script": self.name,
+            "started_at": self.started_at,
+            "total_seconds": round(time.perf_counter() - self.start, 4),
+            "peak_rss_mb": peak_rss_mb(),
+            "profile_mode": PROFILE_MODE,
+            "stages": stages,
+        }
+        path = os.path.join(REPORT_DIR, f"{self.name}.json")
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2, default=str)
+
+        print(f"Slowest stages of {self.name} (run report: {path}):")
+        for record in sorted(stages, key=lambda r: r["wall_seconds"], reverse=True)[:SUMMARY_STAGES]:
+            print(
+                f"  {record['name']}: {record['wall_seconds']:.3f}s wall, "
+                f"{record['cpu_seconds']:.3f}s CPU, +{record['peak_rss_delta_mb'] or 0:.1f} MB peak"
+            )
+
+
+def attach_profile(report_name, record):
+    """Summary of a stage's profile for the report; cProfile data is saved too."""
+    profile = record["_profile"]
+    if isinstance(profile, cProfile.Profile):
+        stage_file = "".join(c if c.isalnum() else "_" for c in record["name"])
+        path = os.path.join(REPORT_DIR, f"{report_name}.{stage_file}.prof")
+        profile.dump_stats(path)
+        text = io.StringIO()
+        pstats.Stats(profile, stream=text).sort_stats("cumulative").print_stats(PROFILE_TOP_ENTRIES)
+        return {"file": path, "top": text.getvalue().splitlines()}
+    # A tracemalloc snapshot diff
+    return {
+        "top": [
+            f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}: "
+            f"{stat.size_diff / 2**20:+.2f} MB in {stat.count_diff:+d} blocks"
+            for stat in profile[:PROFILE_TOP_ENTRIES]
+        ]
+    }
+
+
+_run = None
+_local = threading.local()
+_rss_sampler = RssSampler()
+# Python 3.12+ allows one active cProfile profiler per process, so stages
+# that overlap a profiled one run unprofiled
+_profiler_lock = threading.Lock()
+
+
+def start_run(name):
+    """Start collecting the stages of this script run."""
+    global _run
+    _run = RunReport(name)
+
+
+def finish_run():
+    """Write the report of the current run, if any stage ran."""
+    global _run
+    run, _run = _run, None
+    if run is not None and run.stages:
+        run.write()
+
+
+@contextmanager
+def stage(name, rows_in=None):
+    """Measure a block of work as one stage of the current run.
+
+    Yields the stage's record, in which the block can set rows_out and
+    bytes_written. cpu_seconds is the CPU time of the whole process, so it
+    includes DuckDB's worker threads and stages running at the same time.
+    peak_rss_mb is the highest resident memory sampled during the stage and
+    peak_rss_delta_mb its growth over the memory at the start (see
+    RssSampler; None where it cannot be read).
+    Outside a run (start_run) the stage is measured but not reported.
+    """
+    record = {"name": name, "rows_in": rows_in, "rows_out": None, "bytes_written": None}
+    stack = _local.__dict__.setdefault("stack", [])
+    if stack:
+        record["parent"] = stack[-1]
+    profiler = None
+    snapshot = None
+    # Only the outermost stage of a thread is profiled
+    if _run is not None and not stack:
+        if PROFILE_MODE == "cprofile" and _profiler_lock.acquire(blocking=False):
+            profiler = cProfile.Profile()
+        elif PROFILE_MODE == "tracemalloc" and tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+
+    stack.append(name)
+    watcher = _rss_sampler.watch()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield record
+    except Exception as e:
+        record["error"] = str(e)
+        raise
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            _profiler_lock.release()
+            record["_profile"] = profiler
+        elif snapshot is not None:
+            record["_profile"] = tracemalloc.take_snapshot().compare_to(snapshot, "lineno")
+        record["wall_seconds"] = round(time.perf_counter() - wall_start, 4)
+        record["cpu_seconds"] = round(time.process_time() - cpu_start, 4)
+        if watcher is not None:
+            _rss_sampler.unwatch(watcher)
+            record["peak_rss_mb"] = watcher["peak"]
+            record["peak_rss_delta_mb"] = round(watcher["peak"] - watcher["start"], 1)
+        else:
+            record["peak_rss_mb"] = None
+            record["peak_rss_delta_mb"] = None
+        stack.pop()
+        if _run is not None:
+            _run.add(record)
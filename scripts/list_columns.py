@@ -0,0 +1,166 @@
+import ast
+import json
+import os
+from functools import lru_cache
+
+import pandas as pd
+
+from data_cache import (
+    CSV_PATH,
+    available_columns,
+    cache_source_sql,
+    connect,
+    derived_cache_path,
+    iter_batches,
+    sql_literal,
+    write_parquet,
+)
+
+# --- Configuration ---
+# List-valued column -> value column name of its appid bridge table
+BRIDGE_COLUMNS = {
+    "genres": "genre",
+    "categories": "category",
+    "developers": "developer",
+    "publishers": "publisher",
+}
+# Distinct list strings whose parse is remembered across calls and batches.
+# Genre and category strings repeat across the whole file; the cap keeps
+# unique developer and screenshot strings from piling up in memory.
+PARSE_CACHE_SIZE = 4096
+
+
+# --- Helper Functions ---
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_list_literal(value):
+    """Parse one stored list such as "['Action', 'Indie']" into a tuple.
+
+    Python literals are tried first (names with apostrophes are written with
+    double quotes there), JSON second. Dict items such as Steam categories
+    contribute their 'description'. Unparseable values give an empty tuple.
+    """
+    if not isinstance(value, str) or not value.strip():
+        return ()
+    try:
+        parsed = ast.literal_eval(value)
+    except (ValueError, SyntaxError, MemoryError, RecursionError):
+        try:
+            parsed = json.loads(value)
+        except ValueError:
+            return ()
+    if not isinstance(parsed, (list, tuple)):
+        return ()
+
+    items = []
+    for item in parsed:
+        if isinstance(item, dict):
+            item = item.get("description")
+        if item is None:
+            continue
+        item = str(item).strip()
+        if item:
+            items.append(item)
+    return tuple(items)
+
+
+def parse_list_column(series):
+    """Parse a list-literal column, each distinct string only once.
+
+    Genre and category strings repeat heavily, so the parse cost scales with
+    the number of distinct values rather than with the number of rows. The
+    streaming scripts (developer universe, Game DNA, timeline) use this per
+    batch, as they need each game's list in its original order.
+    """
+    parsed = {value: parse_list_literal(value) for value in series.dropna().unique()}
+    return pd.Series(
+        [parsed.get(value, ()) for value in series], index=series.index, dtype=object
+    )
+
+
+def bridge_table(appids, series, value_name):
+    """Normalize a list column into an (appid, value) table, one row per item."""
+    table = pd.DataFrame(
+        {"appid": appids.to_numpy(), value_name: parse_list_column(series).to_numpy()}
+    )
+    table = table.explode(value_name).dropna(subset=[value_name])
+    return table.drop_duplicates().reset_index(drop=True)
+
+
+def bridge_table_paths(columns=None, csv_path=CSV_PATH):
+    """Return {list column: Parquet path} of the bridge tables, building them once.
+
+    The tables are cached next to the columnar cache of the CSV and share its
+    content hash, so they are only rebuilt when the CSV changes. The
+    hypothesis queries and the query server join against them (see
+    create_bridge_tables).
+    """
+    columns = list(BRIDGE_COLUMNS) if columns is None else columns
+    paths = {
+        column: derived_cache_path(csv_path, f"{column}.parquet")
+        for column in columns
+    }
+    stale = [column for column, path in paths.items() if not os.path.exists(path)]
+    present = set(available_columns(csv_path))
+    for column in [column for column in stale if column not in present]:
+        print(f"Warning: Column '{column}' not found in {csv_path}.")
+        stale.remove(column)
+        del paths[column]
+    if stale:
+        print(f"Building bridge tables for {stale}...")
+        _build_bridge_tables({column: paths[column] for column in stale}, csv_path)
+    return paths
+
+
+def _build_bridge_tables(paths, csv_path):
+    """Parse the list columns batch by batch and write their bridge tables.
+
+    Batches are appended to DuckDB tables, which spill to disk when they
+    outgrow data_cache.MEMORY_LIMIT, so memory use stays bounded.
+    """
+    con = connect()
+    try:
+        appid_type = con.execute(
+            f"SELECT typeof(appid) FROM {cache_source_sql(csv_path)} LIMIT 1"
+        ).fetchone()[0]
+        for column in paths:
+            con.execute(
+                f"CREATE TABLE bridge_{column} "
+                f"(seq BIGINT, appid {appid_type}, {BRIDGE_COLUMNS[column]} VARCHAR)"
+            )
+        seq = 0
+        for batch in iter_batches(["appid", *paths], csv_path=csv_path):
+            for column in paths:
+                table = bridge_table(batch["appid"], batch[column], BRIDGE_COLUMNS[column])
+                table.insert(0, "seq", range(seq, seq + len(table)))
+                seq += len(table)
+                con.register("bridge_df", table)
+                con.execute(f"INSERT INTO bridge_{column} SELECT * FROM bridge_df")
+                con.unregister("bridge_df")
+        for column, path in paths.items():
+            value_name = BRIDGE_COLUMNS[column]
+            # Rows of duplicate appids can fall into different batches, so
+            # pairs are deduplicated once more, keeping the first occurrence
+            write_parquet(
+                con,
+                f"SELECT appid, {value_name} FROM bridge_{column} "
+                f"QUALIFY ROW_NUMBER() OVER (PARTITION BY appid, {value_name} ORDER BY seq) = 1 "
+                f"ORDER BY seq",
+                path,
+            )
+    finally:
+        con.close()
+
+
+def create_bridge_tables(con, table_prefix, csv_path=CSV_PATH):
+    """Materialize every bridge table in DuckDB as <table_prefix>_<column>.
+
+    Returns the names of the tables that were created.
+    """
+    created = []
+    for column, path in bridge_table_paths(csv_path=csv_path).items():
+        name = f"{table_prefix}_{column}"
+        con.execute(
+            f"CREATE OR REPLACE TABLE {name} AS SELECT * FROM read_parquet({sql_literal(path)})"
+        )
+        created.append(name)
+    return created
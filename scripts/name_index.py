@@ -0,0 +1,177 @@
+import difflib
+import os
+import re
+import unicodedata
+from collections import defaultdict
+
+from build_manifest import code_hash
+from data_cache import (
+    CSV_PATH,
+    available_columns,
+    cache_source_sql,
+    connect,
+    derived_cache_path,
+    iter_batches,
+    sql_literal,
+    write_parquet,
+)
+
+# --- Configuration ---
+# Display fields stored per game next to its appid and normalized name
+DISPLAY_COLUMNS = ["name", "header_image", "release_date", "estimated_owners"]
+# Games with the same normalized name are ranked by their number of reviews
+RANK_COLUMNS = ["positive", "negative"]
+# Minimum difflib similarity (0-1) of a fuzzy match
+FUZZY_CUTOFF = 0.85
+TRADEMARK_SIGNS = re.compile(r"[™®©]")
+NON_WORD = re.compile(r"[\W_]+")
+
+
+# --- Helper Functions ---
+def normalize_name(name):
+    """Lookup key of a game name: case, width, punctuation and ™/® folded.
+
+    "PUBG: BATTLEGROUNDS" and "pubg battlegrounds™" share the key
+    "pubg battlegrounds". Letters of any script are kept.
+    """
+    # Before NFKC, which would turn ™ into "TM"
+    text = TRADEMARK_SIGNS.sub("", str(name))
+    text = NON_WORD.sub(" ", unicodedata.normalize("NFKC", text).casefold())
+    return " ".join(text.split())
+
+
+def name_index_path(csv_path=CSV_PATH):
+    """Parquet path of the index, building it once per CSV and normalization."""
+    version = code_hash(normalize_name, _build_name_index)[:8]
+    path = derived_cache_path(csv_path, f"name_index_{version}.parquet")
+    if not os.path.exists(path):
+        print(f"Building name index for {csv_path}...")
+        _build_name_index(path, csv_path)
+    return path
+
+
+def _build_name_index(path, csv_path):
+    """Normalize the names batch by batch and write the ranked index."""
+    present = set(available_columns(csv_path))
+    display = [col for col in DISPLAY_COLUMNS if col in present]
+    rank = [col for col in RANK_COLUMNS if col in present]
+    reviews = " + ".join(f"COALESCE({col}, 0)" for col in rank) or "0"
+    con = connect()
+    try:
+        con.execute(
+            f"CREATE TABLE names AS SELECT appid, '' AS key "
+            f"FROM {cache_source_sql(csv_path)} LIMIT 0"
+        )
+        for batch in iter_batches(["appid", "name"], csv_path=csv_path):
+            batch = batch.dropna(subset=["name"])
+            batch["key"] = [normalize_name(name) for name in batch["name"]]
+            con.register("names_df", batch[batch["key"] != ""][["appid", "key"]])
+            con.execute("INSERT INTO names SELECT * FROM names_df")
+            con.unregister("names_df")
+        # Rank 1 is the most reviewed game of a name, ties go to the lower appid
+        write_parquet(
+            con,
+            f"""
+            SELECT
+                n.key,
+                ROW_NUMBER() OVER (PARTITION BY n.key ORDER BY {reviews} DESC, g.appid) AS rank,
+                g.appid,
+                {", ".join(f"g.{col}" for col in display)},
+                {reviews} AS reviews
+            FROM names n
+            JOIN (SELECT DISTINCT ON (appid) * FROM {cache_source_sql(csv_path)}) g USING (appid)
+            ORDER BY n.key, rank
+            """,
+            path,
+        )
+    finally:
+        con.close()
+
+
+class NameIndex:
+    """Resolves game names to appids and display fields.
+
+    Tries, in order: the exact normalized name; names that contain every
+    word of the query ("grand theft auto v" -> "grand theft auto v legacy"),
+    fewest extra words first; names whose words all occur in the query
+    ("grand theft auto v legacy" -> "grand theft auto v"), most words first;
+    and a fuzzy match of at least FUZZY_CUTOFF.
+    Duplicates resolve to their best-ranked game.
+    """
+
+    def __init__(self, df):
+        self.df = df
+        # Rows are sorted by (key, rank), so the first row of a key is its best
+        self.first_row = {}
+        self.counts = defaultdict(int)
+        for position, key in enumerate(df["key"]):
+            self.first_row.setdefault(key, position)
+            self.counts[key] += 1
+        self._words = None
+
+    @classmethod
+    def load(cls, csv_path=CSV_PATH):
+        con = connect()
+        try:
+            df = con.execute(
+                f"SELECT * FROM read_parquet({sql_literal(name_index_path(csv_path))})"
+            ).df()
+        finally:
+            con.close()
+        return cls(df)
+
+    def words(self):
+        """word -> keys containing it, built on the first non-exact lookup."""
+        if self._words is None:
+            self._words = defaultdict(set)
+            for key in self.first_row:
+                for word in key.split():
+                    self._words[word].add(key)
+        return self._words
+
+    def reviews(self, key):
+        return self.df["reviews"].iat[self.first_row[key]]
+
+    def record(self, key, match):
+        row = self.df.iloc[self.first_row[key]].to_dict()
+        row.update(match=match, duplicates=self.counts[key])
+        return row
+
+    def lookup(self, name):
+        """Best game for a name as a dict with 'match' and 'duplicates', or None."""
+        key = normalize_name(name)
+        if not key:
+            return None
+        if key in self.first_row:
+            return self.record(key, "exact")
+
+        query_words = key.split()
+        words = self.words()
+        postings = [words.get(word, set()) for word in query_words]
+        containing = set.intersection(*postings)
+        if containing:
+            best = min(containing, key=lambda k: (len(k.split()), -self.reviews(k), k))
+            return self.record(best, "words")
+
+        candidates = set().union(*postings)
+        # A short name inside a long query ("portal" in "portal knights") is no match
+        contained = [
+            k for k in candidates
+            if set(k.split()) <= set(query_words) and 2 * len(k.split()) >= len(query_words)
+        ]
+        if contained:
+            best = min(contained, key=lambda k: (-len(k.split()), -self.reviews(k), k))
+            return self.record(best, "words")
+
+        candidates = candidates or self.first_row.keys()
+        close = difflib.get_close_matches(key, candidates, n=1, cutoff=FUZZY_CUTOFF)
+        return self.record(close[0], "fuzzy") if close else None
+
+    def resolve(self, names):
+        """{name: lookup(name)} for a list of names."""
+        return {name: self.lookup(name) for name in names}
+
+
+def load_name_index(csv_path=CSV_PATH):
+    """The name index of the CSV, built on first use."""
+    return NameIndex.load(csv_path)
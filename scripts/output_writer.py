@@ -0,0 +1,207 @@
+import datetime
+import decimal
+import gzip
+import json
+import os
+from functools import lru_cache
+
+import numpy as np
+
+try:
+    import brotli
+except ImportError:  # optional: only needed for the .br variants
+    brotli = None
+
+try:
+    import pyarrow as pa
+except ImportError:  # optional: only needed for Arrow IPC output
+    pa = None
+
+# --- Configuration ---
+# Lists of row objects are written column-oriented (one array per field),
+# which src/utils.js (fromColumnar) turns back into rows in the browser.
+# Only top-level tables are converted: the data itself or the values of its
+# top-level keys. Hierarchical files (game_dna.json) pass columnar=False.
+COLUMNAR = True
+# Also write <name>.arrow (Arrow IPC) next to each list of rows; needs pyarrow
+WRITE_ARROW = False
+# Write <file>.gz and <file>.br next to every output for static hosts that
+# serve precompressed files (e.g. nginx gzip_static / brotli_static). They
+# are rebuilt from the JSON on every run and not committed (see .gitignore).
+# The .br files need the brotli package; without it only .gz is written.
+PRECOMPRESS = True
+# DuckDB types whose NumPy arrays are cast so that fetch_columns gives the
+# same values as fetchall(): DATE comes as datetime64[us]
+NUMPY_CASTS = {"DATE": "datetime64[D]"}
+# DuckDB types that fetchnumpy() turns into float64, losing precision above
+# 2**53 (e.g. SUM of integers); results with these are fetched with fetchall()
+NUMPY_LOSSY_TYPES = {"HUGEINT", "UHUGEINT"}
+
+
+# --- Helper Functions ---
+@lru_cache(maxsize=None)
+def warn_once(message):
+    print(f"Warning: {message}")
+
+
+def fetch_records(result):
+    """Rows of an executed DuckDB query as a list of dicts of native values.
+
+    DuckDB converts the values to Python objects itself while fetching, so
+    no per-value conversion is needed before json.dumps.
+    """
+    names = [column[0] for column in result.description]
+    return [dict(zip(names, row)) for row in result.fetchall()]
+
+
+def fetch_columns(result):
+    """An executed DuckDB query in columnar form (see to_columnar).
+
+    DuckDB hands over each column as one NumPy array, which tolist() turns
+    into native values in one call, so no Python object is built per row.
+    NULLs are masked entries and become None. Results with a column of
+    NUMPY_LOSSY_TYPES are fetched row by row instead, keeping exact values.
+    """
+    types = {name: str(type_) for name, type_, *_ in result.description}
+    if NUMPY_LOSSY_TYPES & set(types.values()):
+        rows = result.fetchall()
+        columns = {name: [row[i] for row in rows] for i, name in enumerate(types)}
+        return {"format": "columnar", "length": len(rows), "columns": columns}
+    columns = {}
+    for name, values in result.fetchnumpy().items():
+        cast = NUMPY_CASTS.get(types[name])
+        if cast is not None:
+            if np.ma.isMaskedArray(values):
+                values = np.ma.masked_array(values.filled(0).astype(cast), mask=values.mask)
+            else:
+                values = values.astype(cast)
+        columns[name] = values.tolist()
+    length = len(next(iter(columns.values()), []))
+    return {"format": "columnar", "length": length, "columns": columns}
+
+
+def json_default(obj):
+    """json.dumps fallback for the few non-JSON types a query can return."""
+    if isinstance(obj, (datetime.date, datetime.datetime)):
+        return obj.isoformat()
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if hasattr(obj, "item"):  # numpy scalars
+        return obj.item()
+    if hasattr(obj, "tolist"):  # numpy arrays
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def is_record_list(value):
+    """True for a non-empty list of dicts that all share the same keys."""
+    if not isinstance(value, list) or not value or not isinstance(value[0], dict):
+        return False
+    keys = list(value[0])
+    return all(isinstance(row, dict) and list(row) == keys for row in value)
+
+
+def is_columnar(value):
+    """True for the output of to_columnar or fetch_columns."""
+    return isinstance(value, dict) and value.get("format") == "columnar"
+
+
+def to_columnar(records):
+    """{"format": "columnar", "length": n, "columns": {field: [values]}}"""
+    fields = list(records[0])
+    return {
+        "format": "columnar",
+        "length": len(records),
+        "columns": {field: [row[field] for row in records] for field in fields},
+    }
+
+
+def to_records(table):
+    """The list of row objects of a columnar table."""
+    fields = list(table["columns"])
+    return [dict(zip(fields, row)) for row in zip(*table["columns"].values())]
+
+
+def columnarize(data):
+    """Convert the top-level lists of row objects in data to columnar.
+
+    Those are data itself or the values of its top-level keys; lists nested
+    deeper (e.g. children of a hierarchy) keep their row objects.
+    """
+    if is_record_list(data):
+        return to_columnar(data)
+    if isinstance(data, dict) and not is_columnar(data):
+        return {
+            key: to_columnar(value) if is_record_list(value) else value
+            for key, value in data.items()
+        }
+    return data
+
+
+def rowify(data):
+    """Convert every columnar table in data, at any depth, to row objects."""
+    if is_columnar(data):
+        return to_records(data)
+    if isinstance(data, dict):
+        return {key: rowify(value) for key, value in data.items()}
+    return data
+
+
+def columnar_tables(data, name):
+    """Yield (name, table) for each columnar table in columnarize(data)."""
+    if is_columnar(data):
+        yield name, data
+    elif isinstance(data, dict):
+        for key, value in data.items():
+            yield from columnar_tables(value, f"{name}.{key}")
+
+
+def write_arrow(path, data):
+    if pa is None:
+        print("Warning: pyarrow is not installed; skipping Arrow output.")
+        return
+    base = os.path.splitext(path)[0]
+    for name, columns in columnar_tables(data, os.path.basename(base)):
+        arrow_path = os.path.join(os.path.dirname(path), f"{name}.arrow")
+        table = pa.table(columns["columns"])
+        with pa.OSFile(arrow_path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+
+def write_precompressed(path, payload):
+    # mtime=0 keeps the .gz bytes identical across rebuilds of the same data
+    with open(path + ".gz", "wb") as f:
+        f.write(gzip.compress(payload, compresslevel=9, mtime=0))
+    if brotli is None:
+        warn_once("brotli is not installed; skipping the .br files.")
+        return
+    with open(path + ".br", "wb") as f:
+        f.write(brotli.compress(payload, quality=11))
+
+
+def write_output(path, data, columnar=None, indent=None, ensure_ascii=True):
+    """Write a processed_data artifact plus its optional companions.
+
+    Lists of row objects and columnar tables (fetch_columns) may be mixed
+    in data; all top-level tables are written in one orientation (see
+    columnarize). Returns the number of bytes of the JSON file.
+    """
+    columnar = COLUMNAR if columnar is None else columnar
+    tables = columnarize(data)
+    data_out = tables if columnar else rowify(data)
+    separators = None if indent is not None else (",", ":")
+    payload = json.dumps(
+        data_out,
+        indent=indent,
+        separators=separators,
+        ensure_ascii=ensure_ascii,
+        default=json_default,
+    ).encode("utf-8")
+    with open(path, "wb") as f:
+        f.write(payload)
+    if WRITE_ARROW:
+        write_arrow(path, tables)
+    if PRECOMPRESS:
+        write_precompressed(path, payload)
+    return len(payload)
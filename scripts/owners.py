@@ -0,0 +1,54 @@
+import pandas as pd
+
+# --- Configuration ---
+OWNER_ESTIMATE_METHODS = ("lower", "upper", "midpoint")
+# '<lower> - <upper>', a single number, thousands separators tolerated
+OWNERS_PATTERN = r"^\s*(?P<lower>\d+)\s*(?:-\s*(?P<upper>\d+))?\s*$"
+
+
+# --- Helper Functions ---
+def check_method(method):
+    if method not in OWNER_ESTIMATE_METHODS:
+        print(
+            f"Warning: Unknown owner estimate method '{method}'. Defaulting to midpoint."
+        )
+        return "midpoint"
+    return method
+
+
+def parse_owners(series):
+    """Parse an 'estimated_owners' column into all estimate variants at once.
+
+    Returns a DataFrame indexed like ``series`` with float columns ``lower``,
+    ``upper`` and ``midpoint``. A single number counts as both bounds;
+    anything unparseable is NaN.
+    """
+    text = series.astype("string").str.replace(",", "", regex=False)
+    bounds = text.str.extract(OWNERS_PATTERN)
+    lower = pd.to_numeric(bounds["lower"], errors="coerce").astype("float64")
+    upper = pd.to_numeric(bounds["upper"], errors="coerce").astype("float64")
+    upper = upper.fillna(lower)
+    return pd.DataFrame(
+        {"lower": lower, "upper": upper, "midpoint": (lower + upper) / 2},
+        index=series.index,
+    )
+
+
+def owners_sql(column):
+    """SQL expressions for each estimate variant of an 'estimated_owners' column.
+
+    Same semantics as parse_owners, for use inside DuckDB queries: the bounds
+    are extracted with the same OWNERS_PATTERN.
+    """
+    text = f"replace(CAST({column} AS VARCHAR), ',', '')"
+    pattern = "'" + OWNERS_PATTERN.replace("'", "''") + "'"
+    # regexp_extract gives '' for a group that did not match
+    lower = f"TRY_CAST(NULLIF(regexp_extract({text}, {pattern}, 1), '') AS DOUBLE)"
+    upper = (
+        f"COALESCE(TRY_CAST(NULLIF(regexp_extract({text}, {pattern}, 2), '') AS DOUBLE), {lower})"
+    )
+    return {
+        "lower": lower,
+        "upper": upper,
+        "midpoint": f"({lower} + {upper}) / 2",
+    }
@@ -1,6 +1,12 @@
-import pandas as pd
-import json
 import os
+import sys
+
+import output_writer
+from build_manifest import code_hash, is_up_to_date, output_entry, record_output
+import name_index
+from instrumentation import finish_run, stage, start_run
+from name_index import load_name_index
+from output_writer import write_output
 
 # --- Configuration ---
 CSV_PATH = "public/data.csv"
@@ -33,27 +39,42 @@ GAMES_DATA = [
 ]
 
 
-def main():
+def process_carousel():
     print("Starting data processing with the user's hand-picked list...")
-    # --- Load Data ---
+    output_path = os.path.join(OUTPUT_DIR, OUTPUT_FILENAME)
     try:
-        df = pd.read_csv(CSV_PATH)
-        print("Successfully loaded main CSV data.")
+        manifest_entry = output_entry(
+            ["appid", "name", "header_image", "positive", "negative"],
+            code_hash(sys.modules[__name__], output_writer, name_index),
+            csv_path=CSV_PATH,
+        )
     except FileNotFoundError:
         print(f"ERROR: Could not find {CSV_PATH}")
         return
+    if is_up_to_date(output_path, manifest_entry):
+        print(f"{output_path} is up to date (see build manifest). Nothing to do.")
+        return
 
-    # Create a mapping of lowercase game names to header images for robust matching
-    df["name_lower"] = df["name"].str.lower()
-    image_map = df.set_index("name_lower")["header_image"].to_dict()
+    # --- Resolve Names ---
+    # The name index is built once per CSV and reused by later runs
+    try:
+        with stage("resolve_names", rows_in=len(GAMES_DATA)) as record:
+            matches = load_name_index(CSV_PATH).resolve([name for name, _ in GAMES_DATA])
+            record["rows_out"] = sum(match is not None for match in matches.values())
+        print("Successfully resolved game names.")
+    except FileNotFoundError:
+        print(f"ERROR: Could not find {CSV_PATH}")
+        return
 
     # --- Prepare Final Data ---
     final_data = []
     for game_name, players in GAMES_DATA:
-        # Try to find a matching header image using a case-insensitive lookup
-        header_image = image_map.get(game_name.lower(), "")
+        match = matches[game_name]
+        header_image = (match or {}).get("header_image") or ""
         if not header_image:
             print(f"Warning: Could not find header image for '{game_name}'.")
+        elif match["match"] != "exact":
+            print(f"Matched '{game_name}' to '{match['name']}' ({match['match']} match).")
 
         final_data.append(
             {
@@ -67,15 +88,23 @@ def main():
     if not os.path.exists(OUTPUT_DIR):
         os.makedirs(OUTPUT_DIR)
 
-    output_path = os.path.join(OUTPUT_DIR, OUTPUT_FILENAME)
-
     try:
-        with open(output_path, "w") as f:
-            json.dump(final_data, f, indent=4)
+        with stage(f"write: {OUTPUT_FILENAME}", rows_in=len(final_data)) as record:
+            record["bytes_written"] = write_output(output_path, final_data)
         print(f"Successfully created {output_path} with data for {len(final_data)} games.")
+        record_output(output_path, manifest_entry)
     except Exception as e:
         print(f"ERROR: Could not save final JSON file: {e}")
 
 
+def main():
+    # Stage timings, memory and sizes go to the run report (see instrumentation.py)
+    start_run("process_carousel_data")
+    try:
+        process_carousel()
+    finally:
+        finish_run()
+
+
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,116 +1,246 @@
 import pandas as pd
-import json
+import numpy as np
 import os
+import sys
+
+import graph_layout
+import graph_metrics
+import list_columns
+import output_writer
+import owners
+from build_manifest import code_hash, is_up_to_date, output_entry, record_output
+from instrumentation import finish_run, stage, start_run
+from data_cache import iter_batches
+from graph_layout import force_layout
+from graph_metrics import graph_metrics
+from list_columns import parse_list_column
+from output_writer import write_output
+from owners import parse_owners
+
+# Nodes are kept if they have more than MIN_GAME_COUNT games or more than
+# MIN_TOTAL_OWNERS owners (lower estimate) across their games
+MIN_GAME_COUNT = 5
+MIN_TOTAL_OWNERS = 250000
+# Keep only each node's LINK_TOP_K heaviest links (most shared games); a
+# link stays if it is among the top links of either end. None keeps all.
+LINK_TOP_K = None
+
+
+def explode_role(df, column, role, role_order):
+    """One row per (game, studio) for the developers or publishers column."""
+    exploded = df[[column]].explode(column).dropna(subset=[column])
+    exploded = exploded.rename(columns={column: 'id'})
+    exploded['game'] = exploded.index
+    exploded['type'] = role
+    # Position of each occurrence in the original row-by-row scan, which
+    # decides a studio's type and the order of the nodes
+    exploded['order'] = exploded.groupby(level=0).cumcount()
+    exploded['role_order'] = role_order
+    return exploded.reset_index(drop=True)
+
+
+def batch_aggregates(df):
+    """Per-studio partial aggregates and studio links of one batch of games.
+
+    The partials are sums and counts, so batches can be merged in any
+    grouping; studios are listed in order of first appearance.
+    """
+    df = df.copy()
+    df['developers'] = parse_list_column(df['developers'])
+    df['publishers'] = parse_list_column(df['publishers'])
+
+    # Per-game values every studio of the game accumulates
+    games = pd.DataFrame(index=df.index)
+    games['owners'] = parse_owners(df['estimated_owners'])['lower']
+    total_reviews = df['positive'] + df['negative']
+    has_reviews = df['positive'].notna() & df['negative'].notna() & (total_reviews > 0)
+    games['review_score'] = (df['positive'] / total_reviews * 100).where(has_reviews)
+
+    developers = explode_role(df, 'developers', 'developer', 0)
+    publishers = explode_role(df, 'publishers', 'publisher', 1)
+    memberships = pd.concat([developers, publishers], ignore_index=True)
+    memberships = memberships.join(games, on='game')
+
+    # Running sums and counts per studio instead of per-studio score lists
+    memberships = memberships.sort_values(['game', 'role_order', 'order'], kind='stable')
+    grouped = memberships.groupby('id', sort=False)
+    nodes = pd.DataFrame({
+        'type': grouped['type'].first(),
+        'game_count': grouped.size(),
+        'total_owners': grouped['owners'].sum(),
+        'review_sum': grouped['review_score'].sum(),
+        'review_count': grouped['review_score'].count(),
+    })
+
+    # Links between all developers and publishers of the same game, as a join
+    pairs = developers[['game', 'id']].merge(
+        publishers[['game', 'id']], on='game', suffixes=('_dev', '_pub')
+    )
+    pairs = pairs[pairs['id_dev'] != pairs['id_pub']]
+    # Consistent order to avoid duplicates
+    dev_first = (pairs['id_dev'] < pairs['id_pub']).to_numpy()
+    links = pd.DataFrame({
+        'game': pairs['game'].to_numpy(),
+        'source': np.where(dev_first, pairs['id_dev'], pairs['id_pub']),
+        'target': np.where(dev_first, pairs['id_pub'], pairs['id_dev']),
+    }).drop_duplicates()
+    # Weight: the number of games the two studios share
+    links = links.groupby(['source', 'target'], sort=False).size().rename('weight').reset_index()
+    return nodes, links
+
+
+def merge_links(batch_links):
+    """Combine the weighted links of all batches, in batch order."""
+    return (
+        pd.concat(batch_links, ignore_index=True)
+        .groupby(['source', 'target'], sort=False)['weight'].sum()
+        .reset_index()
+    )
+
+
+def top_k_links(links, k):
+    """Links among the k heaviest of their source or of their target."""
+    ends = pd.concat([
+        pd.DataFrame({'node': links['source'], 'link': links.index, 'weight': links['weight']}),
+        pd.DataFrame({'node': links['target'], 'link': links.index, 'weight': links['weight']}),
+    ])
+    ends = ends.sort_values(['node', 'weight', 'link'], ascending=[True, False, True])
+    kept = ends[ends.groupby('node').cumcount() < k]['link'].unique()
+    return links.loc[links.index.isin(kept)]
+
+
+def merge_aggregates(batch_nodes):
+    """Combine the per-studio partials of all batches, in batch order."""
+    grouped = pd.concat(batch_nodes).groupby(level=0, sort=False)
+    return pd.DataFrame({
+        'type': grouped['type'].first(),
+        'game_count': grouped['game_count'].sum(),
+        'total_owners': grouped['total_owners'].sum(),
+        'review_sum': grouped['review_sum'].sum(),
+        'review_count': grouped['review_count'].sum(),
+    })
+
 
 def process_developer_universe(input_path, output_path):
-    print(f"Reading data from {input_path}...")
-    
-    # Read the dataset
-    df = pd.read_csv(input_path, usecols=['developers', 'publishers', 'estimated_owners', 'positive', 'negative'])
-    print(f"CSV Columns: {df.columns.tolist()}")
+    columns = ['developers', 'publishers', 'estimated_owners', 'positive', 'negative']
+    manifest_entry = output_entry(
+        columns,
+        code_hash(
+            sys.modules[__name__], owners, list_columns, output_writer, graph_layout, graph_metrics
+        ),
+        csv_path=input_path,
+    )
+    if is_up_to_date(output_path, manifest_entry):
+        print(f"{output_path} is up to date (see build manifest). Nothing to do.")
+        return
 
-    # Initialize dictionaries for nodes and a set for links
-    nodes = {}
-    links = set()
+    print(f"Reading data from {input_path}...")
 
+    # Stream the dataset in batches (see data_cache.ROW_BATCH_SIZE), keeping
+    # only each batch's per-studio partials and links. They are merged once
+    # at the end, as merging after every batch regroups everything so far.
     print("Processing developer and publisher universe...")
-    # Iterate over each game in the dataframe
-    for _, row in df.iterrows():
-        try:
-            developers = json.loads(row['developers'].replace("'", '"')) if pd.notna(row['developers']) else []
-            publishers = json.loads(row['publishers'].replace("'", '"')) if pd.notna(row['publishers']) else []
-        except (json.JSONDecodeError, TypeError):
-            continue
-
-        # Process developers
-        for dev in developers:
-            if dev not in nodes:
-                nodes[dev] = {'type': 'developer', 'game_count': 0, 'total_owners': 0, 'review_scores': []}
-            nodes[dev]['game_count'] += 1
-            if pd.notna(row['estimated_owners']):
-                nodes[dev]['total_owners'] += int(row['estimated_owners'].split(' - ')[0])
-            if pd.notna(row['positive']) and pd.notna(row['negative']):
-                total_reviews = row['positive'] + row['negative']
-                if total_reviews > 0:
-                    nodes[dev]['review_scores'].append((row['positive'] / total_reviews) * 100)
-        
-        # Process publishers
-        for pub in publishers:
-            if pub not in nodes:
-                nodes[pub] = {'type': 'publisher', 'game_count': 0, 'total_owners': 0, 'review_scores': []}
-            nodes[pub]['game_count'] += 1
-            if pd.notna(row['estimated_owners']):
-                nodes[pub]['total_owners'] += int(row['estimated_owners'].split(' - ')[0])
-            if pd.notna(row['positive']) and pd.notna(row['negative']):
-                total_reviews = row['positive'] + row['negative']
-                if total_reviews > 0:
-                    nodes[pub]['review_scores'].append((row['positive'] / total_reviews) * 100)
-
-        # Create links between all developers and publishers of the same game
-        for dev in developers:
-            for pub in publishers:
-                if dev != pub:
-                    # Add links in a consistent order to avoid duplicates
-                    link = tuple(sorted((dev, pub)))
-                    links.add(link)
-
-    # Finalize node data and create list
-    all_nodes = []
-    for name, data in nodes.items():
-        avg_review_score = sum(data['review_scores']) / len(data['review_scores']) if data['review_scores'] else 0
-        all_nodes.append({
-            'id': name,
-            'type': data['type'],
-            'game_count': data['game_count'],
-            'total_owners': data['total_owners'],
-            'avg_review_score': round(avg_review_score, 2)
-        })
-
-    # Stage 1: Filter nodes to only include more significant ones
-    print(f"Total nodes before filtering: {len(all_nodes)}")
-    initially_filtered_nodes = [
-        node for node in all_nodes
-        if node['game_count'] > 5 or node['total_owners'] > 250000
-    ]
-    print(f"Nodes after initial filtering: {len(initially_filtered_nodes)}")
-
-    # Create a set of IDs from the initially filtered nodes for quick lookup
-    initially_filtered_node_ids = {node['id'] for node in initially_filtered_nodes}
-
-    # Filter links to only include connections between these nodes
-    filtered_links = [
-        {'source': source, 'target': target} for source, target in links
-        if source in initially_filtered_node_ids and target in initially_filtered_node_ids
-    ]
-
-    # Stage 2: Remove nodes that have no connections after filtering
-    connected_node_ids = set()
-    for link in filtered_links:
-        connected_node_ids.add(link['source'])
-        connected_node_ids.add(link['target'])
-    
-    final_nodes = [
-        node for node in initially_filtered_nodes
-        if node['id'] in connected_node_ids
-    ]
-    print(f"Nodes after removing orphans: {len(final_nodes)}")
-    
-    output_data = {'nodes': final_nodes, 'links': filtered_links}
+    batch_nodes = []
+    batch_links = []
+    with stage('aggregate') as record:
+        record['rows_in'] = 0
+        for batch in iter_batches(columns, csv_path=input_path):
+            record['rows_in'] += len(batch)
+            partial_nodes, partial_links = batch_aggregates(batch)
+            batch_nodes.append(partial_nodes)
+            batch_links.append(partial_links)
+        nodes = merge_aggregates(batch_nodes)
+        links = merge_links(batch_links)
+        del batch_nodes, batch_links
+        record['rows_out'] = len(nodes)
+
+    nodes['total_owners'] = nodes['total_owners'].astype('int64')
+    nodes['avg_review_score'] = (
+        (nodes['review_sum'] / nodes['review_count']).where(nodes['review_count'] > 0, 0).round(2)
+    )
+    nodes = nodes.rename_axis('id').reset_index()
+
+    # Network metrics of the whole, unfiltered graph (see graph_metrics.py)
+    with stage('graph_metrics', rows_in=len(nodes)) as record:
+        node_ids = pd.Index(nodes['id'])
+        metrics = graph_metrics(
+            len(nodes),
+            node_ids.get_indexer(links['source']),
+            node_ids.get_indexer(links['target']),
+            links['weight'].to_numpy(),
+        )
+        for name, values in metrics.items():
+            nodes[name] = values
+        nodes['weighted_degree'] = nodes['weighted_degree'].astype('int64')
+        nodes['pagerank'] = nodes['pagerank'].round(4)
+        record['rows_out'] = len(nodes)
+    print(
+        f"{nodes['component'].nunique()} connected components, "
+        f"{nodes['community'].nunique()} communities."
+    )
+
+    with stage('graph_build', rows_in=len(nodes)) as record:
+        # Stage 1: Filter nodes to only include more significant ones
+        print(f"Total nodes before filtering: {len(nodes)}")
+        initially_filtered_nodes = nodes[
+            (nodes['game_count'] > MIN_GAME_COUNT) | (nodes['total_owners'] > MIN_TOTAL_OWNERS)
+        ]
+        print(f"Nodes after initial filtering: {len(initially_filtered_nodes)}")
+
+        # Filter links to only include connections between these nodes
+        kept_ids = initially_filtered_nodes['id']
+        filtered_links = links[links['source'].isin(kept_ids) & links['target'].isin(kept_ids)]
+        if LINK_TOP_K is not None:
+            filtered_links = top_k_links(filtered_links, LINK_TOP_K)
+            print(f"Links after keeping the top {LINK_TOP_K} per node: {len(filtered_links)}")
+        filtered_links = filtered_links.sort_values(['source', 'target'])
+
+        # Stage 2: Remove nodes that have no connections after filtering
+        connected_node_ids = pd.concat([filtered_links['source'], filtered_links['target']])
+        final_nodes = initially_filtered_nodes[initially_filtered_nodes['id'].isin(connected_node_ids)]
+        print(f"Nodes after removing orphans: {len(final_nodes)}")
+        record['rows_out'] = len(final_nodes)
+
+    # Settled positions, so the browser does not have to run the simulation
+    with stage('layout', rows_in=len(final_nodes)) as record:
+        final_nodes = final_nodes.reset_index(drop=True)
+        position = pd.Series(final_nodes.index, index=final_nodes['id'])
+        xy = force_layout(
+            len(final_nodes),
+            position[filtered_links['source']].to_numpy(),
+            position[filtered_links['target']].to_numpy(),
+            filtered_links['weight'].to_numpy(),
+        )
+        final_nodes['x'] = xy[:, 0].round(1)
+        final_nodes['y'] = xy[:, 1].round(1)
+        record['rows_out'] = len(final_nodes)
+
+    output_data = {
+        'nodes': final_nodes[
+            ['id', 'type', 'game_count', 'total_owners', 'avg_review_score', 'x', 'y', *metrics]
+        ].to_dict(orient='records'),
+        'links': filtered_links[['source', 'target', 'weight']].to_dict(orient='records'),
+    }
 
     print(f"Writing output to {output_path}...")
     # Write the JSON output
-    with open(output_path, 'w') as f:
-        json.dump(output_data, f, indent=4)
+    with stage('write: developer_universe.json', rows_in=len(final_nodes)) as record:
+        record['bytes_written'] = write_output(output_path, output_data)
+    record_output(output_path, manifest_entry)
 
     print("Processing complete.")
 
 if __name__ == '__main__':
     # Get the directory of the script
     script_dir = os.path.dirname(os.path.abspath(__file__))
-    
+
     # Define the relative paths for input and output
     input_csv_path = os.path.join(script_dir, '..', 'public', 'data.csv')
     output_json_path = os.path.join(script_dir, '..', 'public', 'processed_data', 'developer_universe.json')
-    
-    # Run the processing function
-    process_developer_universe(input_csv_path, output_json_path) 
\ No newline at end of file
+
+    # Run the processing function; stages go to the run report
+    start_run('process_developer_universe')
+    try:
+        process_developer_universe(input_csv_path, output_json_path)
+    finally:
+        finish_run()
@@ -1,65 +1,162 @@
-import pandas as pd
-import json
 import os
+import sys
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+import list_columns
+import output_writer
+from build_manifest import code_hash, is_up_to_date, output_entry, record_output
+from instrumentation import finish_run, stage, start_run
+from data_cache import iter_batches
+from list_columns import parse_list_column
+from output_writer import write_output
+
+# Tag groups of the Game DNA hierarchy and the column each one comes from
+TAG_GROUPS = [("Genres", "genres"), ("Categories", "categories")]
+
+
+def incidence_matrix(lists):
+    """Sparse game x tag matrix with a 1 where a game has a tag.
+
+    Returns the CSR matrix and the sorted tag vocabulary of its columns.
+    """
+    exploded = pd.Series(list(lists)).explode().dropna()
+    codes, vocabulary = pd.factorize(exploded, sort=True)
+    matrix = sparse.csr_matrix(
+        (np.ones(len(codes), dtype=np.int32), (exploded.index.to_numpy(), codes)),
+        shape=(len(lists), len(vocabulary)),
+    )
+    # A tag listed twice for the same game still counts once
+    matrix.sum_duplicates()
+    matrix.data[:] = 1
+    return matrix, list(vocabulary)
+
+
+def batch_counts(df):
+    """Tag frequencies and co-occurring tag pair counts of one batch of games.
+
+    Both are Series keyed by tag labels, so batches merge by adding them.
+    """
+    # One incidence block per tag group, side by side in a single matrix.
+    # Unparseable values come back as empty lists and are ignored.
+    blocks = []
+    tags = []
+    for group, column in TAG_GROUPS:
+        matrix, vocabulary = incidence_matrix(parse_list_column(df[column]))
+        blocks.append(matrix)
+        tags.extend((group, name) for name in vocabulary)
+    incidence = sparse.hstack(blocks, format="csr")
+
+    # Tag frequencies are column sums; co-occurrence is the sparse product
+    # incidence^T x incidence, whose (i, j) entry counts games with both tags.
+    # Tags are sorted within each group in every batch, so a pair always has
+    # the same (source, target) orientation.
+    frequencies = pd.Series(
+        np.asarray(incidence.sum(axis=0)).ravel(),
+        index=pd.MultiIndex.from_tuples(tags, names=["group", "name"]),
+    )
+    co_occurrence = sparse.triu(incidence.T @ incidence, k=1).tocoo()
+    pairs = pd.Series(
+        co_occurrence.data,
+        index=pd.MultiIndex.from_tuples(
+            [
+                tags[i] + tags[j]
+                for i, j in zip(co_occurrence.row, co_occurrence.col)
+            ],
+            names=["source_group", "source", "target_group", "target"],
+        ),
+    )
+    return frequencies, pairs
+
 
 def process_game_dna(input_path, output_path):
+    columns = [column for _, column in TAG_GROUPS]
+    manifest_entry = output_entry(
+        columns, code_hash(sys.modules[__name__], list_columns, output_writer), csv_path=input_path
+    )
+    if is_up_to_date(output_path, manifest_entry):
+        print(f"{output_path} is up to date (see build manifest). Nothing to do.")
+        return
+
     print(f"Reading data from {input_path}...")
-    
-    # Read the dataset
-    df = pd.read_csv(input_path)
-    
-    # Ensure 'genres' and 'categories' are strings
-    df['genres'] = df['genres'].astype(str)
-    df['categories'] = df['categories'].astype(str)
 
+    # Stream the dataset in batches (see data_cache.ROW_BATCH_SIZE) and add
+    # up the counts of each batch
     print("Processing Game DNA data...")
+    frequencies = None
+    pairs = None
+    total_games = 0
+    with stage('aggregate') as record:
+        for batch in iter_batches(columns, csv_path=input_path):
+            batch_frequencies, batch_pairs = batch_counts(batch)
+            total_games += len(batch)
+            if frequencies is None:
+                frequencies, pairs = batch_frequencies, batch_pairs
+            else:
+                frequencies = frequencies.add(batch_frequencies, fill_value=0)
+                pairs = pairs.add(batch_pairs, fill_value=0)
+        record['rows_in'] = total_games
+        record['rows_out'] = len(pairs)
 
-    # Extract all unique genres and categories
-    all_genres = set()
-    all_categories = set()
-
-    for _, row in df.iterrows():
-        try:
-            genres = json.loads(row['genres'].replace("'", '"'))
-            all_genres.update(genres)
-        except (json.JSONDecodeError, TypeError):
-            pass  # Ignore if parsing fails
-
-        try:
-            categories = [cat['description'] for cat in json.loads(row['categories'].replace("'", '"'))]
-            all_categories.update(categories)
-        except (json.JSONDecodeError, TypeError):
-            pass # Ignore if parsing fails
+    # Tags sorted by name within each group, pairs in that tag order
+    group_order = {group: i for i, (group, _) in enumerate(TAG_GROUPS)}
+    tags = sorted(frequencies.index, key=lambda tag: (group_order[tag[0]], tag[1]))
+    position = {tag: i for i, tag in enumerate(tags)}
+    counts = pairs.to_dict()
+    pair_keys = sorted(counts, key=lambda key: (position[key[:2]], position[key[2:]]))
 
     # Create the hierarchical structure
     game_dna = {
         "name": "Game DNA",
         "children": [
             {
-                "name": "Genres",
-                "children": [{"name": genre, "value": 1} for genre in sorted(list(all_genres))]
-            },
+                "name": group,
+                "children": [
+                    {"name": name, "value": int(frequencies[(tag_group, name)])}
+                    for tag_group, name in tags
+                    if tag_group == group
+                ],
+            }
+            for group, _ in TAG_GROUPS
+        ],
+        "total_games": total_games,
+        "co_occurrence": [
             {
-                "name": "Categories",
-                "children": [{"name": category, "value": 1} for category in sorted(list(all_categories))]
+                "source": key[1],
+                "source_group": key[0],
+                "target": key[3],
+                "target_group": key[2],
+                "count": int(counts[key]),
             }
-        ]
+            for key in pair_keys
+        ],
     }
+    print(
+        f"Found {len(tags)} tags and {len(game_dna['co_occurrence'])} co-occurring tag pairs."
+    )
 
     print(f"Writing output to {output_path}...")
     # Write the JSON output
-    with open(output_path, 'w') as f:
-        json.dump(game_dna, f, indent=4)
+    with stage('write: game_dna.json') as record:
+        # A hierarchy rather than a table, so its rows are kept as objects
+        record['bytes_written'] = write_output(output_path, game_dna, columnar=False)
+    record_output(output_path, manifest_entry)
 
     print("Processing complete.")
 
 if __name__ == '__main__':
     # Get the directory of the script
     script_dir = os.path.dirname(os.path.abspath(__file__))
-    
+
     # Define the relative paths for input and output
     input_csv_path = os.path.join(script_dir, '..', 'public', 'data.csv')
     output_json_path = os.path.join(script_dir, '..', 'public', 'processed_data', 'game_dna.json')
-    
-    # Run the processing function
-    process_game_dna(input_csv_path, output_json_path) 
\ No newline at end of file
+
+    # Run the processing function; stages go to the run report
+    start_run('process_game_dna')
+    try:
+        process_game_dna(input_csv_path, output_json_path)
+    finally:
+        finish_run()
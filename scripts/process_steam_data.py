@@ -1,240 +1,407 @@
-import pandas as pd
 import duckdb
-import json
 import os
-import ast  # For safely evaluating string representations of lists/dicts
-import numpy as np  # For potential NaN handling or more complex stats if needed
+import time
+from concurrent.futures import ThreadPoolExecutor
+from data_cache import (
+    cache_source_sql,
+    clean_column_name,
+    connect,
+    csv_source_sql,
+    derived_cache_path,
+    load_columns,
+)
+import list_columns
+import output_writer
+import owners
+from build_manifest import code_hash, is_up_to_date, output_entry, record_output
+from instrumentation import finish_run, stage, start_run
+from list_columns import create_bridge_tables
+from output_writer import fetch_columns, fetch_records, is_columnar, write_output
+from owners import OWNER_ESTIMATE_METHODS, check_method, owners_sql, parse_owners
 
 # --- Configuration ---
 CSV_FILE_PATH = "public/data.csv"
 OUTPUT_DIR = "public/processed_data"
 TABLE_NAME = "steam_games"
-# Choose how to interpret 'estimated_owners' range: 'lower', 'upper', or 'midpoint'
+# Choose how to interpret 'estimated_owners' range: 'lower', 'upper', or 'midpoint'.
+# All three are always computed (estimated_owners_lower/_upper/_midpoint); this
+# picks the one exposed as estimated_owners_numeric.
 OWNER_ESTIMATE_METHOD = "midpoint"
+# 'duckdb' loads and cleans the data entirely in SQL; 'pandas' is the older
+# DataFrame-based cleaning path
+INGEST_MODE = "duckdb"
+# Read from the Parquet cache of the CSV (see data_cache.py) instead of the CSV
+USE_CSV_CACHE = True
+# Keep steam_games and its bridge tables in a DuckDB file in .data_cache,
+# sorted by release_date so zone maps skip row groups outside a year range.
+# Later runs (and query_server.py) open it read-only instead of reloading
+# the data; it is rebuilt when the data or the table-building code changes.
+# False loads everything into an in-memory database on every run.
+USE_PERSISTENT_DB = True
+# 'exact' sorts each column for its quantiles; 'approx' uses DuckDB's
+# approx_quantile (a T-Digest sketch) which needs no sort. Its estimates are
+# typically within about 1% in rank of the exact value, tighter towards the
+# tails (p5/p95), which is well below what the overview table displays. The
+# sketches are merged across threads in constant memory, so 'approx' is the
+# better choice for data far larger than data_cache.MEMORY_LIMIT.
+STATS_QUANTILE_MODE = "exact"
+STATS_QUANTILES = [0.05, 0.25, 0.5, 0.75, 0.95]
+# H3 scatter points: 'uniform' draws H3_SAMPLE_SIZE games at random;
+# 'stratified' samples each decade of owners separately (at least
+# H3_MIN_PER_STRATUM games each) so the few high-owner games are kept.
+# Sampling is seeded by H3_SAMPLE_SEED, so rebuilds give the same points.
+H3_SAMPLE_MODE = "uniform"
+H3_SAMPLE_SIZE = 2000
+H3_MIN_PER_STRATUM = 50
+H3_SAMPLE_SEED = 42
+# Width in decades (log10) of the cells of h3_reviews_owners_density, the
+# binned alternative to the scatter that covers every game
+H3_DENSITY_CELL = 0.25
+# Data cube behind the FilterPanel (data_cube.json): additive aggregates per
+# genre set x release year x price bucket, which the browser rolls up into
+# H1/H2/H5/H6 for any filter selection. It is only loaded once the
+# FilterPanel is opened.
+# The CUBE_GENRES most common genres are stored as bits of a genre mask;
+# the FilterPanel only offers these genres.
+CUBE_GENRES = 8
+# Lower edges in dollars of the price buckets; 0 to 0.01 is the free bucket.
+# A price filter keeps the buckets lying entirely within its range.
+CUBE_PRICE_EDGES = [0, 0.01, 1, 2, 3, 4, 5, 7, 10, 15, 20, 25, 30, 40, 50, 60, 70, 100]
+# Threads for running the independent H1-H7 queries concurrently
+HYPOTHESIS_WORKERS = os.cpu_count() or 4
+# Threads for serializing and writing the output files (gzip/brotli and file
+# I/O release the GIL, so several outputs are compressed at the same time)
+WRITE_WORKERS = os.cpu_count() or 4
+# Only these columns are read from the columnar cache of the CSV
+COLUMNS_USED = [
+    "appid", "release_date", "price", "pct_pos_total", "num_reviews_total",
+    "positive", "negative", "estimated_owners", "windows", "mac", "linux",
+    "dlc_count", "achievements", "recommendations",
+    "metacritic_score", "user_score", "average_playtime_forever",
+    "median_playtime_forever", "peak_ccu",
+]
 
 # --- Helper Functions ---
-def safe_literal_eval(val):
-    if isinstance(val, str):
-        try:
-            return ast.literal_eval(val)
-        except (ValueError, SyntaxError):
-            return val  # Return original string if it's not a valid literal
-    return val
+# min, max, avg, stddev, count and the STATS_QUANTILES list per column
+STATS_FIELDS_PER_COLUMN = 6
 
 
-def clean_column_name(name):
-    return "".join(c if c.isalnum() else "_" for c in str(name)).lower()
+def quantile_key(q):
+    """general_info key of a quantile: 'median' for 0.5, else 'p5', 'p25', ..."""
+    return "median" if q == 0.5 else f"p{round(q * 100, 6):g}"
 
 
-def parse_owners_flexible(owner_str, method="midpoint"):
-    if isinstance(owner_str, str):
-        parts = owner_str.split(" - ")
-        try:
-            lower = int(parts[0])
-            # Handle cases like "0" or just one number if no " - "
-            upper = int(parts[1]) if len(parts) > 1 else lower
-
-            if method == "lower":
-                return float(lower)
-            elif method == "upper":
-                return float(upper)
-            elif method == "midpoint":
-                return (float(lower) + float(upper)) / 2
-            else:  # Default to midpoint if method is unknown
-                print(
-                    f"Warning: Unknown owner estimate method '{method}'. Defaulting to midpoint."
-                )
-                return (float(lower) + float(upper)) / 2
-        except (ValueError, IndexError, TypeError):
-            return np.nan  # Error in parsing
-    return np.nan  # Not a string or unparseable
+def general_stats_query(columns):
+    """Single-scan query for the general statistics of all given columns.
 
+    Returns one row: COUNT(*) followed by STATS_FIELDS_PER_COLUMN values per
+    column, in the order of ``columns``.
+    """
+    quantile_fn = "approx_quantile" if STATS_QUANTILE_MODE == "approx" else "quantile_cont"
+    quantiles = ", ".join(str(q) for q in STATS_QUANTILES)
+    select_list = ["COUNT(*)"]
+    for col in columns:
+        select_list += [
+            f"MIN({col})",
+            f"MAX({col})",
+            f"AVG({col})",
+            f"STDDEV_SAMP({col})",
+            f"COUNT({col})",
+            f"{quantile_fn}({col}, [{quantiles}])",
+        ]
+    return f"SELECT {', '.join(select_list)} FROM {TABLE_NAME};"
 
-# --- Main Processing Logic ---
-def main():
-    print(f"Processing {CSV_FILE_PATH}...")
-    if not os.path.exists(OUTPUT_DIR):
-        os.makedirs(OUTPUT_DIR)
-        print(f"Created output directory: {OUTPUT_DIR}")
 
-    try:
-        df = pd.read_csv(CSV_FILE_PATH)
-        print(f"Successfully loaded {CSV_FILE_PATH} into Pandas DataFrame.")
-    except Exception as e:
-        print(f"ERROR: Could not read CSV file: {e}")
-        return
+def cleaned_select_sql(columns):
+    """Build the SELECT list that derives the steam_games columns in DuckDB.
 
-    df.columns = [clean_column_name(col) for col in df.columns]
-    print(f"Cleaned columns: {df.columns.tolist()}")
+    The source columns are already typed by schema.SCHEMA; this only fills
+    missing platform flags and adds the release and owner columns. Mirrors
+    load_table_pandas so both ingestion modes produce the same table.
+    """
+    conversions = {
+        col: f"COALESCE({col}, false)" for col in ["windows", "mac", "linux"]
+    }
 
-    # --- Data Type Conversions & Cleaning ---
-    print("Performing initial data type conversions and cleaning...")
-    if "release_date" in df.columns:
-        df["release_date"] = pd.to_datetime(
-            df["release_date"], errors="coerce"
+    select_list = [
+        f"{conversions[col]} AS {col}" if col in conversions else col
+        for col in columns
+    ]
+    if "release_date" in columns:
+        select_list.append("year(release_date) AS release_year")
+        select_list.append(
+            "CAST(year(release_date) AS VARCHAR) || 'Q' || CAST(quarter(release_date) AS VARCHAR) AS release_quarter"
         )
-        df["release_year"] = df["release_date"].dt.year
-        df["release_quarter"] = (
-            df["release_date"].dt.to_period("Q").astype(str)
+    if "estimated_owners" in columns:
+        owner_estimates = owners_sql("estimated_owners")
+        for method in OWNER_ESTIMATE_METHODS:
+            select_list.append(f"{owner_estimates[method]} AS estimated_owners_{method}")
+        select_list.append(
+            f"{owner_estimates[check_method(OWNER_ESTIMATE_METHOD)]} AS estimated_owners_numeric"
         )
-    if "price" in df.columns:
-        df["price"] = pd.to_numeric(df["price"], errors="coerce")
-    if "pct_pos_total" in df.columns:
-        df["pct_pos_total"] = pd.to_numeric(
-            df["pct_pos_total"], errors="coerce"
-        )
-    if "num_reviews_total" in df.columns:
-        df["num_reviews_total"] = pd.to_numeric(
-            df["num_reviews_total"], errors="coerce"
-        )
-    if "positive" in df.columns: # Ensure 'positive' is numeric for H3
-        df["positive"] = pd.to_numeric(df["positive"], errors="coerce")
+    return ",\n        ".join(select_list)
 
-    if "estimated_owners" in df.columns:
-        print(
-            f"Parsing 'estimated_owners' using method: {OWNER_ESTIMATE_METHOD}"
+
+def load_table_duckdb(con):
+    """Create the steam_games table with DuckDB's own parallel reader.
+
+    Type cleaning happens as SQL expressions inside CREATE TABLE, so no pandas
+    DataFrame copy of the dataset is ever built.
+    """
+    source = (
+        cache_source_sql(CSV_FILE_PATH) if USE_CSV_CACHE
+        else csv_source_sql(CSV_FILE_PATH)
+    )
+    present = {
+        clean_column_name(row[0])
+        for row in con.execute(f"DESCRIBE SELECT * FROM {source}").fetchall()
+    }
+    columns = [col for col in COLUMNS_USED if col in present]
+    missing = [col for col in COLUMNS_USED if col not in present]
+    if missing:
+        print(f"Warning: Columns not found in {CSV_FILE_PATH}: {missing}")
+    print(f"Parsing 'estimated_owners' using method: {OWNER_ESTIMATE_METHOD}")
+    # Loading and cleaning are one statement here, so they are one stage
+    with stage("load") as record:
+        con.execute(
+            f"""
+            CREATE OR REPLACE TABLE {TABLE_NAME} AS
+            SELECT
+                {cleaned_select_sql(columns)}
+            FROM {source};
+            """
         )
-        df["estimated_owners_numeric"] = df["estimated_owners"].apply(
-            lambda x: parse_owners_flexible(x, method=OWNER_ESTIMATE_METHOD)
+        record["rows_out"] = con.execute(f"SELECT COUNT(*) FROM {TABLE_NAME}").fetchone()[0]
+    print(f"Created DuckDB table '{TABLE_NAME}' directly from {source}.")
+
+
+def load_table_pandas(con):
+    """Create the steam_games table from a DataFrame cleaned in pandas."""
+    with stage("load") as record:
+        df = load_columns(COLUMNS_USED, csv_path=CSV_FILE_PATH)
+        record["rows_out"] = len(df)
+    print(f"Successfully loaded {CSV_FILE_PATH} into Pandas DataFrame.")
+
+    df.columns = [clean_column_name(col) for col in df.columns]
+    print(f"Cleaned columns: {df.columns.tolist()}")
+
+    # --- Derived Columns ---
+    # Types come from schema.SCHEMA at parse time, so no conversions are needed
+    with stage("clean", rows_in=len(df)) as record:
+        print("Deriving release and owner columns...")
+        if "release_date" in df.columns:
+            # Nullable integers, like DuckDB's year(), instead of floats
+            df["release_year"] = df["release_date"].dt.year.astype("Int64")
+            df["release_quarter"] = (
+                df["release_date"].dt.to_period("Q").astype(str)
+            )
+
+        if "estimated_owners" in df.columns:
+            print(
+                f"Parsing 'estimated_owners' using method: {OWNER_ESTIMATE_METHOD}"
+            )
+            owner_estimates = parse_owners(df["estimated_owners"])
+            for method in OWNER_ESTIMATE_METHODS:
+                df[f"estimated_owners_{method}"] = owner_estimates[method]
+            df["estimated_owners_numeric"] = owner_estimates[check_method(OWNER_ESTIMATE_METHOD)]
+
+        for col in ["windows", "mac", "linux"]:
+            if col in df.columns:
+                df[col] = df[col].fillna(False).astype(bool)
+        record["rows_out"] = len(df)
+
+    con.register("steam_df_cleaned", df)
+    con.execute(
+        f"CREATE OR REPLACE TABLE {TABLE_NAME} AS SELECT * FROM steam_df_cleaned"
+    )
+    con.unregister("steam_df_cleaned")
+    print(f"Created DuckDB table '{TABLE_NAME}' from cleaned DataFrame.")
+
+
+H3_POINTS_SQL = f"""
+    SELECT
+        positive,
+        estimated_owners_numeric,
+        -- Seeded pseudo-random priority per game: the games with the lowest
+        -- values form the sample, independent of row order and threads
+        hash(appid, {H3_SAMPLE_SEED}) AS priority
+    FROM {TABLE_NAME}
+    WHERE positive IS NOT NULL AND estimated_owners_numeric IS NOT NULL
+"""
+
+
+def h3_sample_sql():
+    """Seeded sample of (positive, estimated_owners_numeric) points.
+
+    ORDER BY ... LIMIT runs as a streaming top-N, so no full sort is needed.
+    """
+    if H3_SAMPLE_MODE == "stratified":
+        return f"""
+        WITH points AS ({H3_POINTS_SQL}),
+        ranked AS (
+            SELECT
+                *,
+                ROW_NUMBER() OVER (PARTITION BY stratum ORDER BY priority) AS stratum_rank,
+                COUNT(*) OVER (PARTITION BY stratum) AS stratum_size,
+                COUNT(*) OVER () AS total
+            FROM (
+                SELECT *, FLOOR(LOG10(GREATEST(estimated_owners_numeric, 1))) AS stratum
+                FROM points
+            )
         )
-        df["estimated_owners_numeric"] = pd.to_numeric(
-            df["estimated_owners_numeric"], errors="coerce"
+        SELECT positive, estimated_owners_numeric
+        FROM ranked
+        WHERE stratum_rank <= GREATEST(
+            {H3_MIN_PER_STRATUM}, ROUND({H3_SAMPLE_SIZE} * stratum_size / total)
         )
+        ORDER BY priority;
+    """
+    if H3_SAMPLE_MODE != "uniform":
+        print(f"Warning: Unknown H3_SAMPLE_MODE '{H3_SAMPLE_MODE}'. Using 'uniform'.")
+    return f"""
+        SELECT positive, estimated_owners_numeric
+        FROM ({H3_POINTS_SQL})
+        ORDER BY priority
+        LIMIT {H3_SAMPLE_SIZE};
+    """
 
-    for col in ["windows", "mac", "linux"]:
-        if col in df.columns:
-            df[col] = (
-                df[col]
-                .astype(str)
-                .str.lower()
-                .map({"true": True, "false": False})
-                .fillna(False)
-            )
 
-    con = duckdb.connect(database=":memory:", read_only=False)
-    print("Connected to in-memory DuckDB.")
-    try:
-        con.register("steam_df_cleaned", df)
-        con.execute(
-            f"CREATE OR REPLACE TABLE {TABLE_NAME} AS SELECT * FROM steam_df_cleaned"
+def h3_density_sql():
+    """Game counts on a log-log grid of positive reviews x owners.
+
+    Each cell is H3_DENSITY_CELL decades wide; positive reviews are shifted
+    by one so games without reviews fall into the first column.
+    """
+    cell = H3_DENSITY_CELL
+    return f"""
+        WITH cells AS (
+            SELECT
+                CAST(FLOOR(LOG10(positive + 1) / {cell}) AS INTEGER) AS x_bin,
+                CAST(FLOOR(LOG10(GREATEST(estimated_owners_numeric, 1)) / {cell}) AS INTEGER) AS y_bin
+            FROM {TABLE_NAME}
+            WHERE positive IS NOT NULL AND estimated_owners_numeric IS NOT NULL
         )
-        print(f"Created DuckDB table '{TABLE_NAME}' from cleaned DataFrame.")
-    except Exception as e:
-        print(f"ERROR: Could not register/create table in DuckDB: {e}")
-        con.close()
-        return
+        SELECT
+            x_bin,
+            y_bin,
+            POWER(10, x_bin * {cell}) - 1 AS positive_min,
+            POWER(10, (x_bin + 1) * {cell}) - 1 AS positive_max,
+            POWER(10, (x_bin + 0.5) * {cell}) - 1 AS positive_center,
+            POWER(10, y_bin * {cell}) AS owners_min,
+            POWER(10, (y_bin + 1) * {cell}) AS owners_max,
+            POWER(10, (y_bin + 0.5) * {cell}) AS owners_center,
+            COUNT(*) AS num_games
+        FROM cells
+        GROUP BY x_bin, y_bin
+        ORDER BY x_bin, y_bin;
+    """
 
-    results = {}
 
-    # --- General Statistics ---
-    try:
-        print("Calculating: General Statistics...")
-        general_stats = {}
-        general_stats["total_games_analyzed"] = int(
-            con.execute(f"SELECT COUNT(*) FROM {TABLE_NAME}").fetchone()[0]
+def price_bucket_sql(column="price"):
+    """Index of the CUBE_PRICE_EDGES bucket a price falls into."""
+    cases = " ".join(
+        f"WHEN {column} >= {edge} THEN {i}"
+        for i, edge in reversed(list(enumerate(CUBE_PRICE_EDGES)))
+    )
+    return f"CASE {cases} END"
+
+
+def data_cube_sql():
+    """One grouped scan producing the cells of the data cube.
+
+    Every game falls into exactly one cell, so sums over any set of cells
+    never count a game twice. Each chart's measures count only the games
+    its global query keeps (e.g. H5 needs owners, pct_pos_total and price),
+    so every chart has its own game count per cell. H2 and H6 also group
+    by platform count and Q4 flag; these are split into measure columns per
+    value (h2_n_0 ... h2_n_3, h6_n_q4 / h6_n_other) rather than cell keys.
+    """
+    owners = "estimated_owners_numeric"
+
+    def total(expr, where, name, whole=False):
+        # Cells without a matching game hold 0 rather than NULL. Owner and
+        # review sums are whole numbers, which keeps the JSON short; as
+        # BIGINT rather than the HUGEINT of an integer SUM they also fetch
+        # without a detour through float64 (see output_writer.fetch_columns)
+        value = f"SUM({expr}) FILTER (WHERE {where})"
+        if whole:
+            value = f"CAST(ROUND({value}) AS BIGINT)"
+        return f"COALESCE({value}, 0) AS {name}"
+
+    h5_known = f"{owners} IS NOT NULL AND pct_pos_total IS NOT NULL"
+    measures = [
+        "COUNT(pct_pos_total) AS h1_n",
+        total("pct_pos_total", "true", "h1_sum_pct"),
+        f"COUNT(*) FILTER (WHERE {h5_known}) AS h5_n",
+        total(owners, h5_known, "h5_sum_owners", whole=True),
+        total("pct_pos_total", h5_known, "h5_sum_pct"),
+        total("pct_pos_total * pct_pos_total", h5_known, "h5_sumsq_pct"),
+    ]
+    for platforms in range(4):
+        h2_known = f"windows::INT + mac::INT + linux::INT = {platforms}"
+        measures += [
+            f"COUNT({owners}) FILTER (WHERE {h2_known}) AS h2_n_{platforms}",
+            total(owners, h2_known, f"h2_sum_owners_{platforms}", whole=True),
+        ]
+    for period, negation in [("q4", ""), ("other", "NOT ")]:
+        h6_known = (
+            f"{negation}release_quarter LIKE '%Q4' "
+            f"AND {owners} IS NOT NULL AND num_reviews_total IS NOT NULL"
         )
+        measures += [
+            f"COUNT(*) FILTER (WHERE {h6_known}) AS h6_n_{period}",
+            total(owners, h6_known, f"h6_sum_owners_{period}", whole=True),
+            total("num_reviews_total", h6_known, f"h6_sum_reviews_{period}", whole=True),
+        ]
+    measure_list = ",\n            ".join(measures)
+    return f"""
+        WITH top_genres AS (
+            SELECT genre, CAST(ROW_NUMBER() OVER (ORDER BY COUNT(*) DESC, genre) - 1 AS INTEGER) AS bit
+            FROM {TABLE_NAME}_genres
+            GROUP BY genre
+            QUALIFY bit < {CUBE_GENRES}
+        ),
+        genre_masks AS (
+            SELECT appid, BIT_OR(1 << bit) AS genre_mask
+            FROM {TABLE_NAME}_genres
+            JOIN top_genres USING (genre)
+            GROUP BY appid
+        )
+        SELECT
+            COALESCE(genre_mask, 0) AS genre_mask,
+            release_year,
+            {price_bucket_sql()} AS price_bucket,
+            {measure_list}
+        FROM {TABLE_NAME}
+        LEFT JOIN genre_masks USING (appid)
+        GROUP BY ALL
+        ORDER BY ALL;
+    """
 
-        numeric_cols_for_stats = {
-            "price": "Price",
-            "dlc_count": "DLC Count",
-            "achievements": "Achievements",
-            "recommendations": "Recommendations",
-            "metacritic_score": "Metacritic Score",
-            "user_score": "User Score",
-            "positive": "Positive Reviews",
-            "negative": "Negative Reviews",
-            "estimated_owners_numeric": f"Est. Owners ({OWNER_ESTIMATE_METHOD.capitalize()})",
-            "average_playtime_forever": "Avg. Playtime (All Time, Mins)",
-            "median_playtime_forever": "Median Playtime (All Time, Mins)",
-            "peak_ccu": "Peak Concurrent Users",
-            "num_reviews_total": "Total Reviews",
-        }
-        general_stats["numeric_column_stats"] = []
-
-        for col, display_name in numeric_cols_for_stats.items():
-            if col in df.columns:
-                query = f"""
-                    SELECT
-                        MIN({col}) as min_val,
-                        MAX({col}) as max_val,
-                        AVG({col}) as avg_val,
-                        MEDIAN({col}) as median_val,
-                        STDDEV_SAMP({col}) as stddev_val,
-                        COUNT(CASE WHEN {col} IS NOT NULL THEN 1 END) as count_val
-                    FROM {TABLE_NAME};
-                """
-                stats_result = con.execute(query).fetchone()
-                if stats_result and stats_result[5] > 0: # Check count_val
-                    general_stats["numeric_column_stats"].append(
-                        {
-                            "column_name": display_name,
-                            "min": stats_result[0],
-                            "max": stats_result[1],
-                            "average": stats_result[2],
-                            "median": stats_result[3],
-                            "std_dev": stats_result[4],
-                            "count_non_null": stats_result[5],
-                        }
-                    )
-                else:
-                    print(
-                        f"Warning: Could not compute all stats for column '{col}' or no non-null data."
-                    )
-                    general_stats["numeric_column_stats"].append(
-                        {
-                            "column_name": display_name,
-                            "min": "N/A", "max": "N/A", "average": "N/A",
-                            "median": "N/A", "std_dev": "N/A",
-                            "count_non_null": 0,
-                        }
-                    )
-            else:
-                print(
-                    f"Warning: Column '{col}' not found for general stats calculation."
-                )
-                general_stats["numeric_column_stats"].append(
-                    {
-                        "column_name": display_name,
-                        "min": "N/A", "max": "N/A", "average": "N/A",
-                        "median": "N/A", "std_dev": "N/A",
-                        "count_non_null": "N/A (column missing)",
-                    }
-                )
 
-        if "price" in df.columns:
-            free_paid_counts_df = con.execute(
-                f"""
-                SELECT
-                    CASE WHEN price = 0 THEN 'Free' ELSE 'Paid' END as type,
-                    COUNT(*) as count
-                FROM {TABLE_NAME}
-                WHERE price IS NOT NULL
-                GROUP BY type;
-            """
-            ).df()
-            general_stats["free_vs_paid_counts"] = free_paid_counts_df.to_dict(
-                orient="records"
-            )
-        else:
-            general_stats["free_vs_paid_counts"] = []
-            print("Warning: 'price' column not found for free vs paid counts.")
+CUBE_GENRES_SQL = f"""
+    SELECT genre
+    FROM {TABLE_NAME}_genres
+    GROUP BY genre
+    ORDER BY COUNT(*) DESC, genre
+    LIMIT {CUBE_GENRES};
+"""
 
-        results["general_info"] = general_stats
-        print("SUCCESS: General Statistics.")
-    except Exception as e:
-        print(f"ERROR during General Statistics calculation: {e}")
-        results["general_info"] = {
-            "error": str(e),
-            "total_games_analyzed": 0,
-            "numeric_column_stats": [],
-            "free_vs_paid_counts": [],
-        }
-
-    # --- Hypothesis 1: Average positive review percentage over time ---
-    try:
-        print("Hypothesis 1: Avg Positive Review % Over Time...")
-        if "release_year" in df.columns and "pct_pos_total" in df.columns:
-            query_h1 = f"""
+
+def hypothesis_specs():
+    """The H1-H7 hypothesis queries.
+
+    Each spec lists the table columns (or bridge tables) it requires and the
+    output key -> query it produces. Specs are independent of each other, so
+    run_hypotheses can execute them concurrently.
+    """
+    return [
+        {
+            "name": "H1",
+            "title": "Avg Positive Review % Over Time",
+            "requires": ["release_year", "pct_pos_total"],
+            "queries": {
+                "h1_review_percentage_over_time": f"""
                 SELECT
                     release_year,
                     AVG(pct_pos_total) AS avg_positive_percentage,
@@ -244,69 +411,36 @@ def main():
                 GROUP BY release_year
                 HAVING COUNT(*) > 10
                 ORDER BY release_year;
-            """
-            results["h1_review_percentage_over_time"] = (
-                con.execute(query_h1).df().to_dict(orient="records")
-            )
-            print("SUCCESS: H1.")
-        else:
-            print(
-                "WARNING: H1 - Missing 'release_year' or 'pct_pos_total'."
-            )
-            results["h1_review_percentage_over_time"] = []
-    except Exception as e:
-        print(f"ERROR H1: {e}")
-        results["h1_review_percentage_over_time"] = []
-
-    # --- Hypothesis 2: More platforms -> more owners ---
-    try:
-        print("Hypothesis 2: Platforms vs. Estimated Owners...")
-        if all(
-            c in df.columns
-            for c in ["windows", "mac", "linux", "estimated_owners_numeric"]
-        ):
-            query_h2 = f"""
+            """,
+            },
+        },
+        {
+            "name": "H2",
+            "title": "Platforms vs. Estimated Owners",
+            "requires": ["windows", "mac", "linux", "estimated_owners_numeric"],
+            "queries": {
+                "h2_platforms_vs_owners": f"""
                 SELECT
                     (windows::INT + mac::INT + linux::INT) AS num_platforms,
                     AVG(estimated_owners_numeric) AS avg_estimated_owners,
+                    AVG(estimated_owners_lower) AS avg_estimated_owners_lower,
+                    AVG(estimated_owners_upper) AS avg_estimated_owners_upper,
                     COUNT(*) as num_games
                 FROM {TABLE_NAME}
                 WHERE estimated_owners_numeric IS NOT NULL
                 GROUP BY num_platforms
                 ORDER BY num_platforms;
-            """
-            results["h2_platforms_vs_owners"] = (
-                con.execute(query_h2).df().to_dict(orient="records")
-            )
-            print("SUCCESS: H2.")
-        else:
-            print(
-                "WARNING: H2 - Missing platform columns or 'estimated_owners_numeric'."
-            )
-            results["h2_platforms_vs_owners"] = []
-    except Exception as e:
-        print(f"ERROR H2: {e}")
-        results["h2_platforms_vs_owners"] = []
-
-    # --- Hypothesis 3: Positive reviews vs. estimated owners (non-linear) ---
-    try:
-        print("Hypothesis 3: Positive Reviews vs. Owners...")
-        if "positive" in df.columns and "estimated_owners_numeric" in df.columns:
-            # Data for scatter plot (sample if too large)
-            # Ensure 'positive' is numeric in the table for DuckDB
-            query_h3_scatter = f"""
-                SELECT positive, estimated_owners_numeric
-                FROM {TABLE_NAME}
-                WHERE positive IS NOT NULL AND estimated_owners_numeric IS NOT NULL
-                ORDER BY RANDOM()
-                LIMIT 2000;
-            """
-            results["h3_reviews_owners_scatter"] = (
-                con.execute(query_h3_scatter).df().to_dict(orient="records")
-            )
-
-            # Binned averages
-            query_h3_binned = f"""
+            """,
+            },
+        },
+        {
+            "name": "H3",
+            "title": "Positive Reviews vs. Owners",
+            "requires": ["appid", "positive", "estimated_owners_numeric"],
+            "queries": {
+                "h3_reviews_owners_scatter": h3_sample_sql(),
+                "h3_reviews_owners_density": h3_density_sql(),
+                "h3_reviews_owners_binned": f"""
                 SELECT
                     CASE
                         WHEN positive < 1000 THEN '0-1k'
@@ -322,41 +456,19 @@ def main():
                 WHERE positive IS NOT NULL AND estimated_owners_numeric IS NOT NULL
                 GROUP BY positive_reviews_bin
                 ORDER BY MIN(positive);
-            """
-            results["h3_reviews_owners_binned"] = (
-                con.execute(query_h3_binned).df().to_dict(orient="records")
-            )
-            print("SUCCESS: H3.")
-        else:
-            print(
-                "WARNING: H3 - Missing 'positive' or 'estimated_owners_numeric'."
-            )
-            results["h3_reviews_owners_scatter"] = []
-            results["h3_reviews_owners_binned"] = []
-    except Exception as e:
-        print(f"ERROR H3: {e}")
-        results["h3_reviews_owners_scatter"] = []
-        results["h3_reviews_owners_binned"] = []
-
-    # --- Hypothesis 4: Genres dominate specific price points ---
-    try:
-        print("Hypothesis 4: Genre Dominance by Price Point...")
-        if "genres" in df.columns and "price" in df.columns:
-            # Create a temporary DataFrame for exploded genres for this hypothesis
-            df_h4 = df[["appid", "genres", "price"]].copy() # Select only necessary columns
-            df_h4["genres_list"] = df_h4["genres"].apply(safe_literal_eval)
-            df_h4 = df_h4.explode("genres_list")
-            df_h4.dropna(subset=["genres_list", "price"], inplace=True)
-            df_h4 = df_h4[df_h4["genres_list"] != ""]
-            df_h4.rename(columns={"genres_list": "genre"}, inplace=True)
-
-            con.register("h4_exploded_genres_df", df_h4)
-
-            query_h4 = f"""
+            """,
+            },
+        },
+        {
+            "name": "H4",
+            "title": "Genre Dominance by Price Point",
+            "requires": [f"{TABLE_NAME}_genres", "price"],
+            "queries": {
+                "h4_genre_price_dominance": f"""
                 WITH PriceBins AS (
                     SELECT
-                        price,
-                        genre,
+                        g.price,
+                        b.genre,
                         CASE
                             WHEN price = 0 THEN 'Free'
                             WHEN price < 10 THEN '$0.01-$9.99'
@@ -366,7 +478,9 @@ def main():
                             WHEN price < 50 THEN '$40-$49.99'
                             ELSE '$50+'
                         END AS price_bin
-                    FROM h4_exploded_genres_df
+                    FROM {TABLE_NAME} g
+                    JOIN {TABLE_NAME}_genres b USING (appid)
+                    WHERE g.price IS NOT NULL
                 ),
                 GenreCountsInBin AS (
                     SELECT
@@ -391,87 +505,54 @@ def main():
                         ELSE 7
                     END,
                     game_count DESC;
-            """
-            results["h4_genre_price_dominance"] = (
-                con.execute(query_h4).df().to_dict(orient="records")
-            )
-            con.unregister("h4_exploded_genres_df") # Clean up temp table
-            print("SUCCESS: H4.")
-        else:
-            print("WARNING: H4 - Missing 'genres' or 'price'.")
-            results["h4_genre_price_dominance"] = []
-    except Exception as e:
-        print(f"ERROR H4: {e}")
-        results["h4_genre_price_dominance"] = []
-
-    # --- Hypothesis 5: Free-to-play vs. Paid games (owners, review scores) ---
-    try:
-        print("Hypothesis 5: Free vs. Paid Games...")
-        if (
-            "price" in df.columns
-            and "estimated_owners_numeric" in df.columns
-            and "pct_pos_total" in df.columns
-        ):
-            query_h5 = f"""
+            """,
+            },
+        },
+        {
+            "name": "H5",
+            "title": "Free vs. Paid Games",
+            "requires": ["price", "estimated_owners_numeric", "pct_pos_total"],
+            "queries": {
+                "h5_free_vs_paid": f"""
                 SELECT
                     CASE WHEN price = 0 THEN 'Free-to-Play' ELSE 'Paid' END AS game_type,
                     AVG(estimated_owners_numeric) AS avg_estimated_owners,
+                    AVG(estimated_owners_lower) AS avg_estimated_owners_lower,
+                    AVG(estimated_owners_upper) AS avg_estimated_owners_upper,
                     AVG(pct_pos_total) AS avg_positive_percentage,
                     STDDEV_SAMP(pct_pos_total) AS stddev_positive_percentage,
                     COUNT(*) as num_games
                 FROM {TABLE_NAME}
                 WHERE estimated_owners_numeric IS NOT NULL AND pct_pos_total IS NOT NULL AND price IS NOT NULL
                 GROUP BY game_type;
-            """
-            results["h5_free_vs_paid"] = (
-                con.execute(query_h5).df().to_dict(orient="records")
-            )
-            print("SUCCESS: H5.")
-        else:
-            print(
-                "WARNING: H5 - Missing 'price', 'estimated_owners_numeric', or 'pct_pos_total'."
-            )
-            results["h5_free_vs_paid"] = []
-    except Exception as e:
-        print(f"ERROR H5: {e}")
-        results["h5_free_vs_paid"] = []
-
-    # --- Hypothesis 6: Games released in Q4 vs. other quarters ---
-    try:
-        print("Hypothesis 6: Q4 Release Impact...")
-        if (
-            "release_quarter" in df.columns
-            and "estimated_owners_numeric" in df.columns
-            and "num_reviews_total" in df.columns
-        ):
-            query_h6 = f"""
+            """,
+            },
+        },
+        {
+            "name": "H6",
+            "title": "Q4 Release Impact",
+            "requires": ["release_quarter", "estimated_owners_numeric", "num_reviews_total"],
+            "queries": {
+                "h6_q4_release_impact": f"""
                 SELECT
                     CASE WHEN release_quarter LIKE '%Q4' THEN 'Q4 Release' ELSE 'Other Quarters' END AS release_period,
                     AVG(estimated_owners_numeric) AS avg_estimated_owners,
+                    AVG(estimated_owners_lower) AS avg_estimated_owners_lower,
+                    AVG(estimated_owners_upper) AS avg_estimated_owners_upper,
                     AVG(num_reviews_total) AS avg_num_reviews,
                     COUNT(*) as num_games
                 FROM {TABLE_NAME}
                 WHERE release_quarter IS NOT NULL AND estimated_owners_numeric IS NOT NULL AND num_reviews_total IS NOT NULL
                 GROUP BY release_period;
-            """
-            results["h6_q4_release_impact"] = (
-                con.execute(query_h6).df().to_dict(orient="records")
-            )
-            print("SUCCESS: H6.")
-        else:
-            print(
-                "WARNING: H6 - Missing 'release_quarter', 'estimated_owners_numeric', or 'num_reviews_total'."
-            )
-            results["h6_q4_release_impact"] = []
-    except Exception as e:
-        print(f"ERROR H6: {e}")
-        results["h6_q4_release_impact"] = []
-
-    # --- Hypothesis 7: Median positive review score vs. price ---
-    try:
-        print("Hypothesis 7: Median Review Score vs. Price...")
-        if "price" in df.columns and "pct_pos_total" in df.columns:
-            query_h7 = f"""
+            """,
+            },
+        },
+        {
+            "name": "H7",
+            "title": "Median Review Score vs. Price",
+            "requires": ["price", "pct_pos_total"],
+            "queries": {
+                "h7_median_review_vs_price": f"""
                 WITH PriceBinnedGames AS (
                     SELECT
                         price,
@@ -514,57 +595,447 @@ def main():
                 WHERE price_bin != 'Unknown'
                 GROUP BY price_bin, price_bin_order
                 ORDER BY price_bin_order;
-            """
-            results["h7_median_review_vs_price"] = (
-                con.execute(query_h7).df().to_dict(orient="records")
+            """,
+            },
+        },
+    ]
+
+
+def run_hypothesis(con, spec, available):
+    """Run one hypothesis spec on its own DuckDB cursor.
+
+    Errors are isolated per hypothesis: a failing or incomplete spec yields
+    empty results for its outputs and never affects the others.
+    """
+    name = spec["name"]
+    print(f"Hypothesis {name[1:]}: {spec['title']}...")
+    results = {key: [] for key in spec["queries"]}
+    timings = []
+    missing = [col for col in spec["requires"] if col not in available]
+    if missing:
+        print(f"WARNING: {name} - Missing {missing}.")
+        return results, timings, False
+
+    cur = con.cursor()
+    try:
+        for key, query in spec["queries"].items():
+            with stage(f"{name}: {key}") as record:
+                table = fetch_columns(cur.execute(query))
+                record["rows_out"] = table["length"]
+            timings.append(
+                {
+                    "hypothesis": name,
+                    "output": key,
+                    "seconds": record["wall_seconds"],
+                    "rows": table["length"],
+                }
+            )
+            results[key] = table
+        print(f"SUCCESS: {name}.")
+        ok = True
+    except Exception as e:
+        print(f"ERROR {name}: {e}")
+        results = {key: [] for key in spec["queries"]}
+        ok = False
+    finally:
+        cur.close()
+    return results, timings, ok
+
+
+def run_hypotheses(con, specs, available):
+    """Run all hypothesis specs concurrently in a thread pool.
+
+    Returns the results in spec order and the output keys of hypotheses that
+    failed or could not run. Per-query timings (wall time and row count) are
+    printed slowest first; each query is also a stage of the run report.
+    """
+    workers = max(1, min(HYPOTHESIS_WORKERS, len(specs)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        outcomes = list(
+            pool.map(lambda spec: run_hypothesis(con, spec, available), specs)
+        )
+
+    results = {}
+    timings = []
+    failed = set()
+    for spec_results, spec_timings, ok in outcomes:
+        results.update(spec_results)
+        timings.extend(spec_timings)
+        if not ok:
+            failed.update(spec_results)
+    print("Hypothesis query timings (slowest first):")
+    for timing in sorted(timings, key=lambda t: t["seconds"], reverse=True):
+        print(
+            f"  {timing['output']}: {timing['seconds']:.3f}s, {timing['rows']} rows"
+        )
+    return results, failed
+
+
+def table_code_parts():
+    """Code that shapes the steam_games table, shared by every output."""
+    loader = load_table_pandas if INGEST_MODE == "pandas" else load_table_duckdb
+    return [loader, cleaned_select_sql, owners, list_columns, output_writer]
+
+
+def database_fingerprint():
+    """Identifies the code and settings a persistent database was built with."""
+    return code_hash(
+        *table_code_parts(),
+        f"{OWNER_ESTIMATE_METHOD} {INGEST_MODE} {USE_CSV_CACHE} {COLUMNS_USED}",
+    )
+
+
+def load_tables(con):
+    """Create steam_games and its bridge tables on the connection."""
+    if INGEST_MODE == "pandas":
+        load_table_pandas(con)
+    else:
+        load_table_duckdb(con)
+    # appid -> genre/category/developer/publisher tables (see list_columns.py)
+    try:
+        with stage("bridge_tables") as record:
+            bridge_tables = create_bridge_tables(con, TABLE_NAME, csv_path=CSV_FILE_PATH)
+            record["rows_out"] = len(bridge_tables)
+        print(f"Created bridge tables: {bridge_tables}")
+    except Exception as e:
+        print(f"ERROR: Could not create bridge tables: {e}")
+
+
+def build_database(path, fingerprint):
+    """Write the tables to a new DuckDB file, replacing path atomically."""
+    tmp_path = path + ".tmp"
+    for stale in (tmp_path, tmp_path + ".wal"):
+        if os.path.exists(stale):
+            os.remove(stale)
+    start = time.perf_counter()
+    con = connect(database=tmp_path)
+    try:
+        load_tables(con)
+        with stage("sort") as record:
+            con.execute(
+                f"""
+                CREATE OR REPLACE TABLE {TABLE_NAME} AS
+                SELECT * FROM {TABLE_NAME} ORDER BY release_date NULLS LAST, appid;
+                """
+            )
+            con.execute("CREATE TABLE build_info AS SELECT ? AS fingerprint", [fingerprint])
+            con.execute("CHECKPOINT")
+            record["bytes_written"] = os.path.getsize(tmp_path)
+    finally:
+        con.close()
+    os.replace(tmp_path, path)
+    print(f"Built {path} in {time.perf_counter() - start:.2f}s.")
+
+
+def open_database():
+    """DuckDB connection with steam_games and its bridge tables.
+
+    With USE_PERSISTENT_DB this is a read-only connection to the database
+    file, which is (re)built first if it is missing or outdated.
+    """
+    if not USE_PERSISTENT_DB:
+        con = connect()
+        print("Connected to in-memory DuckDB.")
+        try:
+            load_tables(con)
+        except Exception:
+            con.close()
+            raise
+        return con
+
+    path = derived_cache_path(CSV_FILE_PATH, "duckdb")
+    fingerprint = database_fingerprint()
+    if os.path.exists(path):
+        con = connect(database=path, read_only=True)
+        try:
+            stored = con.execute("SELECT fingerprint FROM build_info").fetchone()[0]
+        except duckdb.Error:
+            stored = None
+        if stored == fingerprint:
+            print(f"Attached {path} (read-only).")
+            return con
+        con.close()
+        print(f"{path} is outdated. Rebuilding...")
+    build_database(path, fingerprint)
+    print(f"Attached {path} (read-only).")
+    return connect(database=path, read_only=True)
+
+
+def bridge_table_names(con):
+    """The bridge tables that exist on the connection."""
+    tables = {row[0] for row in con.execute("SHOW TABLES").fetchall()}
+    return [
+        f"{TABLE_NAME}_{column}" for column in list_columns.BRIDGE_COLUMNS
+        if f"{TABLE_NAME}_{column}" in tables
+    ]
+
+
+def output_entries(specs):
+    """Build manifest entries (inputs, columns, code, config) per output key."""
+    config = {
+        "OWNER_ESTIMATE_METHOD": OWNER_ESTIMATE_METHOD,
+        "INGEST_MODE": INGEST_MODE,
+    }
+    entries = {
+        "data_cube": output_entry(
+            COLUMNS_USED + ["genres"],
+            code_hash(
+                *table_code_parts(), compute_data_cube, data_cube_sql(), CUBE_GENRES_SQL
+            ),
+            config,
+            csv_path=CSV_FILE_PATH,
+        ),
+        "general_info": output_entry(
+            COLUMNS_USED,
+            code_hash(*table_code_parts(), compute_general_stats, general_stats_query),
+            dict(config, STATS_QUANTILE_MODE=STATS_QUANTILE_MODE, STATS_QUANTILES=STATS_QUANTILES),
+            csv_path=CSV_FILE_PATH,
+        )
+    }
+    for spec in specs:
+        entry = output_entry(
+            spec["requires"],
+            code_hash(*table_code_parts(), *spec["queries"].values()),
+            config,
+            csv_path=CSV_FILE_PATH,
+        )
+        for key in spec["queries"]:
+            entries[key] = entry
+    return entries
+
+
+def compute_general_stats(con, table_columns):
+    """General statistics for general_info.json."""
+    print("Calculating: General Statistics...")
+    general_stats = {}
+
+    numeric_cols_for_stats = {
+        "price": "Price",
+        "dlc_count": "DLC Count",
+        "achievements": "Achievements",
+        "recommendations": "Recommendations",
+        "metacritic_score": "Metacritic Score",
+        "user_score": "User Score",
+        "positive": "Positive Reviews",
+        "negative": "Negative Reviews",
+        "estimated_owners_numeric": f"Est. Owners ({OWNER_ESTIMATE_METHOD.capitalize()})",
+        "average_playtime_forever": "Avg. Playtime (All Time, Mins)",
+        "median_playtime_forever": "Median Playtime (All Time, Mins)",
+        "peak_ccu": "Peak Concurrent Users",
+        "num_reviews_total": "Total Reviews",
+    }
+    # One scan over the table computes the stats of every column at once
+    stats_cols = [col for col in numeric_cols_for_stats if col in table_columns]
+    with stage("general_info") as record:
+        stats_row = con.execute(general_stats_query(stats_cols)).fetchone()
+        record["rows_in"] = int(stats_row[0])
+    general_stats["total_games_analyzed"] = int(stats_row[0])
+    general_stats["quantile_mode"] = STATS_QUANTILE_MODE
+    general_stats["numeric_column_stats"] = []
+
+    for col, display_name in numeric_cols_for_stats.items():
+        if col in table_columns:
+            offset = 1 + STATS_FIELDS_PER_COLUMN * stats_cols.index(col)
+            min_val, max_val, avg_val, stddev_val, count_val, quantiles = (
+                stats_row[offset:offset + STATS_FIELDS_PER_COLUMN]
             )
-            print("SUCCESS: H7.")
+            if count_val and count_val > 0:
+                quantile_values = dict(zip(map(quantile_key, STATS_QUANTILES), quantiles))
+                column_stats = {
+                    "column_name": display_name,
+                    "min": min_val,
+                    "max": max_val,
+                    "average": avg_val,
+                    "median": quantile_values.pop("median", "N/A"),
+                    "std_dev": stddev_val,
+                    "count_non_null": count_val,
+                }
+                column_stats.update(quantile_values)
+                general_stats["numeric_column_stats"].append(column_stats)
+            else:
+                print(
+                    f"Warning: Could not compute all stats for column '{col}' or no non-null data."
+                )
+                general_stats["numeric_column_stats"].append(
+                    {
+                        "column_name": display_name,
+                        "min": "N/A", "max": "N/A", "average": "N/A",
+                        "median": "N/A", "std_dev": "N/A",
+                        "count_non_null": 0,
+                    }
+                )
         else:
-            print("WARNING: H7 - Missing 'price' or 'pct_pos_total'.")
-            results["h7_median_review_vs_price"] = []
+            print(
+                f"Warning: Column '{col}' not found for general stats calculation."
+            )
+            general_stats["numeric_column_stats"].append(
+                {
+                    "column_name": display_name,
+                    "min": "N/A", "max": "N/A", "average": "N/A",
+                    "median": "N/A", "std_dev": "N/A",
+                    "count_non_null": "N/A (column missing)",
+                }
+            )
+
+    if "price" in table_columns:
+        general_stats["free_vs_paid_counts"] = fetch_records(con.execute(
+            f"""
+            SELECT
+                CASE WHEN price = 0 THEN 'Free' ELSE 'Paid' END as type,
+                COUNT(*) as count
+            FROM {TABLE_NAME}
+            WHERE price IS NOT NULL
+            GROUP BY type;
+        """
+        ))
+    else:
+        general_stats["free_vs_paid_counts"] = []
+        print("Warning: 'price' column not found for free vs paid counts.")
+    return general_stats
+
+
+def write_result(key, data):
+    """Write one output file; returns True on success.
+
+    A file that cannot be serialized is left as it was, and since it is not
+    recorded in the build manifest it is retried on the next run.
+    """
+    output_path = os.path.join(OUTPUT_DIR, f"{key}.json")
+    if is_columnar(data):
+        rows = data["length"]
+    else:
+        rows = len(data) if isinstance(data, list) else None
+    try:
+        with stage(f"write: {key}.json", rows_in=rows) as record:
+            record["bytes_written"] = write_output(output_path, data)
+    except (TypeError, ValueError, OSError) as e:
+        print(f"ERROR: Could not save {key}.json: {e}")
+        return False
+    print(f"Successfully saved {key}.json to {output_path}")
+    return True
+
+
+def write_results(results):
+    """Write all outputs concurrently; returns the keys that were written."""
+    workers = max(1, min(WRITE_WORKERS, len(results)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        written = list(pool.map(lambda item: write_result(*item), results.items()))
+    return [key for key, ok in zip(results, written) if ok]
+
+
+def compute_data_cube(con):
+    """Cells of additive aggregates for data_cube.json (see data_cube_sql).
+
+    Bit i of a cell's genre_mask stands for genres[i]; price_bucket i covers
+    prices from price_edges[i] up to the next edge.
+    """
+    print("Calculating: Data Cube...")
+    with stage("data_cube") as record:
+        genres = [row[0] for row in con.execute(CUBE_GENRES_SQL).fetchall()]
+        cells = fetch_columns(con.execute(data_cube_sql()))
+        record["rows_out"] = cells["length"]
+    print(
+        f"Data cube: {cells['length']} cells over {len(genres)} genres "
+        f"in {record['wall_seconds']:.3f}s"
+    )
+    return {"genres": genres, "price_edges": CUBE_PRICE_EDGES, "cells": cells}
+
+
+# --- Main Processing Logic ---
+def process():
+    print(f"Processing {CSV_FILE_PATH}...")
+    if not os.path.exists(OUTPUT_DIR):
+        os.makedirs(OUTPUT_DIR)
+        print(f"Created output directory: {OUTPUT_DIR}")
+
+    # --- Incremental rebuild: only regenerate outputs whose inputs changed ---
+    specs = hypothesis_specs()
+    try:
+        entries = output_entries(specs)
+    except OSError as e:
+        print(f"ERROR: Could not read {CSV_FILE_PATH}: {e}")
+        return
+    stale = {
+        key for key, entry in entries.items()
+        if not is_up_to_date(os.path.join(OUTPUT_DIR, f"{key}.json"), entry)
+    }
+    if not stale:
+        print("All outputs are up to date (see build manifest). Nothing to do.")
+        return
+    print(f"Rebuilding {len(stale)} of {len(entries)} outputs: {sorted(stale)}")
+    stale_specs = [
+        spec for spec in specs if any(key in stale for key in spec["queries"])
+    ]
+
+    try:
+        with stage("open_database"):
+            con = open_database()
     except Exception as e:
-        print(f"ERROR H7: {e}")
-        results["h7_median_review_vs_price"] = []
+        print(f"ERROR: Could not load data into DuckDB: {e}")
+        return
 
-    con.close()
-    print("Closed DuckDB connection.")
+    table_columns = [
+        row[0] for row in con.execute(f"DESCRIBE {TABLE_NAME}").fetchall()
+    ]
+    bridge_tables = bridge_table_names(con)
+
+    results = {}
+    failed = set()
 
-    for key, data in results.items():
-        output_path = os.path.join(OUTPUT_DIR, f"{key}.json")
+    # --- General Statistics ---
+    if "general_info" in stale:
         try:
-            # Convert numpy types to native Python types for JSON serialization
-            def convert_numpy_types(obj):
-                if isinstance(obj, np.integer):
-                    return int(obj)
-                elif isinstance(obj, np.floating):
-                    return float(obj)
-                elif isinstance(obj, np.ndarray):
-                    return obj.tolist()
-                elif isinstance(obj, pd.Timestamp):
-                    return obj.isoformat()
-                elif isinstance(obj, dict):
-                    return {k: convert_numpy_types(v) for k, v in obj.items()}
-                elif isinstance(obj, list):
-                    return [convert_numpy_types(i) for i in obj]
-                return obj
-
-            serializable_data = convert_numpy_types(data)
-            with open(output_path, "w") as f:
-                json.dump(serializable_data, f, indent=4)
-            print(f"Successfully saved {key}.json to {output_path}")
+            results["general_info"] = compute_general_stats(con, table_columns)
+            print("SUCCESS: General Statistics.")
         except Exception as e:
-            print(f"ERROR: Could not save {key}.json: {e}")
-            # Fallback for problematic data: try to save as string
+            print(f"ERROR during General Statistics calculation: {e}")
+            failed.add("general_info")
+            results["general_info"] = {
+                "error": str(e),
+                "total_games_analyzed": 0,
+                "numeric_column_stats": [],
+                "free_vs_paid_counts": [],
+            }
+
+    # --- Data cube for the FilterPanel ---
+    if "data_cube" in stale:
+        if f"{TABLE_NAME}_genres" in bridge_tables:
             try:
-                with open(output_path, "w") as f:
-                    json.dump({"error_data_could_not_serialize": str(data)}, f, indent=4)
-                print(f"Saved problematic data for {key}.json as string due to serialization error.")
-            except Exception as e_fallback:
-                print(f"ERROR: Fallback save for {key}.json also failed: {e_fallback}")
+                results["data_cube"] = compute_data_cube(con)
+                print("SUCCESS: Data Cube.")
+            except Exception as e:
+                print(f"ERROR during Data Cube calculation: {e}")
+        else:
+            print("WARNING: Data Cube - Missing genres bridge table.")
+
+    # --- Hypotheses H1-H7 (independent queries, run concurrently) ---
+    available = set(table_columns) | set(bridge_tables)
+    hypothesis_results, hypothesis_failed = run_hypotheses(
+        con, stale_specs, available
+    )
+    results.update(hypothesis_results)
+    failed.update(hypothesis_failed)
 
+    con.close()
+    print("Closed DuckDB connection.")
+
+    written = write_results(results)
+    # The manifest is a single file, so it is updated after all writes finished
+    for key in written:
+        if key not in failed:
+            record_output(os.path.join(OUTPUT_DIR, f"{key}.json"), entries[key])
 
     print("Processing complete.")
 
 
+def main():
+    # Stage timings, memory and sizes go to the run report (see instrumentation.py)
+    start_run("process_steam_data")
+    try:
+        process()
+    finally:
+        finish_run()
+
+
 if __name__ == "__main__":
     main()
@@ -1,111 +1,226 @@
-import csv
+import heapq
+import html
 import json
-import ast
-from datetime import datetime
+import os
+import re
+import shutil
+import sys
+from datetime import date, datetime
 from collections import defaultdict
 
+import pandas as pd
+
+import list_columns
+import output_writer
+import owners
+from build_manifest import code_hash, is_up_to_date, output_entry, record_output
+from instrumentation import finish_run, stage, start_run
+from data_cache import iter_rows, load_rows
+from list_columns import parse_list_column
+from output_writer import write_output
+from owners import parse_owners
+
 INPUT_CSV = 'public/data.csv'
-OUTPUT_JSON = 'public/processed_data/steam_timeline.json'
+# Sharded output: a compact index for the timeline strip plus per-year detail
+# shards that the frontend fetches on demand, listed in manifest.json
+OUTPUT_DIR = 'public/processed_data/steam_timeline'
+MANIFEST_JSON = os.path.join(OUTPUT_DIR, 'manifest.json')
+# genre (= genres[0]) and release_year are derived by the frontend
+INDEX_FIELDS = [
+    'appid', 'name', 'release_date', 'positive', 'estimated_owners', 'genres',
+    'avg_review_score',
+]
+DETAIL_FIELDS = [
+    'short_description', 'detailed_description', 'header_image',
+    'screenshots', 'developers', 'publishers',
+]
+# detailed_description is reduced to plain text of at most this many characters
+DESCRIPTION_MAX_CHARS = 600
+COLUMNS_USED = [
+    'appid', 'name', 'release_date', 'positive', 'estimated_owners', 'genres',
+    'detailed_description', 'short_description', 'header_image', 'screenshots',
+    'developers', 'publishers', 'pct_pos_total',
+]
+# Games kept per release year, ranked by positive reviews
+TOP_K_PER_YEAR = 40
+# Stored as list literals; parsed once per distinct value
+LIST_COLUMNS = ['genres', 'screenshots', 'developers', 'publishers']
 
 
-def parse_owners(owners_str):
-    # Format: '10000000 - 20000000'
+def parse_date(value):
+    # The cache stores release_date typed, so it may already be a date
+    if isinstance(value, date):
+        return value
     try:
-        parts = owners_str.replace(',', '').split('-')
-        if len(parts) == 2:
-            low = int(parts[0].strip())
-            high = int(parts[1].strip())
-            return int((low + high) / 2)
-        return int(parts[0].strip())
+        return datetime.strptime(value, '%Y-%m-%d')
     except Exception:
         return None
 
-def parse_list_field(field):
-    try:
-        val = ast.literal_eval(field)
-        if isinstance(val, list):
-            return val
-        return []
-    except Exception:
-        return []
+def text(value):
+    # Render cached values the way csv.DictReader would have returned them
+    if value is None or pd.isna(value):
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
 
-def parse_screenshots(field):
-    shots = parse_list_field(field)
-    return shots[:3] if shots else []
+def plain_text(description, max_chars=DESCRIPTION_MAX_CHARS):
+    """Strip HTML from a description and truncate it on a word boundary."""
+    text_only = re.sub(r'<[^>]+>', ' ', description or '')
+    text_only = re.sub(r'\s+', ' ', html.unescape(text_only)).strip()
+    if len(text_only) <= max_chars:
+        return text_only
+    return text_only[:max_chars].rsplit(' ', 1)[0] + '\u2026'
 
-def parse_date(date_str):
-    try:
-        return datetime.strptime(date_str, '%Y-%m-%d')
-    except Exception:
-        return None
+def write_timeline_shards(timeline, output_dir=OUTPUT_DIR):
+    """Write the index, per-year detail shards and their manifest.
 
-def main():
-    print("[DEBUG] Starting process_steam_timeline.py (downsampled)")
-    games_by_year = defaultdict(list)
+    Returns the manifest. Detail shards map appid -> detail fields, so the
+    frontend fetches a year's shard only when a game of that year is opened.
+    """
+    details_dir = os.path.join(output_dir, 'details')
+    # Years can disappear between runs, so start from an empty directory
+    shutil.rmtree(details_dir, ignore_errors=True)
+    os.makedirs(details_dir)
+
+    index = [{field: entry[field] for field in INDEX_FIELDS} for entry in timeline]
+    with stage('write: index.json', rows_in=len(index)) as record:
+        record['bytes_written'] = write_output(
+            os.path.join(output_dir, 'index.json'), index, ensure_ascii=False
+        )
+
+    details_by_year = defaultdict(dict)
+    for entry in timeline:
+        detail = {field: entry[field] for field in DETAIL_FIELDS}
+        detail['detailed_description'] = plain_text(detail['detailed_description'])
+        details_by_year[entry['release_year']][entry['appid']] = detail
+    details = {}
+    for year, year_details in sorted(details_by_year.items()):
+        details[str(year)] = f'details/{year}.json'
+        with stage(f'write: {details[str(year)]}', rows_in=len(year_details)) as record:
+            record['bytes_written'] = write_output(
+                os.path.join(output_dir, details[str(year)]), year_details, ensure_ascii=False
+            )
+
+    manifest = {
+        'index': 'index.json',
+        'details': details,
+        'games': len(timeline),
+        'top_k_per_year': TOP_K_PER_YEAR,
+    }
+    with open(os.path.join(output_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+def parse_positive(value):
+    positive = text(value)
+    return int(positive) if positive.isdigit() else 0
+
+def select_top_rows(top_k):
+    """First pass: stream release_date/positive and keep the top_k rows per year.
+
+    Each year holds a min-heap of at most top_k (positive, -row_number) keys,
+    so memory scales with years x top_k instead of with the dataset. Ties on
+    positive go to the earlier row, as with a stable sort.
+    """
+    heaps = defaultdict(list)
     total = 0
-    skipped = 0
     skipped_date = 0
+    for row_number, release_value, positive_value in iter_rows(['release_date', 'positive'], csv_path=INPUT_CSV):
+        total += 1
+        release_date = parse_date(release_value)
+        if not release_date:
+            skipped_date += 1
+            continue
+        key = (parse_positive(positive_value), -row_number)
+        heap = heaps[release_date.year]
+        if len(heap) < top_k:
+            heapq.heappush(heap, key)
+        elif key > heap[0]:
+            heapq.heapreplace(heap, key)
+    selected = sorted(-row_number for heap in heaps.values() for _, row_number in heap)
+    return selected, total, skipped_date
+
+def process_timeline():
+    print(f"Processing the Steam timeline (top {TOP_K_PER_YEAR} per year, streaming)...")
+    manifest_entry = output_entry(
+        COLUMNS_USED,
+        code_hash(sys.modules[__name__], owners, list_columns, output_writer),
+        config={'TOP_K_PER_YEAR': TOP_K_PER_YEAR},
+        csv_path=INPUT_CSV,
+    )
+    if is_up_to_date(MANIFEST_JSON, manifest_entry):
+        print(f"{MANIFEST_JSON} is up to date (see build manifest). Nothing to do.")
+        return
+    with stage('scan') as record:
+        selected_rows, total, skipped_date = select_top_rows(TOP_K_PER_YEAR)
+        record['rows_in'] = total
+        record['rows_out'] = len(selected_rows)
     skipped_parse = 0
-    with open(INPUT_CSV, encoding='utf-8') as f:
-        print("[DEBUG] Opened CSV file")
-        reader = csv.DictReader(f)
-        first_row = next(reader, None)
-        if first_row:
-            print(f"[DEBUG] First row keys: {list(first_row.keys())}")
-            print(f"[DEBUG] First row values: {list(first_row.values())}")
-            # Rewind to process all rows
-            f.seek(0)
-            reader = csv.DictReader(f)
-        else:
-            print("[DEBUG] No rows in CSV file!")
-        for row in reader:
-            total += 1
-            release_date = parse_date(row['release_date'])
-            if not release_date:
-                skipped += 1
-                skipped_date += 1
-                continue
+    if not total:
+        print("WARNING: No rows in CSV file!")
+
+    # Second pass: the expensive fields are loaded and parsed for survivors only
+    with stage('load', rows_in=len(selected_rows)) as record:
+        df = load_rows(COLUMNS_USED, selected_rows, csv_path=INPUT_CSV)
+        record['rows_out'] = len(df)
+    with stage('clean', rows_in=len(df)) as record:
+        # Format: '10000000 - 20000000', parsed for the whole column at once
+        df['estimated_owners'] = [
+            int(value) if pd.notna(value) else None
+            for value in parse_owners(df['estimated_owners'])['midpoint']
+        ]
+        for column in LIST_COLUMNS:
+            df[column] = parse_list_column(df[column])
+        timeline = []
+        for row_number, game in zip(df.index, df.to_dict('records')):
+            row = {key: text(value) for key, value in game.items() if key not in LIST_COLUMNS}
+            release_date = parse_date(game['release_date'])
             try:
                 entry = {
                     'appid': row['appid'],
                     'name': row['name'],
-                    'release_date': row['release_date'],
+                    'release_date': release_date.strftime('%Y-%m-%d'),
                     'release_year': release_date.year,
-                    'positive': int(row['positive']) if row['positive'].isdigit() else 0,
-                    'estimated_owners': parse_owners(row['estimated_owners']),
-                    'genre': parse_list_field(row['genres'])[0] if row['genres'] else None,
-                    'genres': parse_list_field(row['genres']),
+                    'positive': parse_positive(game['positive']),
+                    'estimated_owners': game['estimated_owners'],
+                    'genre': game['genres'][0] if game['genres'] else None,
+                    'genres': list(game['genres']),
                     'detailed_description': row['detailed_description'],
                     'short_description': row['short_description'],
                     'header_image': row['header_image'],
-                    'screenshots': parse_screenshots(row['screenshots']),
-                    'developers': parse_list_field(row['developers']),
-                    'publishers': parse_list_field(row['publishers']),
+                    'screenshots': list(game['screenshots'][:3]),
+                    'developers': list(game['developers']),
+                    'publishers': list(game['publishers']),
                     'avg_review_score': float(row['pct_pos_total']) if row.get('pct_pos_total') not in (None, '', 'null') else None,
                 }
-                games_by_year[release_date.year].append(entry)
+                timeline.append((row_number, entry))
             except Exception as e:
-                skipped += 1
                 skipped_parse += 1
-                print(f"[SKIP] Parse error on row {total}: {e}")
+                print(f"[SKIP] Parse error on row {row_number + 1}: {e}")
                 continue
-    # Downsample: keep only top 40 games per year by positive ratings
-    timeline = []
-    for year, games in games_by_year.items():
-        top_games = sorted(games, key=lambda x: x['positive'] if x['positive'] is not None else 0, reverse=True)[:40]
-        timeline.extend(top_games)
-    # Sort by release_date
-    timeline.sort(key=lambda x: x['release_date'])
+        # Sort by release_date, most positive ratings first within a day
+        timeline.sort(key=lambda item: (item[1]['release_date'], -item[1]['positive'], item[0]))
+        timeline = [entry for _, entry in timeline]
+        record['rows_out'] = len(timeline)
+    skipped = skipped_date + skipped_parse
     print(f"Total rows: {total}")
     print(f"Rows skipped: {skipped}")
     print(f"  - Skipped due to invalid/missing date: {skipped_date}")
     print(f"  - Skipped due to parse error: {skipped_parse}")
     print(f"Rows included (after downsampling): {len(timeline)}")
-    if timeline:
-        print("Sample entry:")
-        print(json.dumps(timeline[0], indent=2))
-    with open(OUTPUT_JSON, 'w', encoding='utf-8') as f:
-        json.dump(timeline, f, ensure_ascii=False, indent=2)
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    manifest = write_timeline_shards(timeline)
+    print(f"Wrote index and {len(manifest['details'])} detail shards to {OUTPUT_DIR}")
+    record_output(MANIFEST_JSON, manifest_entry)
+
+def main():
+    # Stage timings, memory and sizes go to the run report (see instrumentation.py)
+    start_run('process_steam_timeline')
+    try:
+        process_timeline()
+    finally:
+        finish_run()
 
 if __name__ == '__main__':
-    main() 
\ No newline at end of file
+    main()
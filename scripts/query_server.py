@@ -0,0 +1,234 @@
+import json
+import os
+import queue
+import re
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import duckdb
+
+from output_writer import fetch_records, json_default
+from process_steam_data import (
+    TABLE_NAME,
+    bridge_table_names,
+    compute_general_stats,
+    hypothesis_specs,
+    open_database,
+)
+
+# --- Configuration ---
+# Local HTTP service that keeps steam_games loaded and answers the H1-H7
+# queries and the general statistics for a filtered subset of the games:
+#
+#   python scripts/query_server.py
+#   curl "http://127.0.0.1:8765/api/h1_review_percentage_over_time?genre=Indie&year_min=2015"
+#
+# /api lists the outputs; /api/<output> returns one of them (general_info or
+# an H1-H7 output key) in the same shape as its file in public/processed_data.
+# Filters, all optional: genre (comma-separated, games with any of them),
+# year_min, year_max, price_min, price_max.
+HOST = "127.0.0.1"
+PORT = 8765
+# Cursors shared by the request threads; each request holds one at a time
+CURSOR_POOL_SIZE = os.cpu_count() or 4
+# Number of (output, filters) results kept in memory
+RESULT_CACHE_SIZE = 256
+
+# Query parameter -> (named SQL parameter, type)
+FILTERS = {
+    "genre": ("genres", str),
+    "year_min": ("year_min", int),
+    "year_max": ("year_max", int),
+    "price_min": ("price_min", float),
+    "price_max": ("price_max", float),
+}
+
+# Shadows the table for the query that follows, so the unchanged H1-H7 SQL
+# sees only the filtered games. A NULL parameter disables its filter.
+FILTERED_TABLE_CTE = f"""WITH {TABLE_NAME} AS (
+    SELECT * FROM main.{TABLE_NAME}
+    WHERE ($genres::VARCHAR[] IS NULL OR appid IN (
+            SELECT appid FROM main.{TABLE_NAME}_genres
+            WHERE list_contains($genres::VARCHAR[], genre)))
+        AND ($year_min::INTEGER IS NULL OR release_year >= $year_min::INTEGER)
+        AND ($year_max::INTEGER IS NULL OR release_year <= $year_max::INTEGER)
+        AND ($price_min::DOUBLE IS NULL OR price >= $price_min::DOUBLE)
+        AND ($price_max::DOUBLE IS NULL OR price <= $price_max::DOUBLE)
+)"""
+
+
+# --- Helper Functions ---
+class BadRequest(ValueError):
+    pass
+
+
+@lru_cache(maxsize=None)
+def filtered_sql(sql):
+    """The query with FILTERED_TABLE_CTE in front, built once per query."""
+    sql = sql.strip()
+    match = re.match(r"WITH\s+", sql, re.IGNORECASE)
+    if match:
+        return f"{FILTERED_TABLE_CTE},\n{sql[match.end():]}"
+    return f"{FILTERED_TABLE_CTE}\n{sql}"
+
+
+def normalize_filters(query_string):
+    """Parse the filter parameters into a hashable, canonical tuple.
+
+    Requests that differ only in parameter order, genre order or number
+    formatting map to the same tuple and share one cache entry.
+    """
+    params = parse_qs(query_string, keep_blank_values=False)
+    unknown = set(params) - set(FILTERS)
+    if unknown:
+        raise BadRequest(f"Unknown parameters: {sorted(unknown)}")
+    normalized = []
+    for name, (sql_name, cast) in FILTERS.items():
+        if name not in params:
+            normalized.append((sql_name, None))
+        elif name == "genre":
+            genres = {
+                genre.strip()
+                for value in params[name]
+                for genre in value.split(",")
+                if genre.strip()
+            }
+            normalized.append((sql_name, tuple(sorted(genres)) or None))
+        else:
+            try:
+                normalized.append((sql_name, cast(params[name][-1])))
+            except ValueError:
+                raise BadRequest(f"Invalid value for {name}: {params[name][-1]!r}")
+    return tuple(normalized)
+
+
+class FilteredCursor:
+    """Cursor whose execute() runs a query on the filtered table.
+
+    Filter values are bound as parameters, never formatted into the SQL.
+    Only the SQL text is reused (filtered_sql); DuckDB parses and plans it
+    on every execute. Its Python client has no reusable prepared statement,
+    and SQL PREPARE/EXECUTE takes no bound parameters and was no faster.
+    """
+
+    def __init__(self, cursor, filters):
+        self.cursor = cursor
+        self.parameters = {
+            name: list(value) if isinstance(value, tuple) else value
+            for name, value in filters
+        }
+
+    def execute(self, sql):
+        return self.cursor.execute(filtered_sql(sql), self.parameters)
+
+
+class QueryService:
+    def __init__(self):
+        # Opens the persistent database if process_steam_data.USE_PERSISTENT_DB
+        self.con = open_database()
+        bridge_tables = bridge_table_names(self.con)
+        self.table_columns = [
+            row[0] for row in self.con.execute(f"DESCRIBE {TABLE_NAME}").fetchall()
+        ]
+        available = set(self.table_columns) | set(bridge_tables)
+        if f"{TABLE_NAME}_genres" not in available:
+            raise RuntimeError("The genre filter needs the genres bridge table.")
+
+        self.queries = {}
+        for spec in hypothesis_specs():
+            if all(col in available for col in spec["requires"]):
+                self.queries.update(spec["queries"])
+            else:
+                print(f"WARNING: {spec['name']} - Missing columns, not served.")
+
+        self.cursors = queue.Queue()
+        for _ in range(CURSOR_POOL_SIZE):
+            self.cursors.put(self.con.cursor())
+        # Bound per instance so the cache goes away with the service
+        self.result = lru_cache(maxsize=RESULT_CACHE_SIZE)(self._result)
+
+    @contextmanager
+    def cursor(self, filters):
+        cur = self.cursors.get()
+        try:
+            yield FilteredCursor(cur, filters)
+        finally:
+            self.cursors.put(cur)
+
+    def outputs(self):
+        return ["general_info", *self.queries]
+
+    def _result(self, output, filters):
+        """JSON bytes of one output for one normalized filter tuple."""
+        with self.cursor(filters) as cur:
+            if output == "general_info":
+                data = compute_general_stats(cur, self.table_columns)
+            else:
+                data = fetch_records(cur.execute(self.queries[output]))
+        return json.dumps(data, default=json_default).encode("utf-8")
+
+
+def make_handler(service):
+    class Handler(BaseHTTPRequestHandler):
+        def send_json(self, status, body):
+            if not isinstance(body, bytes):
+                body = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            # Lets the React dev server call the service directly
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            parts = [part for part in url.path.split("/") if part]
+            if parts == ["api"]:
+                self.send_json(
+                    200, {"outputs": service.outputs(), "filters": list(FILTERS)}
+                )
+                return
+            if len(parts) != 2 or parts[0] != "api":
+                self.send_json(404, {"error": "Not found"})
+                return
+            output = parts[1]
+            if output not in service.outputs():
+                self.send_json(404, {"error": f"Unknown output: {output}"})
+                return
+            try:
+                filters = normalize_filters(url.query)
+                start = time.perf_counter()
+                body = service.result(output, filters)
+                elapsed = (time.perf_counter() - start) * 1000
+            except BadRequest as e:
+                self.send_json(400, {"error": str(e)})
+                return
+            except duckdb.Error as e:
+                self.send_json(500, {"error": str(e)})
+                return
+            self.log_message("%s %s in %.1f ms", output, dict(filters), elapsed)
+            self.send_json(200, body)
+
+    return Handler
+
+
+def main():
+    print(f"Loading {TABLE_NAME}...")
+    service = QueryService()
+    server = ThreadingHTTPServer((HOST, PORT), make_handler(service))
+    print(f"Serving {len(service.outputs())} outputs on http://{HOST}:{PORT}/api")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.con.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import hashlib
+import json
+
+# --- Configuration ---
+# Declared type of every column of data.csv, by cleaned column name. The CSV
+# is read as text and each value is cast to its type while the columnar cache
+# is built (data_cache.ensure_cache), so every reader gets typed columns and
+# DuckDB hands pandas compact dtypes directly: INTEGER -> Int32,
+# SMALLINT -> Int16, REAL -> float32, BOOLEAN -> boolean, DATE -> datetime64.
+# Values that do not fit their type become NULL and are reported.
+SCHEMA = {
+    "appid": "INTEGER",
+    "name": "VARCHAR",
+    "release_date": "DATE",
+    "required_age": "SMALLINT",
+    # Kept as DOUBLE: float32 cannot represent most cent amounts exactly
+    "price": "DOUBLE",
+    "dlc_count": "SMALLINT",
+    "detailed_description": "VARCHAR",
+    "about_the_game": "VARCHAR",
+    "short_description": "VARCHAR",
+    "reviews": "VARCHAR",
+    "header_image": "VARCHAR",
+    "website": "VARCHAR",
+    "support_url": "VARCHAR",
+    "support_email": "VARCHAR",
+    "windows": "BOOLEAN",
+    "mac": "BOOLEAN",
+    "linux": "BOOLEAN",
+    "metacritic_score": "SMALLINT",
+    "metacritic_url": "VARCHAR",
+    "achievements": "INTEGER",
+    "recommendations": "INTEGER",
+    "notes": "VARCHAR",
+    "supported_languages": "VARCHAR",
+    "full_audio_languages": "VARCHAR",
+    "packages": "VARCHAR",
+    "developers": "VARCHAR",
+    "publishers": "VARCHAR",
+    "categories": "VARCHAR",
+    "genres": "VARCHAR",
+    "screenshots": "VARCHAR",
+    "movies": "VARCHAR",
+    "user_score": "SMALLINT",
+    "score_rank": "SMALLINT",
+    "positive": "INTEGER",
+    "negative": "INTEGER",
+    "estimated_owners": "VARCHAR",
+    "average_playtime_forever": "INTEGER",
+    "average_playtime_2weeks": "INTEGER",
+    "median_playtime_forever": "INTEGER",
+    "median_playtime_2weeks": "INTEGER",
+    "discount": "SMALLINT",
+    "peak_ccu": "INTEGER",
+    "tags": "VARCHAR",
+    "pct_pos_total": "REAL",
+    "num_reviews_total": "INTEGER",
+    "pct_pos_recent": "REAL",
+    "num_reviews_recent": "INTEGER",
+}
+# Low-cardinality text columns that pandas readers get as categoricals
+CATEGORICAL_COLUMNS = ["estimated_owners"]
+
+
+# --- Helper Functions ---
+def schema_fingerprint():
+    """Short hash of the declared types, part of every cache key."""
+    text = json.dumps([SCHEMA, CATEGORICAL_COLUMNS], sort_keys=True)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:8]
+
+
+def typed_sql(raw_sql, column):
+    """SQL that casts a text value of the given column to its declared type.
+
+    Columns that are not declared stay text.
+    """
+    sql_type = SCHEMA.get(column, "VARCHAR")
+    if sql_type == "VARCHAR":
+        return raw_sql
+    return f"TRY_CAST(trim({raw_sql}) AS {sql_type})"
+
+
+def invalid_sql(raw_sql, column):
+    """SQL condition that is true if a present value does not fit its type."""
+    return f"({raw_sql} IS NOT NULL AND {typed_sql(raw_sql, column)} IS NULL)"
+
+
+def apply_categories(df):
+    """Turn the CATEGORICAL_COLUMNS of a DataFrame into categoricals."""
+    for column in CATEGORICAL_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype("category")
+    return df
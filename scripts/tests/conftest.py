@@ -0,0 +1,34 @@
+import os
+import sys
+
+import pytest
+
+# The scripts import each other as top-level modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import build_manifest  # noqa: E402
+import data_cache  # noqa: E402
+from generate_synthetic_data import generate  # noqa: E402
+
+# Rows of the synthetic data.csv the tests run on
+SYNTHETIC_ROWS = 2000
+
+
+@pytest.fixture(scope="session")
+def cache_dir(tmp_path_factory):
+    """A .data_cache of its own, so the repo's cache and manifest stay untouched."""
+    path = tmp_path_factory.mktemp("data_cache")
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(data_cache, "CACHE_DIR", str(path))
+        patch.setattr(data_cache, "FINGERPRINTS_FILE", str(path / "fingerprints.json"))
+        patch.setattr(data_cache, "TEMP_DIR", str(path / "tmp"))
+        patch.setattr(build_manifest, "CACHE_DIR", str(path))
+        patch.setattr(build_manifest, "MANIFEST_PATH", str(path / "build_manifest.json"))
+        yield path
+
+
+@pytest.fixture(scope="session")
+def synthetic_csv(tmp_path_factory, cache_dir):
+    """Path of a small synthetic data.csv (see generate_synthetic_data.py)."""
+    path = tmp_path_factory.mktemp("public") / "data.csv"
+    return generate(SYNTHETIC_ROWS, str(path))
@@ -0,0 +1,48 @@
+import build_manifest
+from build_manifest import code_hash, is_up_to_date, output_entry, record_output
+
+
+def test_code_hash_of_strings_and_functions():
+    assert code_hash("SELECT 1") == code_hash("SELECT 1")
+    assert code_hash("SELECT 1") != code_hash("SELECT 2")
+    assert code_hash(code_hash) != code_hash(output_entry)
+
+
+def test_fingerprint_covers_columns_code_and_config(synthetic_csv):
+    entry = output_entry(["b", "a"], "code", {"METHOD": "midpoint"}, csv_path=synthetic_csv)
+    # Column order does not matter
+    same = output_entry(["a", "b"], "code", {"METHOD": "midpoint"}, csv_path=synthetic_csv)
+    assert entry["fingerprint"] == same["fingerprint"]
+    for changed in [
+        output_entry(["a"], "code", {"METHOD": "midpoint"}, csv_path=synthetic_csv),
+        output_entry(["a", "b"], "other code", {"METHOD": "midpoint"}, csv_path=synthetic_csv),
+        output_entry(["a", "b"], "code", {"METHOD": "lower"}, csv_path=synthetic_csv),
+    ]:
+        assert changed["fingerprint"] != entry["fingerprint"]
+
+
+def test_outputs_are_rebuilt_only_when_inputs_change(synthetic_csv, tmp_path, monkeypatch):
+    output_path = tmp_path / "h1.json"
+    entry = output_entry(["a"], "code", csv_path=synthetic_csv)
+    # Missing output
+    assert not is_up_to_date(output_path, entry)
+    output_path.write_text("[]")
+    # Not recorded yet
+    assert not is_up_to_date(output_path, entry)
+    record_output(output_path, entry)
+    assert is_up_to_date(output_path, entry)
+    assert not is_up_to_date(output_path, output_entry(["a"], "new code", csv_path=synthetic_csv))
+    monkeypatch.setattr(build_manifest, "FORCE_REBUILD", True)
+    assert not is_up_to_date(output_path, entry)
+
+
+def test_changed_data_rebuilds(synthetic_csv, tmp_path):
+    csv_path = tmp_path / "data.csv"
+    csv_path.write_text("appid\n1\n")
+    output_path = tmp_path / "out.json"
+    output_path.write_text("[]")
+    entry = output_entry(["appid"], "code", csv_path=csv_path)
+    record_output(output_path, entry)
+    assert is_up_to_date(output_path, output_entry(["appid"], "code", csv_path=csv_path))
+    csv_path.write_text("appid\n2\n")
+    assert not is_up_to_date(output_path, output_entry(["appid"], "code", csv_path=csv_path))
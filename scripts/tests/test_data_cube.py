@@ -0,0 +1,84 @@
+from collections import defaultdict
+
+import pytest
+
+import process_steam_data as steam
+from output_writer import fetch_records, to_records
+
+
+@pytest.fixture(scope="module")
+def con(synthetic_csv):
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(steam, "CSV_FILE_PATH", synthetic_csv)
+        patch.setattr(steam, "USE_PERSISTENT_DB", False)
+        con = steam.open_database()
+        yield con
+        con.close()
+
+
+def query(con, key):
+    queries = {
+        key: sql for spec in steam.hypothesis_specs() for key, sql in spec["queries"].items()
+    }
+    return fetch_records(con.execute(queries[key]))
+
+
+@pytest.fixture(scope="module")
+def cube(con):
+    cube = steam.compute_data_cube(con)
+    cube["cells"] = to_records(cube["cells"])
+    return cube
+
+
+def test_cells_are_unique(cube):
+    keys = [(c["genre_mask"], c["release_year"], c["price_bucket"]) for c in cube["cells"]]
+    assert len(keys) == len(set(keys))
+    assert len(cube["genres"]) <= steam.CUBE_GENRES
+    assert all(0 <= c["genre_mask"] < 2 ** len(cube["genres"]) for c in cube["cells"])
+
+
+def test_unfiltered_h1_roll_up_matches_the_query(con, cube):
+    n = defaultdict(int)
+    total = defaultdict(float)
+    for cell in cube["cells"]:
+        if cell["release_year"] is not None:
+            n[cell["release_year"]] += cell["h1_n"]
+            total[cell["release_year"]] += cell["h1_sum_pct"]
+    for row in query(con, "h1_review_percentage_over_time"):
+        year = row["release_year"]
+        assert n[year] == row["num_games"]
+        assert total[year] / n[year] == pytest.approx(row["avg_positive_percentage"])
+
+
+def test_unfiltered_h5_roll_up_matches_the_query(con, cube):
+    sums = defaultdict(lambda: defaultdict(float))
+    for cell in cube["cells"]:
+        if cell["price_bucket"] is None:
+            continue
+        game_type = "Free-to-Play" if cell["price_bucket"] == 0 else "Paid"
+        for measure in ["h5_n", "h5_sum_owners", "h5_sum_pct"]:
+            sums[game_type][measure] += cell[measure]
+    for row in query(con, "h5_free_vs_paid"):
+        s = sums[row["game_type"]]
+        assert s["h5_n"] == row["num_games"]
+        assert s["h5_sum_owners"] / s["h5_n"] == pytest.approx(row["avg_estimated_owners"])
+        assert s["h5_sum_pct"] / s["h5_n"] == pytest.approx(row["avg_positive_percentage"])
+
+
+def test_unfiltered_h2_and_h6_roll_ups_match_the_queries(con, cube):
+    def total(measure):
+        return sum(cell[measure] for cell in cube["cells"])
+
+    for row in query(con, "h2_platforms_vs_owners"):
+        k = row["num_platforms"]
+        assert total(f"h2_n_{k}") == row["num_games"]
+        assert total(f"h2_sum_owners_{k}") / total(f"h2_n_{k}") == pytest.approx(
+            row["avg_estimated_owners"]
+        )
+    periods = {"Q4 Release": "q4", "Other Quarters": "other"}
+    for row in query(con, "h6_q4_release_impact"):
+        period = periods[row["release_period"]]
+        assert total(f"h6_n_{period}") == row["num_games"]
+        assert total(f"h6_sum_reviews_{period}") / total(f"h6_n_{period}") == pytest.approx(
+            row["avg_num_reviews"]
+        )
@@ -0,0 +1,71 @@
+import numpy as np
+
+from graph_metrics import adjacency_matrix, graph_metrics, label_propagation, relabel_by_size
+
+
+def test_empty_graph():
+    metrics = graph_metrics(0, [], [], [])
+    assert all(len(values) == 0 for values in metrics.values())
+
+
+def test_nodes_without_links_are_their_own_groups():
+    metrics = graph_metrics(3, [], [], [])
+    assert metrics["component_size"].tolist() == [1, 1, 1]
+    assert metrics["community_size"].tolist() == [1, 1, 1]
+    assert metrics["degree"].tolist() == [0, 0, 0]
+    assert np.allclose(metrics["pagerank"], 1)
+
+
+def test_components_numbered_from_the_largest():
+    # Nodes 3-4-5 form the larger component, 0-1 the smaller, 2 is alone
+    metrics = graph_metrics(6, [0, 3, 4], [1, 4, 5])
+    assert metrics["component"].tolist() == [1, 1, 2, 0, 0, 0]
+    assert metrics["component_size"].tolist() == [2, 2, 1, 3, 3, 3]
+
+
+def test_degrees_and_duplicate_links():
+    # The link 0-1 is given twice, so its weights add up
+    metrics = graph_metrics(3, [0, 1, 1], [1, 0, 2], [2.0, 1.0, 4.0])
+    assert metrics["degree"].tolist() == [1, 2, 1]
+    assert metrics["weighted_degree"].tolist() == [3.0, 7.0, 4.0]
+
+
+def test_pagerank_averages_one_and_favours_hubs():
+    # A star: node 0 is linked to every other node
+    n = 5
+    metrics = graph_metrics(n, [0, 0, 0, 0], [1, 2, 3, 4])
+    assert np.isclose(metrics["pagerank"].sum(), n)
+    assert metrics["pagerank"][0] > metrics["pagerank"][1:].max()
+    assert np.allclose(metrics["pagerank"][1:], metrics["pagerank"][1])
+
+
+def test_communities_of_two_cliques_joined_by_one_link():
+    clique = [(a, b) for a in range(4) for b in range(a + 1, 4)]
+    links = clique + [(a + 4, b + 4) for a, b in clique] + [(3, 4)]
+    sources, targets = zip(*links)
+    metrics = graph_metrics(8, sources, targets)
+    community = metrics["community"]
+    assert len(set(community[:4])) == 1
+    assert len(set(community[4:])) == 1
+    assert community[0] != community[4]
+    assert metrics["community_size"].tolist() == [4] * 8
+
+
+def test_label_propagation_settles_on_a_bipartite_graph():
+    # Developers 0-2 and publishers 3-4, all in one group of studios
+    adjacency = adjacency_matrix(5, [0, 1, 2, 0], [3, 3, 4, 4])
+    labels = label_propagation(adjacency)
+    assert len(set(labels)) == 1
+
+
+def test_label_propagation_with_an_isolated_node():
+    # Some half-steps move only the unlinked node 2
+    labels = label_propagation(adjacency_matrix(3, [0], [1]))
+    assert labels[0] == labels[1]
+    assert labels[2] not in (labels[0], labels[1])
+
+
+def test_relabel_by_size():
+    labels, sizes = relabel_by_size(np.array([7, 3, 3, 9, 3, 7]))
+    assert labels.tolist() == [1, 0, 0, 2, 0, 1]
+    assert sizes.tolist() == [2, 3, 3, 1, 3, 2]
@@ -0,0 +1,74 @@
+import os
+
+import duckdb
+import pandas as pd
+
+from data_cache import load_columns, sql_literal
+from list_columns import (
+    BRIDGE_COLUMNS,
+    bridge_table,
+    bridge_table_paths,
+    parse_list_column,
+    parse_list_literal,
+)
+
+
+def test_parse_list_literal_python_and_json():
+    assert parse_list_literal("['Action', 'Indie']") == ("Action", "Indie")
+    # Names with apostrophes are written with double quotes
+    assert parse_list_literal("[\"Dev's Team 7\", 'Studio 1']") == ("Dev's Team 7", "Studio 1")
+    assert parse_list_literal('["Action", "RPG"]') == ("Action", "RPG")
+
+
+def test_parse_list_literal_dict_items_and_blanks():
+    value = "[{'id': 2, 'description': 'Single-player'}, {'id': 1}, '  ', ' PvP ']"
+    assert parse_list_literal(value) == ("Single-player", "PvP")
+
+
+def test_parse_list_literal_unparseable_values():
+    for value in [None, "", "   ", "not a list", "{'a': 1}", "['unclosed", 42]:
+        assert parse_list_literal(value) == ()
+
+
+def test_parse_list_column_keeps_index_and_missing_values():
+    series = pd.Series(["['A', 'B']", None, "['A', 'B']", "oops"], index=[5, 6, 7, 8])
+    parsed = parse_list_column(series)
+    assert parsed.index.tolist() == [5, 6, 7, 8]
+    assert parsed.tolist() == [("A", "B"), (), ("A", "B"), ()]
+
+
+def test_bridge_table_drops_duplicate_pairs():
+    appids = pd.Series([10, 20, 10, 30])
+    genres = pd.Series(["['A', 'B', 'A']", "['B']", "['B', 'C']", None])
+    table = bridge_table(appids, genres, "genre")
+    # One row per (appid, genre), in order of first appearance
+    assert list(table.itertuples(index=False, name=None)) == [
+        (10, "A"), (10, "B"), (20, "B"), (10, "C"),
+    ]
+
+
+def test_bridge_tables_match_the_parsed_columns(synthetic_csv):
+    paths = bridge_table_paths(csv_path=synthetic_csv)
+    assert set(paths) == set(BRIDGE_COLUMNS)
+    df = load_columns(["appid", *BRIDGE_COLUMNS], csv_path=synthetic_csv)
+    con = duckdb.connect()
+    for column, path in paths.items():
+        value_name = BRIDGE_COLUMNS[column]
+        stored = con.execute(
+            f"SELECT appid, {value_name} FROM read_parquet({sql_literal(path)})"
+        ).fetchall()
+        assert len(stored) == len(set(stored))
+        expected = {
+            (appid, value)
+            for appid, values in zip(df["appid"], parse_list_column(df[column]))
+            for value in values
+        }
+        assert set(stored) == expected
+    con.close()
+
+
+def test_bridge_tables_are_built_once(synthetic_csv):
+    paths = bridge_table_paths(csv_path=synthetic_csv)
+    mtimes = {column: os.path.getmtime(path) for column, path in paths.items()}
+    assert bridge_table_paths(csv_path=synthetic_csv) == paths
+    assert {column: os.path.getmtime(path) for column, path in paths.items()} == mtimes
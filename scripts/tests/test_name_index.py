@@ -0,0 +1,85 @@
+import pandas as pd
+import pytest
+
+from data_cache import load_columns
+from name_index import NameIndex, normalize_name
+
+
+def make_index(games):
+    """NameIndex over (name, appid, reviews) tuples, ranked like the Parquet index."""
+    df = pd.DataFrame(games, columns=["name", "appid", "reviews"])
+    df["key"] = [normalize_name(name) for name in df["name"]]
+    df = df.sort_values(["key", "reviews", "appid"], ascending=[True, False, True])
+    df["rank"] = df.groupby("key").cumcount() + 1
+    return NameIndex(df.reset_index(drop=True))
+
+
+@pytest.fixture
+def index():
+    return make_index([
+        ("PUBG: BATTLEGROUNDS", 578080, 2000000),
+        ("Portal", 400, 100000),
+        ("Portal Knights", 374040, 50000),
+        ("Grand Theft Auto V Legacy", 271590, 1500000),
+        ("Grand Theft Auto V Enhanced", 3240220, 30000),
+        ("Counter-Strike 2", 730, 8000000),
+        ("Doom", 2280, 30000),
+        ("DOOM", 379720, 150000),
+    ])
+
+
+def test_normalize_name():
+    assert normalize_name("PUBG: BATTLEGROUNDS") == "pubg battlegrounds"
+    assert normalize_name("pubg battlegrounds™") == "pubg battlegrounds"
+    assert normalize_name("  Counter—Strike®  2 ") == "counter strike 2"
+    assert normalize_name("ＦＵＬＬ　ＷＩＤＴＨ") == "full width"
+    assert normalize_name("Ōkami HD") == "ōkami hd"
+    assert normalize_name("™") == ""
+
+
+def test_exact_match(index):
+    game = index.lookup("pubg battlegrounds™")
+    assert game["appid"] == 578080
+    assert game["match"] == "exact"
+
+
+def test_duplicates_resolve_to_the_most_reviewed(index):
+    game = index.lookup("doom")
+    assert game["appid"] == 379720
+    assert game["duplicates"] == 2
+
+
+def test_query_words_inside_a_longer_name(index):
+    # Fewest extra words first, then the most reviews
+    game = index.lookup("Grand Theft Auto V")
+    assert game["appid"] == 271590
+    assert game["match"] == "words"
+
+
+def test_name_inside_a_longer_query(index):
+    game = index.lookup("Counter Strike 2 Global")
+    assert game["appid"] == 730
+    assert game["match"] == "words"
+    # Most words first
+    assert index.lookup("Portal Knights Deluxe")["appid"] == 374040
+    # A short name inside a much longer query is no match
+    assert index.lookup("Portal Deluxe Edition Remastered") is None
+
+
+def test_fuzzy_match_and_no_match(index):
+    game = index.lookup("Portl Knigths")
+    assert game["appid"] == 374040
+    assert game["match"] == "fuzzy"
+    assert index.lookup("Something else entirely") is None
+    assert index.lookup("™") is None
+
+
+def test_name_index_of_the_synthetic_data(synthetic_csv):
+    index = NameIndex.load(csv_path=synthetic_csv)
+    games = load_columns(["appid", "name"], csv_path=synthetic_csv).dropna()
+    # Generated names are "Game <row>", so each resolves to its own appid
+    game = games[games["name"].str.startswith("Game ")].iloc[0]
+    found = index.lookup(str(game["name"]).upper())
+    assert found["appid"] == game["appid"]
+    assert found["match"] == "exact"
+    assert found["duplicates"] == 1
@@ -0,0 +1,81 @@
+import math
+
+import duckdb
+import pandas as pd
+import pytest
+
+from data_cache import load_columns
+from owners import check_method, owners_sql, parse_owners
+
+SAMPLES = [
+    "0 - 20000",
+    "20000 - 50000",
+    " 1,000,000 - 2,000,000 ",
+    "5000",
+    "0 - 0",
+    "",
+    "unknown",
+    "10 - ",
+    "- 20",
+    None,
+]
+
+
+def sql_estimates(values):
+    con = duckdb.connect()
+    con.execute("CREATE TABLE t (i INTEGER, estimated_owners VARCHAR)")
+    con.executemany("INSERT INTO t VALUES (?, ?)", list(enumerate(values)))
+    estimates = owners_sql("estimated_owners")
+    return con.execute(
+        f"SELECT {estimates['lower']}, {estimates['upper']}, {estimates['midpoint']} "
+        f"FROM t ORDER BY i"
+    ).fetchall()
+
+
+def same(a, b):
+    if a is None or (isinstance(a, float) and math.isnan(a)):
+        return b is None or (isinstance(b, float) and math.isnan(b))
+    return a == b
+
+
+def test_parse_owners_ranges_and_single_numbers():
+    parsed = parse_owners(pd.Series(SAMPLES))
+    assert parsed.loc[0].tolist() == [0, 20000, 10000]
+    assert parsed.loc[2].tolist() == [1000000, 2000000, 1500000]
+    # A single number counts as both bounds
+    assert parsed.loc[3].tolist() == [5000, 5000, 5000]
+    assert parsed.loc[4].tolist() == [0, 0, 0]
+    # Anything unparseable is NaN
+    assert parsed.loc[5:].isna().all().all()
+
+
+def test_parse_owners_keeps_the_index():
+    series = pd.Series(["0 - 20000", "5000"], index=[7, 3])
+    assert parse_owners(series).index.tolist() == [7, 3]
+
+
+def test_owners_sql_matches_parse_owners():
+    parsed = parse_owners(pd.Series(SAMPLES))
+    for (lower, upper, midpoint), (_, row) in zip(sql_estimates(SAMPLES), parsed.iterrows()):
+        assert same(lower, row["lower"])
+        assert same(upper, row["upper"])
+        assert same(midpoint, row["midpoint"])
+
+
+def test_owners_sql_matches_parse_owners_on_synthetic_data(synthetic_csv):
+    values = load_columns(["estimated_owners"], csv_path=synthetic_csv)["estimated_owners"]
+    values = values.astype("string").tolist()
+    values = [None if pd.isna(value) else value for value in values]
+    parsed = parse_owners(pd.Series(values))
+    for (lower, upper, _), (_, row) in zip(sql_estimates(values), parsed.iterrows()):
+        assert same(lower, row["lower"])
+        assert same(upper, row["upper"])
+
+
+@pytest.mark.parametrize("method", ["lower", "upper", "midpoint"])
+def test_check_method_accepts_known_methods(method):
+    assert check_method(method) == method
+
+
+def test_check_method_falls_back_to_midpoint():
+    assert check_method("median") == "midpoint"
@@ -16,6 +16,8 @@ import DeveloperUniverse from "./components/DeveloperUniverse";
 import BackgroundCarousels from "./components/BackgroundCarousels";
 import SteamTimeMachine from "./components/SteamTimeMachine";
 import DataOverview from "./components/DataOverview";
+import { fetchOptionalJson, fromColumnar } from "./utils";
+import { rollUpCube } from "./dataCube";
 
 // Add a fullscreen loading spinner component
 const LoadingSpinner = ({ visible }) => (
@@ -60,6 +62,7 @@ const App = () => {
     h2Data: [],
     h3ScatterData: [],
     h3BinnedData: [],
+    h3DensityData: [],
     h4Data: [],
     h5Data: [],
     h6Data: [],
@@ -70,6 +73,9 @@ const App = () => {
   const [error, setError] = useState(null);
   const [showSpinner, setShowSpinner] = useState(true);
   const [generalInfo, setGeneralInfo] = useState(null);
+  const [dataCube, setDataCube] = useState(null);
+  const [dataCubeStatus, setDataCubeStatus] = useState("idle");
+  const [filters, setFilters] = useState(null);
 
   useEffect(() => {
     const fetchData = async () => {
@@ -85,6 +91,7 @@ const App = () => {
           h7Response,
           carouselDataResponse,
           generalInfoResponse,
+          h3DensityJson,
         ] = await Promise.all([
           fetch("/processed_data/h1_review_percentage_over_time.json"),
           fetch("/processed_data/h2_platforms_vs_owners.json"),
@@ -96,6 +103,8 @@ const App = () => {
           fetch("/processed_data/h7_median_review_vs_price.json"),
           fetch("/processed_data/carousel_data.json"),
           fetch("/processed_data/general_info.json"),
+          // Optional: only written by newer versions of process_steam_data.py
+          fetchOptionalJson("/processed_data/h3_reviews_owners_density.json", []),
         ]);
 
         if (
@@ -124,7 +133,8 @@ const App = () => {
           h7Data,
           carouselData,
           generalInfo,
-        ] = await Promise.all([
+          h3DensityData,
+        ] = (await Promise.all([
           h1Response.json(),
           h2Response.json(),
           h3ScatterResponse.json(),
@@ -135,13 +145,15 @@ const App = () => {
           h7Response.json(),
           carouselDataResponse.json(),
           generalInfoResponse.json(),
-        ]);
+          h3DensityJson,
+        ])).map(fromColumnar);
 
         setData({
           h1Data: h1Data || [],
           h2Data: h2Data || [],
           h3ScatterData: h3ScatterData || [],
           h3BinnedData: h3BinnedData || [],
+          h3DensityData: h3DensityData || [],
           h4Data: h4Data || [],
           h5Data: h5Data || [],
           h6Data: h6Data || [],
@@ -170,6 +182,27 @@ const App = () => {
     return () => clearTimeout(timer);
   }, []);
 
+  // The data cube is only needed for filtering, so it is fetched when the
+  // FilterPanel is first opened rather than before the first render
+  const loadDataCube = useCallback(async () => {
+    if (dataCubeStatus !== "idle") return;
+    setDataCubeStatus("loading");
+    const cube = await fetchOptionalJson("/processed_data/data_cube.json", null);
+    if (cube) {
+      setDataCube(fromColumnar(cube));
+      setDataCubeStatus("ready");
+    } else {
+      setDataCubeStatus("unavailable");
+    }
+  }, [dataCubeStatus]);
+
+  // With the data cube, H1/H2/H5/H6 follow the FilterPanel selection;
+  // otherwise the charts show the global aggregates
+  const chartData = useMemo(
+    () => (dataCube ? { ...data, ...rollUpCube(dataCube, filters) } : data),
+    [data, dataCube, filters]
+  );
+
   if (loading) {
     // Don't show the default loading, let the spinner handle it
     return null;
@@ -183,25 +216,48 @@ const App = () => {
   const chartSections = [
     {
       component: GameOwnerCarousel,
-      props: { data: data.carouselData },
+      props: { data: chartData.carouselData },
       key: "carousel",
     },
     {
       component: ReviewPriceChart,
-      props: { data: data.h7Data },
+      props: { data: chartData.h7Data },
       key: "reviewPrice",
     },
     { component: DeveloperUniverse, props: {}, key: "devUniverse" },
     {
       component: ReviewPercentageOverTimeChart,
-      props: { data: data.h1Data },
+      props: { data: chartData.h1Data },
       key: "reviewOverTime",
     },
+    {
+      component: ReviewsOwnersScatterChart,
+      props: {
+        data: chartData.h3ScatterData,
+        densityData: chartData.h3DensityData,
+      },
+      key: "reviewsOwners",
+    },
+    {
+      component: PlatformsVsOwnersChart,
+      props: { data: chartData.h2Data },
+      key: "platformsOwners",
+    },
     {
       component: GenrePriceDominanceChart,
-      props: { data: data.h4Data },
+      props: { data: chartData.h4Data },
       key: "genrePrice",
     },
+    {
+      component: FreeVsPaidChart,
+      props: { data: chartData.h5Data },
+      key: "freeVsPaid",
+    },
+    {
+      component: Q4ReleaseImpactChart,
+      props: { data: chartData.h6Data },
+      key: "q4Release",
+    },
     {
       component: SteamTimeMachine,
       props: {},
@@ -226,6 +282,12 @@ const App = () => {
                     <DataOverview info={generalInfo} />
                   </div>
                 )}
+                <FilterPanel
+                  data={{ ...data, dataCube }}
+                  status={dataCubeStatus}
+                  onOpen={loadDataCube}
+                  onFilterChange={setFilters}
+                />
                 {chartSections.map((section, idx) => {
                   const AlignComponent = section.component;
                   const align = idx % 2 === 0 ? "left" : "right";
@@ -1,4 +1,5 @@
 import React, { useEffect, useState, useRef } from "react";
+import { fetchHeaderImageUrls } from "../utils";
 
 const ROW_HEIGHT = 200;
 const SCROLL_SPEED = 40; // px/sec
@@ -32,13 +33,8 @@ const BackgroundCarousels = () => {
   useEffect(() => {
     const fetchImages = async () => {
       try {
-        const response = await fetch(
-          `${process.env.PUBLIC_URL}/processed_data/header_images.json`
-        );
-        if (!response.ok) throw new Error("Failed to fetch header images");
-        const allData = await response.json();
         setImageUrls(
-          Array.isArray(allData) ? allData.slice(0, IMAGES_PER_ROW) : []
+          await fetchHeaderImageUrls(process.env.PUBLIC_URL, IMAGES_PER_ROW)
         );
       } catch (e) {
         setImageUrls([]);
@@ -8,6 +8,7 @@ import React, {
 import * as d3 from "d3";
 import ForceGraph2D from "react-force-graph-2d";
 import ChartHeading from "./ChartHeading";
+import { fromColumnar } from "../utils";
 import {
   FaUserTie,
   FaGamepad,
@@ -32,7 +33,7 @@ const DeveloperUniverse = () => {
     fetch("/processed_data/developer_universe.json")
       .then((response) => response.json())
       .then((data) => {
-        setGraphData(data);
+        setGraphData(fromColumnar(data));
         setLoading(false);
       });
   }, []);
@@ -70,15 +71,20 @@ const DeveloperUniverse = () => {
       const size = sizeScale(node.game_count || 1) * 0.25;
       // Node color based on average review score
       const color = getReviewColor(node.avg_review_score || 0);
-      return { ...node, size, color };
+      // Positions settled offline (scripts/graph_layout.py) are pinned, so
+      // the graph renders without running the simulation
+      const pinned =
+        typeof node.x === "number" && typeof node.y === "number"
+          ? { fx: node.x, fy: node.y }
+          : {};
+      return { ...node, ...pinned, size, color };
     });
 
     // If hiding orphans, also filter links to be safe
-    const finalLinks = graphData.links.filter((link) => {
-      const sourceNode = finalNodes.find((n) => n.id === link.source);
-      const targetNode = finalNodes.find((n) => n.id === link.target);
-      return sourceNode && targetNode;
-    });
+    const finalNodeIds = new Set(finalNodes.map((node) => node.id));
+    const finalLinks = graphData.links.filter(
+      (link) => finalNodeIds.has(link.source) && finalNodeIds.has(link.target)
+    );
 
     // Add neighbor data for highlighting
     const nodesById = new Map(finalNodes.map((node) => [node.id, node]));
@@ -100,16 +106,20 @@ const DeveloperUniverse = () => {
     return { nodes: finalNodes, links: finalLinks };
   }, [graphData, showOrphanNodes]);
 
+  const hasLayout =
+    processedGraphData.nodes.length > 0 &&
+    processedGraphData.nodes.every((node) => node.fx !== undefined);
+
   useEffect(() => {
     if (!loading && graphRef.current && processedGraphData.nodes.length > 0) {
       setTimeout(() => {
         if (graphRef.current) {
-          graphRef.current.d3ReheatSimulation();
-          graphRef.current.zoomToFit(1200);
+          if (!hasLayout) graphRef.current.d3ReheatSimulation();
+          graphRef.current.zoomToFit(hasLayout ? 400 : 1200);
         }
-      }, 500);
+      }, hasLayout ? 0 : 500);
     }
-  }, [loading, processedGraphData]);
+  }, [loading, processedGraphData, hasLayout]);
 
   const handleNodeHover = useCallback(
     (node) => {
@@ -132,7 +142,7 @@ const DeveloperUniverse = () => {
 
   const handleResetLayout = () => {
     if (graphRef.current) {
-      graphRef.current.d3ReheatSimulation();
+      if (!hasLayout) graphRef.current.d3ReheatSimulation();
       graphRef.current.zoomToFit(100);
     }
   };
@@ -562,7 +572,9 @@ const DeveloperUniverse = () => {
                   selectedNode &&
                   (sourceId === selectedNode.id ||
                     targetId === selectedNode.id);
-                return isHoveredLink ? 2 : 1;
+                // Thicker for studios that share more games
+                const weight = 1 + Math.log2(link.weight || 1) / 2;
+                return (isHoveredLink ? 2 : 1) * weight;
               }}
               onNodeHover={handleNodeHover}
               onNodeClick={handleNodeClick}
@@ -572,6 +584,7 @@ const DeveloperUniverse = () => {
               d3ForceStrength={-8000}
               d3VelocityDecay={0.3}
               d3AlphaDecay={0.01}
+              cooldownTicks={hasLayout ? 0 : Infinity}
               d3ForceInit={(forceGraph) => {
                 // Add collision force based on node size, with more padding
                 forceGraph.d3Force(
@@ -1,19 +1,42 @@
 import React, { useState, useCallback, useMemo } from "react";
 import { debounce } from "lodash";
+import {
+  FILTER_PRICE_RANGE,
+  FILTER_YEAR_RANGE,
+  priceBucketRange,
+  priceBucketSpan,
+} from "../dataCube";
 
-const FilterPanel = ({ data, onFilterChange }) => {
+// Charts whose data rollUpCube (src/dataCube.js) recomputes per selection
+const FILTERED_CHARTS =
+  "Filters apply to the review trend, platform, free vs paid and Q4 release charts.";
+const STATUS_NOTES = {
+  loading: "Loading filter data...",
+  unavailable: "Filtering is unavailable: data_cube.json could not be loaded.",
+};
+
+const formatPrice = (price) =>
+  Number.isInteger(price) ? `$${price}` : `$${price.toFixed(2)}`;
+
+const FilterPanel = ({ data, status, onOpen, onFilterChange }) => {
   const [isOpen, setIsOpen] = useState(false);
   const [filters, setFilters] = useState({
     genres: [],
-    priceRange: [0, 100],
-    yearRange: [2000, 2024],
+    priceRange: FILTER_PRICE_RANGE,
+    yearRange: FILTER_YEAR_RANGE,
   });
 
-  // Memoize the unique genres to prevent unnecessary recalculations
-  const genres = useMemo(() => {
-    if (!data?.h4Data?.length) return [];
-    return [...new Set(data.h4Data.map((item) => item.genre))];
-  }, [data]);
+  // The data cube can only filter by the genres it stores, so none are
+  // offered until it has loaded
+  const genres = useMemo(() => data?.dataCube?.genres || [], [data]);
+
+  // The cube stores prices per bucket, so the price range is narrowed to
+  // the buckets lying entirely within it
+  const priceSpan = useMemo(() => {
+    const edges = data?.dataCube?.price_edges;
+    if (!edges) return undefined;
+    return priceBucketSpan(edges, priceBucketRange(edges, filters.priceRange));
+  }, [data, filters.priceRange]);
 
   // Create a debounced version of onFilterChange
   const debouncedFilterChange = useCallback(
@@ -97,11 +120,15 @@ const FilterPanel = ({ data, onFilterChange }) => {
     <div className="filter-panel">
       <button
         className="filter-toggle-button"
-        onClick={() => setIsOpen(!isOpen)}
+        onClick={() => {
+          if (!isOpen && onOpen) onOpen();
+          setIsOpen(!isOpen);
+        }}
       >
         {isOpen ? "Hide Filters" : "Show Filters"}
       </button>
       <div className={`filter-content ${isOpen ? "open" : ""}`}>
+        <p className="filter-note">{STATUS_NOTES[status] || FILTERED_CHARTS}</p>
         <div className="filter-section">
           <h3>Genres</h3>
           <div className="genre-buttons">
@@ -124,8 +151,8 @@ const FilterPanel = ({ data, onFilterChange }) => {
           <div className="range-inputs">
             <input
               type="range"
-              min="0"
-              max="100"
+              min={FILTER_PRICE_RANGE[0]}
+              max={FILTER_PRICE_RANGE[1]}
               step="1"
               value={filters.priceRange[0]}
               onChange={handlePriceMinChange}
@@ -133,8 +160,8 @@ const FilterPanel = ({ data, onFilterChange }) => {
             />
             <input
               type="range"
-              min="0"
-              max="100"
+              min={FILTER_PRICE_RANGE[0]}
+              max={FILTER_PRICE_RANGE[1]}
               step="1"
               value={filters.priceRange[1]}
               onChange={handlePriceMaxChange}
@@ -143,8 +170,21 @@ const FilterPanel = ({ data, onFilterChange }) => {
           </div>
           <div className="range-labels">
             <span>${filters.priceRange[0]}</span>
-            <span>${filters.priceRange[1]}</span>
+            <span>
+              ${filters.priceRange[1]}
+              {filters.priceRange[1] >= FILTER_PRICE_RANGE[1] ? "+" : ""}
+            </span>
           </div>
+          {priceSpan !== undefined && (
+            <p className="filter-note">
+              {priceSpan === null
+                ? "No price bucket lies within this range."
+                : `Matches games priced ${formatPrice(priceSpan[0])}` +
+                  (priceSpan[1] === null
+                    ? " and up."
+                    : ` to ${formatPrice(priceSpan[1])}.`)}
+            </p>
+          )}
         </div>
 
         <div className="filter-section">
@@ -152,8 +192,8 @@ const FilterPanel = ({ data, onFilterChange }) => {
           <div className="range-inputs">
             <input
               type="range"
-              min="2000"
-              max="2024"
+              min={FILTER_YEAR_RANGE[0]}
+              max={FILTER_YEAR_RANGE[1]}
               step="1"
               value={filters.yearRange[0]}
               onChange={handleYearMinChange}
@@ -161,8 +201,8 @@ const FilterPanel = ({ data, onFilterChange }) => {
             />
             <input
               type="range"
-              min="2000"
-              max="2024"
+              min={FILTER_YEAR_RANGE[0]}
+              max={FILTER_YEAR_RANGE[1]}
               step="1"
               value={filters.yearRange[1]}
               onChange={handleYearMaxChange}
@@ -171,7 +211,10 @@ const FilterPanel = ({ data, onFilterChange }) => {
           </div>
           <div className="range-labels">
             <span>{filters.yearRange[0]}</span>
-            <span>{filters.yearRange[1]}</span>
+            <span>
+              {filters.yearRange[1]}
+              {filters.yearRange[1] >= FILTER_YEAR_RANGE[1] ? "+" : ""}
+            </span>
           </div>
         </div>
       </div>
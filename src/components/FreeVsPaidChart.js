@@ -87,14 +87,12 @@ const FreeVsPaidChart = ({ data, align = "left" }) => {
         </p>
       </div>
       <div style={{ padding: '0 60px' }}>
-        <ResponsiveContainer width="100%" minWidth={400} height={400}
-          style={{ border: '2px dashed red' }}
-        >
+        <ResponsiveContainer width="100%" minWidth={400} height={400}>
           <PieChart>
             <Pie
               data={data}
-              dataKey="count"
-              nameKey="type"
+              dataKey="num_games"
+              nameKey="game_type"
               cx="50%"
               cy="50%"
               outerRadius={150}
@@ -1,6 +1,7 @@
 import React, { useState, useEffect, useRef, useCallback } from "react";
 import { FaExternalLinkAlt } from "react-icons/fa";
 import { colors, hexToRgba } from "../colors";
+import { fetchHeaderImageUrls } from "../utils";
 
 const HEADER_HEIGHT = "250px";
 const STICKY_HEADER_HEIGHT = "80px";
@@ -38,14 +39,12 @@ const Header = () => {
   useEffect(() => {
     const fetchImageUrls = async () => {
       try {
-        const response = await fetch(
-          `${process.env.PUBLIC_URL}/processed_data/header_images.json`
+        const limitedUrls = await fetchHeaderImageUrls(
+          process.env.PUBLIC_URL,
+          MAX_IMAGES_FOR_CAROUSEL
         );
-        if (!response.ok) throw new Error("Failed to fetch header images");
-        const allData = await response.json();
 
-        if (Array.isArray(allData) && allData.length > 0) {
-          const limitedUrls = allData.slice(0, MAX_IMAGES_FOR_CAROUSEL);
+        if (limitedUrls.length > 0) {
           setImageUrls(limitedUrls);
           imagesLoadedCountRef.current = 0;
           setIsReadyToAnimate(false);
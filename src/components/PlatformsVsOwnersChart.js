@@ -9,8 +9,9 @@ import {
   Legend,
   ResponsiveContainer,
 } from "recharts";
+import ChartHeading from "./ChartHeading";
 
-const PlatformsVsOwnersChart = ({ data }) => {
+const PlatformsVsOwnersChart = ({ data, align = "left" }) => {
   // Step C1: Validate data shape
   const isValid =
     Array.isArray(data) &&
@@ -29,53 +30,58 @@ const PlatformsVsOwnersChart = ({ data }) => {
   }
 
   return (
-    <ResponsiveContainer width="100%" height={400}>
-      <BarChart
-        data={data}
-        margin={{
-          top: 5,
-          right: 30,
-          left: 20,
-          bottom: 5,
-        }}
-      >
-        <CartesianGrid strokeDasharray="3 3" stroke="#444" />
-        <XAxis dataKey="platform" stroke="#fff" tick={{ fill: "#fff" }} />
-        <YAxis
-          stroke="#fff"
-          tick={{ fill: "#fff" }}
-          tickFormatter={(value) => `${(value / 1000000).toFixed(1)}M`}
-        />
-        <Tooltip
-          contentStyle={{
-            backgroundColor: "rgba(0, 0, 0, 0.8)",
-            border: "none",
-            borderRadius: "4px",
-            color: "#fff",
+    <div style={{ width: "100%" }}>
+      <div className={`chart-heading-block ${align}`}>
+        <ChartHeading align={align}>Platforms vs. Estimated Owners</ChartHeading>
+        <p
+          style={{
+            color: "#ccc",
+            fontSize: "1.08rem",
+            maxWidth: 700,
+            margin: "0 0 24px 0",
           }}
-          formatter={(value) => [`${(value / 1000000).toFixed(1)}M`, "Owners"]}
-        />
-        <Legend
-          wrapperStyle={{
-            color: "#fff",
+        >
+          This chart compares the average number of owners of games by the
+          number of platforms (Windows, macOS, Linux) they were released on,
+          helping you see whether games on more platforms tend to have larger
+          audiences.
+        </p>
+      </div>
+      <ResponsiveContainer width="100%" height={400}>
+        <BarChart
+          data={data}
+          margin={{
+            top: 5,
+            right: 30,
+            left: 20,
+            bottom: 5,
           }}
-        />
-        <Bar dataKey="owners" name="Owners" fill="#82ca9d" />
-      </BarChart>
-      <p
-        style={{
-          color: "#ccc",
-          fontSize: "1.08rem",
-          maxWidth: 700,
-          margin: "24px 0 0 0",
-        }}
-      >
-        This chart compares the average number of owners for games released on
-        different platforms. Each bar shows a platform and the typical player
-        base for games on that platform, helping you see which platforms tend to
-        have the largest audiences.
-      </p>
-    </ResponsiveContainer>
+        >
+          <CartesianGrid strokeDasharray="3 3" stroke="#444" />
+          <XAxis dataKey="num_platforms" stroke="#fff" tick={{ fill: "#fff" }} />
+          <YAxis
+            stroke="#fff"
+            tick={{ fill: "#fff" }}
+            tickFormatter={(value) => `${(value / 1000000).toFixed(1)}M`}
+          />
+          <Tooltip
+            contentStyle={{
+              backgroundColor: "rgba(0, 0, 0, 0.8)",
+              border: "none",
+              borderRadius: "4px",
+              color: "#fff",
+            }}
+            formatter={(value) => [`${(value / 1000000).toFixed(1)}M`, "Owners"]}
+          />
+          <Legend
+            wrapperStyle={{
+              color: "#fff",
+            }}
+          />
+          <Bar dataKey="avg_estimated_owners" name="Owners" fill="#82ca9d" />
+        </BarChart>
+      </ResponsiveContainer>
+    </div>
   );
 };
 
@@ -7,6 +7,7 @@ import {
   CartesianGrid,
   Tooltip,
   ResponsiveContainer,
+  ZAxis,
 } from "recharts";
 import { colors, hexToRgba } from "../colors";
 import ChartHeading from "./ChartHeading";
@@ -24,13 +25,20 @@ const formatNumber = (num) => {
   return numericValue.toLocaleString();
 };
 
-const ReviewsOwnersScatterChart = ({ data, align = "left" }) => {
+const ReviewsOwnersScatterChart = ({ data, densityData, align = "left" }) => {
   // Step C1: Validate data shape
   const isValid =
     Array.isArray(data) &&
     data.length > 0 &&
     data[0].positive !== undefined &&
     data[0].estimated_owners_numeric !== undefined;
+  // Optional log-scale grid of game counts covering every game
+  // (h3_reviews_owners_density.json)
+  const hasDensity =
+    Array.isArray(densityData) &&
+    densityData.length > 0 &&
+    densityData[0].num_games !== undefined;
+  const [view, setView] = useState(isValid ? "sample" : "density");
 
   // Step C2: Debug logging (only in development)
   if (process.env.NODE_ENV === "development") {
@@ -39,23 +47,41 @@ const ReviewsOwnersScatterChart = ({ data, align = "left" }) => {
 
   // Always call hooks in the same order
   const safeData = isValid ? data : [];
+  const safeDensity = hasDensity ? densityData : [];
+  const showDensity = view === "density" && hasDensity;
 
   // Step D: Local filter state for reviews and owners
   const minReviews = useMemo(
-    () => Math.min(...safeData.map((d) => d.positive)),
-    [safeData]
+    () =>
+      Math.min(
+        ...safeData.map((d) => d.positive),
+        ...safeDensity.map((d) => Math.round(d.positive_min))
+      ),
+    [safeData, safeDensity]
   );
   const maxReviews = useMemo(
-    () => Math.max(...safeData.map((d) => d.positive)),
-    [safeData]
+    () =>
+      Math.max(
+        ...safeData.map((d) => d.positive),
+        ...safeDensity.map((d) => Math.round(d.positive_max))
+      ),
+    [safeData, safeDensity]
   );
   const minOwners = useMemo(
-    () => Math.min(...safeData.map((d) => d.estimated_owners_numeric)),
-    [safeData]
+    () =>
+      Math.min(
+        ...safeData.map((d) => d.estimated_owners_numeric),
+        ...safeDensity.map((d) => Math.round(d.owners_min))
+      ),
+    [safeData, safeDensity]
   );
   const maxOwners = useMemo(
-    () => Math.max(...safeData.map((d) => d.estimated_owners_numeric)),
-    [safeData]
+    () =>
+      Math.max(
+        ...safeData.map((d) => d.estimated_owners_numeric),
+        ...safeDensity.map((d) => Math.round(d.owners_max))
+      ),
+    [safeData, safeDensity]
   );
 
   // Debounced state for filtering
@@ -120,14 +146,37 @@ const ReviewsOwnersScatterChart = ({ data, align = "left" }) => {
     );
   }, [processedData, reviewRange, ownerRange]);
 
+  // Density cells are kept if their centre lies within the filter ranges
+  const filteredCells = useMemo(() => {
+    return safeDensity
+      .filter(
+        (d) =>
+          d.positive_center >= reviewRange[0] &&
+          d.positive_center <= reviewRange[1] &&
+          d.owners_center >= ownerRange[0] &&
+          d.owners_center <= ownerRange[1]
+      )
+      .map((d) => ({
+        x: d.positive_center,
+        y: d.owners_center,
+        z: d.num_games,
+      }));
+  }, [safeDensity, reviewRange, ownerRange]);
+
   // Step C3: Handle empty or malformed data
-  if (!isValid) {
+  if (!isValid && !hasDensity) {
     return <div>No valid data available for Reviews vs Owners.</div>;
   }
 
-  if (!data?.length) {
-    return <div>No data available</div>;
-  }
+  const viewButtonStyle = (active) => ({
+    background: active ? colors.accent7 : "transparent",
+    color: "#fff",
+    border: `1px solid ${colors.accent7}`,
+    borderRadius: 4,
+    padding: "2px 10px",
+    cursor: "pointer",
+    fontSize: 12,
+  });
 
   return (
     <section className="chart-section">
@@ -148,6 +197,9 @@ const ReviewsOwnersScatterChart = ({ data, align = "left" }) => {
           Each point represents a game—games further to the right have more
           positive reviews, and those higher up have more owners. Use the
           filters to focus on specific ranges and spot trends or outliers.
+          {hasDensity &&
+            " The density view counts every game on logarithmic axes " +
+              "instead of showing a sample."}
         </p>
       </div>
       {/* Filter Controls */}
@@ -172,6 +224,22 @@ const ReviewsOwnersScatterChart = ({ data, align = "left" }) => {
           <span style={{ fontWeight: 600, color: colors.accent7 }}>
             Filters
           </span>
+          {isValid && hasDensity && (
+            <div style={{ display: "flex", gap: 6 }}>
+              <button
+                onClick={() => setView("sample")}
+                style={viewButtonStyle(!showDensity)}
+              >
+                Sample
+              </button>
+              <button
+                onClick={() => setView("density")}
+                style={viewButtonStyle(showDensity)}
+              >
+                Density
+              </button>
+            </div>
+          )}
           <button
             onClick={resetFilters}
             style={{
@@ -257,6 +325,8 @@ const ReviewsOwnersScatterChart = ({ data, align = "left" }) => {
             type="number"
             dataKey="x"
             name="Positive Reviews"
+            scale={showDensity ? "log" : "auto"}
+            domain={showDensity ? ["auto", "auto"] : [0, "auto"]}
             stroke={colors.font2}
             tick={{ fill: colors.font2, fontSize: 14 }}
             tickFormatter={formatNumber}
@@ -266,18 +336,27 @@ const ReviewsOwnersScatterChart = ({ data, align = "left" }) => {
             type="number"
             dataKey="y"
             name="Estimated Owners"
+            scale={showDensity ? "log" : "auto"}
+            domain={showDensity ? ["auto", "auto"] : [0, "auto"]}
             stroke={colors.font2}
             tick={{ fill: colors.font2, fontSize: 14 }}
             tickFormatter={formatNumber}
             label={{ value: "Estimated Owners", angle: -90, position: "left" }}
           />
+          {showDensity && (
+            <ZAxis type="number" dataKey="z" name="Games" range={[20, 400]} />
+          )}
           <Tooltip
             cursor={{ strokeDasharray: "3 3" }}
             formatter={(value, name) => {
-              if (name === "y") {
-                return [value.toLocaleString(), "Estimated Owners"];
+              if (name === "Games") {
+                return [value.toLocaleString(), "Games"];
+              }
+              const suffix = showDensity ? " (cell centre)" : "";
+              if (name === "Estimated Owners") {
+                return [formatNumber(value), "Estimated Owners" + suffix];
               }
-              return [value.toLocaleString(), "Positive Reviews"];
+              return [formatNumber(value), "Positive Reviews" + suffix];
             }}
             labelFormatter={(label) => `Game: ${label}`}
             contentStyle={{
@@ -297,7 +376,7 @@ const ReviewsOwnersScatterChart = ({ data, align = "left" }) => {
           />
           <Scatter
             name="Games"
-            data={filteredData}
+            data={showDensity ? filteredCells : filteredData}
             fill={colors.accent7}
             fillOpacity={0.6}
           />
@@ -3,8 +3,12 @@ import Plot from "react-plotly.js";
 import Modal from "react-modal";
 import { FaTimes, FaUserFriends, FaThumbsUp } from "react-icons/fa";
 import { getReviewColor } from "../colors";
+import { fromColumnar } from "../utils";
 
-const DATA_URL = process.env.PUBLIC_URL + "/processed_data/steam_timeline.json";
+// Sharded timeline: manifest.json lists a compact index for the plot and
+// per-year detail shards that are only fetched when a game is opened
+const DATA_BASE_URL = process.env.PUBLIC_URL + "/processed_data/steam_timeline/";
+const MANIFEST_URL = DATA_BASE_URL + "manifest.json";
 
 const SteamTimeMachine = (props) => {
   const { align = "left" } = props;
@@ -14,6 +18,8 @@ const SteamTimeMachine = (props) => {
   const [allGenres, setAllGenres] = useState([]);
   const [hoverInfo, setHoverInfo] = useState(null); // {point, x, y}
   const plotRef = useRef();
+  const manifestRef = useRef(null);
+  const detailShards = useRef(new Map()); // shard path -> Promise of details
 
   // Only allow these genres in the filter
   const allowedGenres = [
@@ -28,9 +34,20 @@ const SteamTimeMachine = (props) => {
   ];
 
   useEffect(() => {
-    fetch(DATA_URL)
+    fetch(MANIFEST_URL)
       .then((res) => res.json())
-      .then((json) => {
+      .then((manifest) => {
+        manifestRef.current = manifest;
+        return fetch(DATA_BASE_URL + manifest.index);
+      })
+      .then((res) => res.json())
+      .then((index) => {
+        // release_year and genre are derived here to keep the index small
+        const json = fromColumnar(index).map((g) => ({
+          ...g,
+          release_year: parseInt(g.release_date.slice(0, 4), 10),
+          genre: g.genres && g.genres.length ? g.genres[0] : null,
+        }));
         setData(json);
         // Collect all unique genres, but only keep allowed ones
         const genres = new Set();
@@ -286,11 +303,41 @@ const SteamTimeMachine = (props) => {
     );
   };
 
+  // Fetch (once) the detail shard of a game's year and return its details
+  const loadDetails = (game) => {
+    const shard = manifestRef.current?.details?.[String(game.release_year)];
+    if (!shard) return Promise.resolve(null);
+    if (!detailShards.current.has(shard)) {
+      detailShards.current.set(
+        shard,
+        fetch(DATA_BASE_URL + shard)
+          .then((res) => res.json())
+          .catch((err) => {
+            console.error("Error loading timeline details:", err);
+            detailShards.current.delete(shard);
+            return {};
+          })
+      );
+    }
+    return detailShards.current
+      .get(shard)
+      .then((details) => details[game.appid] || null);
+  };
+
   // Handle click on a point
   const handlePointClick = (event) => {
     if (event && event.points && event.points.length > 0) {
       const idx = event.points[0].pointIndex;
-      setModalGame(filteredData[idx]);
+      const game = filteredData[idx];
+      setModalGame(game);
+      loadDetails(game).then((details) => {
+        if (!details) return;
+        setModalGame((current) =>
+          current && current.appid === game.appid
+            ? { ...current, ...details }
+            : current
+        );
+      });
     }
   };
 
@@ -0,0 +1,194 @@
+// Roll-ups of data_cube.json (written by scripts/process_steam_data.py) into
+// the H1/H2/H5/H6 chart data for the current FilterPanel selection.
+//
+// Each cell holds additive aggregates of the games with one genre mask,
+// release year and price bucket, so any filter is a sum over the matching
+// cells. H2 and H6 measures are split by platform count and Q4 flag into
+// columns of their own. Only the most common genres (cube.genres) are
+// stored, and prices only at bucket precision (cube.price_edges). The owner
+// bounds (avg_estimated_owners_lower/upper) are not in the cube, as no chart
+// shows them.
+
+// Slider ranges of the FilterPanel. A slider at its end is open-ended, so
+// e.g. a price range ending at 100 includes all games from $100 up.
+export const FILTER_PRICE_RANGE = [0, 100];
+export const FILTER_YEAR_RANGE = [2000, 2024];
+
+// Highest price in cents of each bucket: the next edge minus a cent, or
+// none for the last bucket
+const bucketTop = (edges, i) =>
+  i + 1 < edges.length ? Math.round(edges[i + 1] * 100) - 1 : Infinity;
+
+// First and last price bucket lying entirely within the price range; a
+// slider at its end keeps all buckets on that side. last < first if no
+// bucket fits, e.g. for a range between two edges.
+export const priceBucketRange = (edges, priceRange) => {
+  const [priceMin, priceMax] = priceRange || FILTER_PRICE_RANGE;
+  let first = 0;
+  let last = edges.length - 1;
+  if (priceMin > FILTER_PRICE_RANGE[0]) {
+    first = edges.findIndex((edge) => edge >= priceMin);
+    if (first < 0) first = edges.length;
+  }
+  if (priceMax < FILTER_PRICE_RANGE[1]) {
+    while (last >= 0 && bucketTop(edges, last) > priceMax * 100) last -= 1;
+  }
+  return [first, last];
+};
+
+// Dollar span [lowest, highest] of the price buckets from first to last;
+// highest is null for the open-ended last bucket
+export const priceBucketSpan = (edges, [first, last]) =>
+  last < first
+    ? null
+    : [
+        edges[first],
+        last + 1 < edges.length ? bucketTop(edges, last) / 100 : null,
+      ];
+
+const cellMatcher = (cube, filters) => {
+  // FilterPanel only offers the genres the cube stores (cube.genres)
+  const genres = (filters && filters.genres) || [];
+  const genreMask = genres.reduce((mask, genre) => {
+    const bit = cube.genres.indexOf(genre);
+    return bit >= 0 ? mask | (1 << bit) : mask;
+  }, 0);
+  const [priceMin, priceMax] =
+    (filters && filters.priceRange) || FILTER_PRICE_RANGE;
+  const [yearMin, yearMax] =
+    (filters && filters.yearRange) || FILTER_YEAR_RANGE;
+  const [firstBucket, lastBucket] = priceBucketRange(cube.price_edges, [
+    priceMin,
+    priceMax,
+  ]);
+
+  return (cell) => {
+    // A game matches if it has any of the selected genres
+    if (genres.length && (cell.genre_mask & genreMask) === 0) return false;
+    if (priceMin > FILTER_PRICE_RANGE[0] || priceMax < FILTER_PRICE_RANGE[1]) {
+      // Only buckets lying entirely within the range are kept
+      if (cell.price_bucket === null) return false;
+      if (cell.price_bucket < firstBucket || cell.price_bucket > lastBucket)
+        return false;
+    }
+    if (yearMin > FILTER_YEAR_RANGE[0] || yearMax < FILTER_YEAR_RANGE[1]) {
+      if (cell.release_year === null) return false;
+      if (yearMin > FILTER_YEAR_RANGE[0] && cell.release_year < yearMin)
+        return false;
+      if (yearMax < FILTER_YEAR_RANGE[1] && cell.release_year > yearMax)
+        return false;
+    }
+    return true;
+  };
+};
+
+// Sum the given measures of the cells per group key; cells with a null key
+// are skipped, like the WHERE ... IS NOT NULL of the original queries
+const groupCells = (cells, keyOf, measures) => {
+  const groups = new Map();
+  cells.forEach((cell) => {
+    const key = keyOf(cell);
+    if (key === null || key === undefined) return;
+    let sums = groups.get(key);
+    if (!sums) {
+      sums = Object.fromEntries(measures.map((measure) => [measure, 0]));
+      groups.set(key, sums);
+    }
+    measures.forEach((measure) => {
+      sums[measure] += cell[measure] || 0;
+    });
+  });
+  return groups;
+};
+
+// Sum the given measures over all cells
+const sumCells = (cells, measures) => {
+  const sums = Object.fromEntries(measures.map((measure) => [measure, 0]));
+  cells.forEach((cell) => {
+    measures.forEach((measure) => {
+      sums[measure] += cell[measure] || 0;
+    });
+  });
+  return sums;
+};
+
+const sampleStddev = (n, sum, sumsq) =>
+  n > 1 ? Math.sqrt(Math.max(0, (sumsq - (sum * sum) / n) / (n - 1))) : null;
+
+// Every chart averages over its own game count (h1_n, h5_n, h2_n_<k>,
+// h6_n_<period>): the games its global query keeps
+export const rollUpCube = (cube, filters) => {
+  const cells = cube.cells.filter(cellMatcher(cube, filters));
+
+  const h1Data = [
+    ...groupCells(cells, (c) => c.release_year, ["h1_n", "h1_sum_pct"]),
+  ]
+    .filter(([, s]) => s.h1_n > 10)
+    .sort(([a], [b]) => a - b)
+    .map(([year, s]) => ({
+      release_year: year,
+      avg_positive_percentage: s.h1_sum_pct / s.h1_n,
+      num_games: s.h1_n,
+    }));
+
+  const platformCounts = [0, 1, 2, 3];
+  const h2Sums = sumCells(
+    cells,
+    platformCounts.flatMap((k) => [`h2_n_${k}`, `h2_sum_owners_${k}`])
+  );
+  const h2Data = platformCounts
+    .filter((k) => h2Sums[`h2_n_${k}`] > 0)
+    .map((k) => ({
+      num_platforms: k,
+      avg_estimated_owners: h2Sums[`h2_sum_owners_${k}`] / h2Sums[`h2_n_${k}`],
+      num_games: h2Sums[`h2_n_${k}`],
+    }));
+
+  const h5Data = [
+    ...groupCells(
+      cells,
+      (c) =>
+        c.price_bucket === null
+          ? null
+          : c.price_bucket === 0
+          ? "Free-to-Play"
+          : "Paid",
+      ["h5_n", "h5_sum_owners", "h5_sum_pct", "h5_sumsq_pct"]
+    ),
+  ]
+    .filter(([, s]) => s.h5_n > 0)
+    .map(([gameType, s]) => ({
+      game_type: gameType,
+      avg_estimated_owners: s.h5_sum_owners / s.h5_n,
+      avg_positive_percentage: s.h5_sum_pct / s.h5_n,
+      stddev_positive_percentage: sampleStddev(
+        s.h5_n,
+        s.h5_sum_pct,
+        s.h5_sumsq_pct
+      ),
+      num_games: s.h5_n,
+    }));
+
+  const periods = [
+    ["q4", "Q4 Release"],
+    ["other", "Other Quarters"],
+  ];
+  const h6Sums = sumCells(
+    cells,
+    periods.flatMap(([p]) => [
+      `h6_n_${p}`,
+      `h6_sum_owners_${p}`,
+      `h6_sum_reviews_${p}`,
+    ])
+  );
+  const h6Data = periods
+    .filter(([p]) => h6Sums[`h6_n_${p}`] > 0)
+    .map(([p, period]) => ({
+      release_period: period,
+      avg_estimated_owners: h6Sums[`h6_sum_owners_${p}`] / h6Sums[`h6_n_${p}`],
+      avg_num_reviews: h6Sums[`h6_sum_reviews_${p}`] / h6Sums[`h6_n_${p}`],
+      num_games: h6Sums[`h6_n_${p}`],
+    }));
+
+  return { h1Data, h2Data, h5Data, h6Data };
+};
@@ -30,4 +30,70 @@ export const formatNumber = (num, precision = 1) => {
   return typeof numericValue === "number"
     ? numericValue.toFixed(Math.min(precision, 2))
     : numericValue;
-};
\ No newline at end of file
+};
+// processed_data files store lists of rows column-oriented
+// ({ format: "columnar", length, columns: { field: [...] } }), see
+// scripts/output_writer.py. This turns them back into arrays of row objects
+// at any depth; data that is already row-oriented is returned unchanged.
+export const fromColumnar = (data) => {
+  if (Array.isArray(data)) return data.map(fromColumnar);
+  if (data === null || typeof data !== "object") return data;
+  if (data.format === "columnar" && data.columns) {
+    const fields = Object.keys(data.columns);
+    return Array.from({ length: data.length }, (_, i) => {
+      const row = {};
+      fields.forEach((field) => {
+        row[field] = data.columns[field][i];
+      });
+      return row;
+    });
+  }
+  const result = {};
+  Object.keys(data).forEach((key) => {
+    result[key] = fromColumnar(data[key]);
+  });
+  return result;
+};
+
+// Optional processed_data files resolve to the fallback when they are
+// missing. The dev server and SPA hosts answer a missing .json with
+// index.html and status 200, so a body that is not JSON counts as missing.
+export const fetchOptionalJson = async (url, fallback) => {
+  try {
+    const response = await fetch(url);
+    if (!response.ok) return fallback;
+    return await response.json();
+  } catch (e) {
+    return fallback;
+  }
+};
+
+// header_images.json and header_images_sample.json store one URL template
+// plus the appids that follow it ({ format: "url_template", template,
+// appids, urls }), see scripts/extract_image_column.py. This turns them
+// back into a list of URLs; an older plain list of URLs is returned as is.
+export const expandImageManifest = (data) => {
+  if (Array.isArray(data)) return data.filter(Boolean);
+  if (!data || data.format !== "url_template") return [];
+  const fromTemplate = data.template
+    ? (data.appids || []).map((appid) =>
+        data.template.replace("{appid}", appid)
+      )
+    : [];
+  return fromTemplate.concat(data.urls || []);
+};
+
+// The few header images the background carousels show: the pre-sampled
+// manifest, or the start of the full one if no sample was written.
+export const fetchHeaderImageUrls = async (baseUrl, limit) => {
+  for (const file of ["header_images_sample.json", "header_images.json"]) {
+    const response = await fetch(`${baseUrl}/processed_data/${file}`);
+    if (!response.ok) continue;
+    try {
+      return expandImageManifest(await response.json()).slice(0, limit);
+    } catch (e) {
+      // e.g. the dev server's index.html for a missing file
+    }
+  }
+  throw new Error("Failed to fetch header images");
+};